@@ -0,0 +1,3 @@
+"""
+Közös adatbetöltő és elemző segédmodulok a hotel elemzésekhez.
+"""
@@ -0,0 +1,38 @@
+"""
+Hotelenként paraméterezhető elemzések.
+
+Minden modul egy run(dataframes, hotel_id, output_dir='.') függvényt ad, amely a
+tisztított táblákon dolgozik, és egy main(hotel_id, data_root=None) belépési pontot,
+amely maga tölti be az adatokat. Parancssorból: python -m hotel_pipeline.analyses.<név> <hotel_id>
+"""
+import importlib
+import sys
+
+# Elemzés neve -> modul; a modulok csak használatkor töltődnek be
+ANALYSES = {
+    'dfs_inspect': 'hotel_pipeline.analyses.dfs_inspect',
+    'funnel_by_currency': 'hotel_pipeline.analyses.funnel_by_currency',
+    'funnel_metrics': 'hotel_pipeline.analyses.funnel_metrics',
+    'utm_data': 'hotel_pipeline.analyses.utm_data',
+    'visits_before_booking': 'hotel_pipeline.analyses.visits_before_booking',
+    'sum_diff': 'hotel_pipeline.analyses.sum_diff',
+    'customer_segment': 'hotel_pipeline.analyses.customer_segment',
+    'customer_segment_upsell': 'hotel_pipeline.analyses.customer_segment_upsell',
+    'lead_time_by_category': 'hotel_pipeline.analyses.lead_time_by_category',
+    'room_choices': 'hotel_pipeline.analyses.room_choices',
+    'ppc': 'hotel_pipeline.analyses.ppc',
+    'occupancy_model': 'hotel_pipeline.analyses.occupancy_model'
+}
+
+
+def get_analysis(name):
+    """Az elemzés moduljának betöltése név alapján."""
+    if name not in ANALYSES:
+        raise KeyError(f"Ismeretlen elemzés: {name}")
+    return importlib.import_module(ANALYSES[name])
+
+
+def cli_hotel_id(default=1):
+    """A hotel azonosítója az első, nem kapcsoló (--...) parancssori argumentumból."""
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    return int(args[0]) if args else default
@@ -0,0 +1,329 @@
+import pandas as pd
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.colors import to_hex
+
+from hotel_pipeline.analyses import cli_hotel_id
+from hotel_pipeline.cleaner import optimize_dataframes
+from hotel_pipeline.facts import get_booking_facts
+from hotel_pipeline.figures import emit_figure, figure_spec, panel
+from hotel_pipeline.fx import REPORTING_CURRENCY, REPORTING_SUFFIX, amount_format, currency_order, get_normalized
+from hotel_pipeline.money import to_major
+from hotel_pipeline.report import emit_table, table_spec
+
+# Alapvető foglalási típusok létrehozása minden pénznemre
+def create_booking_types(bookings):
+    return pd.DataFrame({
+        'adults': bookings['adults'],
+        'children': bookings['children'],
+        'currency': bookings['currency'],
+        'nights': bookings['nights'],
+        'total_price': bookings['total_price_final'],
+        'detailed_category': bookings['detailed_category']
+    })
+
+def category_statistics(booking_types):
+    """Pénznemenként és kategóriánként a foglalások száma, átlagos tartózkodási idő és költés, egy csoportosítással."""
+    statistics = booking_types.groupby(['currency', 'detailed_category'], observed=True).agg(
+        count=('nights', 'size'),
+        nights=('nights', 'mean'),
+        total_price=('total_price', 'mean')
+    )
+    # Az ár váltópénz egységben van, az átlag pénzegységre váltva kerül a táblába
+    statistics['total_price'] = to_major(statistics['total_price'])
+    return statistics
+
+def print_statistics(statistics, currency):
+    stats = statistics.loc[currency]
+    print(f"\n=== Részletes statisztikák ({currency}) ===")
+
+    print(f"\nFoglalások megoszlása ({currency}):")
+    category_counts = stats['count'].sort_values(ascending=False, kind='stable')
+    print(category_counts)
+
+    print(f"\nÁtlagos tartózkodási idő kategóriánként ({currency}):")
+    avg_nights = stats['nights'].round(2)
+    print(avg_nights)
+
+    print(f"\nÁtlagos költés kategóriánként ({currency}):")
+    avg_spending = stats['total_price'].round(2)
+    print(avg_spending)
+
+    return category_counts, avg_nights, avg_spending
+
+# Bevétel elemzés függvény: pénznemenként és kategóriánként, egy csoportosítással
+# (minor_units: az ár oszlop váltópénz egységben van, az összeg pénzegységre váltva kerül a táblába)
+def analyze_revenue(booking_types, price_column='total_price', minor_units=True):
+    # Teljes bevétel számítása kategóriánként
+    total_revenue = booking_types.groupby(['currency', 'detailed_category'], observed=True)[price_column].agg([
+        ('Teljes bevétel', 'sum'),
+        ('Foglalások száma', 'count')
+    ])
+    if minor_units:
+        total_revenue['Teljes bevétel'] = to_major(total_revenue['Teljes bevétel'])
+    
+    # Százalékos megoszlás számítása a pénznemen belül
+    currency_revenue = total_revenue.groupby(level='currency', observed=True)['Teljes bevétel'].transform('sum')
+    total_revenue['Bevétel megoszlása (%)'] = (total_revenue['Teljes bevétel'] / currency_revenue * 100).round(2)
+    
+    # Átlagos foglalási érték számítása
+    total_revenue['Átlagos foglalási érték'] = (total_revenue['Teljes bevétel'] / total_revenue['Foglalások száma']).round(2)
+    
+    return total_revenue
+
+def currency_revenue(revenue, currency):
+    """Egy pénznem bevételi táblája bevétel szerint rendezve."""
+    return revenue.loc[currency].sort_values('Teljes bevétel', ascending=False)
+
+def run(dataframes, hotel_id, output_dir='.'):
+    booking_facts = get_booking_facts(dataframes)
+
+    # Csak a sikeres foglalásokat nézzük (conversion = 1); a kategória a ténytáblában van
+    successful_bookings = booking_facts[booking_facts['converted']].rename(
+        columns={'guest_category': 'detailed_category'}
+    )
+
+    # Minden foglalás egy táblában; a pénznem csoportosítási dimenzió
+    booking_types = create_booking_types(successful_bookings)
+    currencies = currency_order(booking_types['currency'])
+    colors = ['blue', 'green', 'orange', 'purple']
+
+    # Statisztikák minden pénznemre
+    statistics = category_statistics(booking_types)
+    stats = {currency: print_statistics(statistics, currency) for currency in currencies}
+
+    # Vizualizáció minden pénznemre: felül a foglalások, alul az átlagos költés
+    panels = []
+    for row, (index, label) in enumerate([(0, 'Foglalások megoszlása'), (2, 'Átlagos költés kategóriánként')]):
+        for i, currency in enumerate(currencies):
+            panels.append(panel(
+                'bar', stats[currency][index], style={'color': colors[i % len(colors)], 'alpha': 0.6},
+                title=f'{label} ({currency})',
+                xlabel='Kategória',
+                ylabel='Foglalások száma' if row == 0 else f'Átlagos költés ({currency})',
+                xticks={'rotation': 45, 'ha': 'right'}
+            ))
+    emit_figure(figure_spec('kategoriak_foglalasok_koltes', panels, rows=2, cols=len(currencies),
+                            figsize=(10 * len(currencies), 15)), output_dir)
+
+    # További részletes elemzések pénznemenként
+    booking_types['total_guests'] = booking_types['adults'] + booking_types['children']
+    category_means = booking_types.groupby(['currency', 'detailed_category'], observed=True)[
+        ['total_price', 'nights', 'total_guests']
+    ].mean()
+    category_means['total_price'] = to_major(category_means['total_price'])
+    for currency in currencies:
+        means = category_means.loc[currency]
+        print(f"\n=== További részletes statisztikák ({currency}) ===")
+
+        # Egy éjszakára jutó átlagos költség
+        per_night_cost = (means['total_price'] / means['nights']).round(2)
+        print(f"\nEgy éjszakára jutó átlagos költség ({currency}):")
+        print(per_night_cost.sort_values(ascending=False))
+
+        # Átlagos vendégszám
+        avg_guests = means['total_guests'].round(2).rename('total_guests')
+        print(f"\nÁtlagos vendégszám kategóriánként ({currency}):")
+        print(avg_guests.sort_values(ascending=False))
+
+        # Egy főre jutó átlagos költség
+        per_person_cost = (means['total_price'] / means['total_guests']).round(2)
+        print(f"\nEgy főre jutó átlagos költség ({currency}):")
+        print(per_person_cost.sort_values(ascending=False))
+
+        print("\n=== Teljes bevétel elemzése ===")
+
+    print("\n=== Teljes bevétel elemzése ===")
+
+    revenue = analyze_revenue(booking_types)
+    analyses = {currency: currency_revenue(revenue, currency) for currency in currencies}
+    for currency, analysis in analyses.items():
+        print(f"\nTeljes bevétel kategóriánként ({currency}):")
+        print(analysis.to_string(float_format=lambda x, fmt=amount_format(currency): fmt.format(x)))
+
+    # Az összes foglalás egy pénznemben, a foglalás napi árfolyamával
+    normalized = get_normalized(dataframes, 'search_log')
+    if normalized is not None:
+        reporting_prices = normalized.set_index('id')['total_price_final' + REPORTING_SUFFIX]
+        reporting_types = booking_types.assign(
+            currency=REPORTING_CURRENCY,
+            total_price=successful_bookings['search_log_id'].map(reporting_prices)
+        )
+        reporting_analysis = currency_revenue(analyze_revenue(reporting_types, minor_units=False), REPORTING_CURRENCY)
+        print(f"\nTeljes bevétel kategóriánként, minden foglalás riport pénznemben ({REPORTING_CURRENCY}, napi árfolyammal):")
+        print(reporting_analysis.to_string(
+            float_format=lambda x: amount_format(REPORTING_CURRENCY).format(x)
+        ))
+
+    # Vizualizáció
+    panels = [
+        panel(
+            'bar', analysis['Bevétel megoszlása (%)'], style={'color': colors[i % len(colors)], 'alpha': 0.6},
+            title=f'Bevétel megoszlása kategóriánként ({currency})',
+            xlabel='Kategória',
+            ylabel='Bevétel aránya (%)',
+            xticks={'rotation': 45, 'ha': 'right'}
+        )
+        for i, (currency, analysis) in enumerate(analyses.items())
+    ]
+    emit_figure(figure_spec('kategoriak_bevetel_megoszlas', panels, rows=len(currencies),
+                            figsize=(15, 5 * len(currencies))), output_dir)
+
+    # Összesített statisztikák
+    for currency, analysis in analyses.items():
+        print(f"\n=== Összesített statisztikák ({currency}) ===")
+        print(f"Összes bevétel: {analysis['Teljes bevétel'].sum():,.2f} {currency}")
+        print(f"Összes foglalás: {analysis['Foglalások száma'].sum():,.0f} db")
+        print(f"\nTop 3 kategória bevétel szerint:")
+        top_3 = analysis.nlargest(3, 'Teljes bevétel')
+        for idx, row in top_3.iterrows():
+            print(f"{idx}: {row['Teljes bevétel']:,.2f} {currency} ({row['Bevétel megoszlása (%)']}%)")
+    ########################################################################################
+    # Részletes kampány elemzés devizánként
+    print("\n=== Kampány hatékonyság elemzése devizánként ===")
+    # A kampány a ténytáblában már a foglaláshoz van kapcsolva
+    successful_bookings_with_session = successful_bookings
+
+    # Hiányzó kampány értékek kezelése
+    # (a kategória típusú oszlop új értéket csak szövegként kaphat)
+    successful_bookings_with_session['utm_campaign'] = successful_bookings_with_session['utm_campaign'] \
+        .astype(object).fillna('(not set)')
+
+    # Kampányok elemzése minden devizára egy csoportosítással
+    campaign_counts = successful_bookings_with_session.groupby(
+        ['currency', 'detailed_category', 'utm_campaign'], observed=True
+    ).size()
+    campaign_counts.index = campaign_counts.index.remove_unused_levels()
+
+    for currency in currencies:
+        campaign_analysis = campaign_counts.loc[currency].unstack(fill_value=0)
+
+        # Oszlopok szűrése - csak azok maradnak, ahol volt legalább 1 konverzió
+        campaign_analysis = campaign_analysis.loc[:, campaign_analysis.sum() > 0]
+
+        campaign_percentages = campaign_analysis.div(campaign_analysis.sum(axis=1), axis=0) * 100
+
+        # Táblázatos megjelenítés
+        print(f"\n=== Kampány elemzés - {currency} foglalások ===")
+
+        # Abszolút számok táblázata
+        print("\nFoglalások száma kampányonként és kategóriánként:")
+        emit_table(table_spec(campaign_analysis, f"Foglalások száma - {currency}", "{:.0f}", gradient='YlOrRd'))
+
+        # Százalékos megoszlás táblázata
+        print("\nKampányok megoszlása kategóriánként (%):")
+        emit_table(table_spec(
+            campaign_percentages, f"Kampányok megoszlása (%) - {currency}", "{:.1f}%", gradient='YlOrRd'
+        ))
+
+        # Top 5 legsikeresebb kampány
+        print(f"\nTop 5 legsikeresebb kampány - {currency}:")
+        top_campaigns = campaign_analysis.sum().sort_values(ascending=False).head()
+        top_table = pd.DataFrame({
+            'Foglalások száma': top_campaigns,
+            'Részarány (%)': (top_campaigns / top_campaigns.sum() * 100).round(1)
+        })
+        emit_table(table_spec(
+            top_table, "Top 5 kampány", {'Foglalások száma': '{:.0f}', 'Részarány (%)': '{:.1f}%'}, gradient='YlOrRd'
+        ))
+
+        # Vizualizáció (egyszerűsített)
+        set3 = plt.cm.Set3(np.linspace(0, 1, len(campaign_percentages.columns)))
+        emit_figure(figure_spec(f'kampanyok_megoszlasa_{currency.lower()}', panel(
+            'bar', campaign_percentages, style={'stacked': True, 'color': [to_hex(color) for color in set3]},
+            title=f'Kampányok hatékonysága foglalási kategóriánként - {currency}',
+            xlabel='Kategória',
+            ylabel='Megoszlás (%)',
+            legend={'title': 'Kampány', 'bbox_to_anchor': (1.05, 1), 'loc': 'upper left'},
+            xticks={'rotation': 45, 'ha': 'right'}
+        ), figsize=(15, 8)), output_dir)
+
+        # Összefoglaló statisztikák
+        print(f"\nÖsszefoglaló statisztikák - {currency}:")
+        summary_stats = pd.DataFrame({
+            'Összes foglalás': campaign_analysis.sum().sum(),
+            'Aktív kampányok száma': len(campaign_analysis.columns),
+            'Átlagos foglalás/kampány': campaign_analysis.sum().mean(),
+            'Legnagyobb kampány részesedés (%)': campaign_analysis.sum().max() / campaign_analysis.sum().sum() * 100
+        }, index=['Érték']).T
+
+        emit_table(table_spec(summary_stats, "Összefoglaló statisztikák", {'Érték': '{:.1f}'}))
+
+    # Részletes kampány elemzés devizánként
+    print("\n=== Kampány hatékonyság elemzése devizánként ===")
+
+    # Színek definiálása
+    colors = ['#8dd3c7', '#ffffb3', '#bebada', '#fb8072', '#80b1d3', 
+              '#fdb462', '#b3de69', '#fccde5', '#d9d9d9', '#bc80bd']
+
+    # Kampányok elemzése minden devizára egy csoportosítással
+    campaign_counts = successful_bookings_with_session.groupby(
+        ['currency', 'detailed_category', 'utm_campaign'], observed=True
+    ).size()
+    campaign_counts.index = campaign_counts.index.remove_unused_levels()
+
+    for currency in currencies:
+        campaign_analysis = campaign_counts.loc[currency].unstack(fill_value=0)
+
+        # Oszlopok szűrése - csak azok maradnak, ahol volt legalább 1 konverzió
+        campaign_analysis = campaign_analysis.loc[:, campaign_analysis.sum() > 0]
+
+        # Százalékok számítása
+        campaign_percentages = campaign_analysis.div(campaign_analysis.sum(axis=1), axis=0) * 100
+
+        # Táblázatos megjelenítés
+        print(f"\n=== Kampány elemzés - {currency} foglalások ===")
+
+        # Abszolút számok táblázata
+        print("\nFoglalások száma kampányonként és kategóriánként:")
+        emit_table(table_spec(campaign_analysis, f"Foglalások száma - {currency}", "{:.0f}", gradient='YlOrRd'))
+
+        # Vizualizáció
+        emit_figure(figure_spec(f'kampanyok_hatekonysaga_{currency.lower()}', panel(
+            'bar', campaign_percentages,
+            style={'stacked': True, 'color': colors[:len(campaign_percentages.columns)], 'width': 0.8},
+            # Cím és tengelyek
+            title={'text': f'Kampányok hatékonysága foglalási kategóriánként - {currency}', 'fontsize': 14, 'pad': 20},
+            xlabel={'text': 'Kategória', 'fontsize': 12},
+            ylabel={'text': 'Megoszlás (%)', 'fontsize': 12},
+            # Y tengely 0-100 között
+            ylim=(0, 100),
+            # Rács hozzáadása
+            grid={'axis': 'y', 'linestyle': '--', 'alpha': 0.3},
+            # Legend módosítása
+            legend={'title': 'Kampány', 'bbox_to_anchor': (1.05, 1), 'loc': 'upper left', 'fontsize': 10,
+                    'title_fontsize': 12},
+            # Tengelyek módosítása
+            xticks={'rotation': 30, 'ha': 'right', 'fontsize': 10},
+            yticks={'fontsize': 10}
+        ), figsize=(12, 8)), output_dir)
+
+        # Top 5 legsikeresebb kampány
+        print(f"\nTop 5 legsikeresebb kampány - {currency}:")
+        top_campaigns = campaign_analysis.sum().sort_values(ascending=False).head()
+        top_table = pd.DataFrame({
+            'Foglalások száma': top_campaigns,
+            'Részarány (%)': (top_campaigns / top_campaigns.sum() * 100).round(1)
+        })
+        emit_table(table_spec(
+            top_table, "Top 5 kampány", {'Foglalások száma': '{:.0f}', 'Részarány (%)': '{:.1f}%'}, gradient='YlOrRd'
+        ))
+
+        # Összefoglaló statisztikák
+        print(f"\nÖsszefoglaló statisztikák - {currency}:")
+        summary_stats = pd.DataFrame({
+            'Összes foglalás': campaign_analysis.sum().sum(),
+            'Aktív kampányok száma': len(campaign_analysis.columns),
+            'Átlagos foglalás/kampány': campaign_analysis.sum().mean(),
+            'Legnagyobb kampány részesedés (%)': campaign_analysis.sum().max() / campaign_analysis.sum().sum() * 100
+        }, index=['Érték']).T
+
+        emit_table(table_spec(summary_stats, "Összefoglaló statisztikák", {'Érték': '{:.1f}'}))
+
+def main(hotel_id=1, data_root=None):
+    # Adatok beolvasása
+    dataframes = optimize_dataframes(hotel_id, data_root, lazy=True)
+    run(dataframes, hotel_id)
+
+if __name__ == "__main__":
+    main(cli_hotel_id())
@@ -0,0 +1,162 @@
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import matplotlib.pyplot as plt
+from plotly.subplots import make_subplots
+import plotly.graph_objects as go
+import seaborn as sns
+
+from hotel_pipeline.analyses import cli_hotel_id
+from hotel_pipeline.cleaner import optimize_dataframes
+from hotel_pipeline.facts import get_booking_facts
+from hotel_pipeline.figures import emit_figure, figure_spec, panel, plotly_spec
+from hotel_pipeline.fx import REPORTING_CURRENCY, REPORTING_SUFFIX, amount_format, currency_order, get_normalized
+from hotel_pipeline.money import to_major
+from hotel_pipeline.report import emit_table, table_spec
+
+# Alapvető foglalási típusok létrehozása minden pénznemre
+def create_booking_types(bookings):
+    return pd.DataFrame({
+        'adults': bookings['adults'],
+        'children': bookings['children'],
+        'currency': bookings['currency'],
+        'nights': bookings['nights'],
+        'total_price': bookings['total_price_final'],
+        'search_log_id': bookings['search_log_id'],
+        'detailed_category': bookings['guest_category']
+    })
+
+# Összesített táblázat: az upsell tételek száma pénznemenként és kategóriánként, egy csoportosítással
+def create_upsell_summary(upsell_data):
+    return upsell_data.groupby(['currency', 'detailed_category'], observed=True)['name'].value_counts()
+
+# Egy pénznem összesített táblázata
+def currency_upsell_summary(upsell_summary, currency):
+    upsell_counts = upsell_summary.loc[currency]
+    upsell_counts = upsell_counts[upsell_counts > 0]
+    upsell_counts.index = upsell_counts.index.remove_unused_levels()
+    upsell_counts = upsell_counts.unstack(fill_value=0)
+    upsell_counts = upsell_counts.T
+    upsell_counts['Összesen'] = upsell_counts.sum(axis=1)
+    return upsell_counts
+
+# Upsell bevételek pénznemenként és termékenként (minden termékkel), pénzegységben
+def upsell_revenue_by_currency(upsell_data):
+    return to_major(upsell_data.groupby(['currency', 'name'], observed=False)['sum_price'].sum())
+
+# Bevétel szerinti csoportosítás egy pénznemen belül
+def categorize_upsell_by_revenue(upsell_revenues, currency):
+    upsell_revenue = upsell_revenues.loc[currency]
+
+    _, bins = pd.qcut(upsell_revenue, 3, retbins=True, duplicates='drop')
+    labels = ["Alacsony bevétel", "Közepes bevétel", "Magas bevétel"]
+    labels = labels[:len(bins)-1]
+
+    revenue_categories = pd.cut(upsell_revenue, bins, labels=labels, include_lowest=True)
+
+    revenue_df = pd.DataFrame({'Upsell termék': upsell_revenue.index, 'Bevételi kategória': revenue_categories.values, 'Bevétel': upsell_revenue.values})
+    return revenue_df
+
+# Táblázat formázása
+def format_summary_table(df, currency):
+    # Táblázat transzponálása és rendezése
+    df = df.sort_values('Összesen', ascending=False)
+
+    # Nulla értékek eltávolítása
+    df = df[df['Összesen'] > 0]
+
+    # Index átnevezése
+    df.index.name = 'Upsell termék'
+
+    # Formázott megjelenítés
+    return table_spec(df, f'Upsell termékek összesítése ({currency})', amount_format(currency), gradient='YlOrRd')
+
+# Bevételi kategóriák formázása
+def format_revenue_table(df, currency):
+    # Rendezés bevétel szerint
+    df = df.sort_values('Bevétel', ascending=False)
+
+    # Nulla értékek eltávolítása
+    df = df[df['Bevétel'] > 0]
+
+    # Formázott megjelenítés
+    return table_spec(
+        df, f'Bevételi kategóriák ({currency})', {'Bevétel': amount_format(currency)}, gradient=['Bevétel'], na_rep="-"
+    )
+
+# Upsell bevételek pénznemenként, kategóriánként és termékenként, egy csoportosítással
+def upsell_revenue_by_category(upsell_data):
+    return to_major(upsell_data.groupby(['currency', 'detailed_category', 'name'], observed=True)['sum_price'].sum())
+
+# Interaktív vizualizáció Plotly-val
+def plot_interactive_upsell(upsell_data, currencies, output_dir='.'):
+    revenue = upsell_revenue_by_category(upsell_data)
+
+    fig = make_subplots(rows=1, cols=len(currencies), subplot_titles=[f'{currency} Upsell bevételek' for currency in currencies])
+
+    for col, currency in enumerate(currencies, start=1):
+        grouped = revenue.loc[currency].reset_index()
+        for name in grouped['name'].unique():
+            subset = grouped[grouped['name'] == name]
+            fig.add_trace(go.Bar(x=subset['detailed_category'], y=subset['sum_price'], name=name, showlegend=col == 1), row=1, col=col)
+
+    fig.update_layout(title_text='Upsell bevételek kategóriánként és pénznemenként')
+    emit_figure(plotly_spec('upsell_bevetelek', fig), output_dir)
+
+# Statikus vizualizáció Matplotlibbel
+def plot_static_upsell(upsell_data, currencies, output_dir='.'):
+    revenue = upsell_revenue_by_category(upsell_data)
+    panels = [
+        panel('bar', revenue.loc[currency].unstack(), title=f'{currency} Upsell bevételek')
+        for currency in currencies
+    ]
+    emit_figure(figure_spec('upsell_bevetelek_statikus', panels, cols=len(currencies),
+                            figsize=(7.5 * len(currencies), 7)), output_dir)
+
+def run(dataframes, hotel_id, output_dir='.'):
+    booking_facts = get_booking_facts(dataframes)
+    booking_data = dataframes['booking_data']
+    upsell_data = dataframes['upsell_data']
+    datepicker_daily_visitors = dataframes['datepicker_daily_visitors']
+
+    # Dátum konvertálása
+    datepicker_daily_visitors['date'] = pd.to_datetime(datepicker_daily_visitors['date'])
+
+    # Csak a sikeres foglalásokat nézzük (conversion = 1); a kategória a ténytáblában van
+    successful_bookings = booking_facts[booking_facts['converted']]
+    booking_types = create_booking_types(successful_bookings)
+
+    # Adatok összekapcsolása egyszer, minden pénznemre; a pénznem csoportosítási dimenzió
+    all_upsell_data = pd.merge(booking_types, booking_data, on='search_log_id', how='inner')
+    all_upsell_data = pd.merge(all_upsell_data, upsell_data, on='search_log_id', how='inner')
+    currencies = currency_order(all_upsell_data['currency'])
+
+    # Függvények meghívása
+    upsell_summary = create_upsell_summary(all_upsell_data)
+    for currency in currencies:
+        print(f"\n=== {currency} Upsell Összesített Táblázat ===")
+        emit_table(format_summary_table(currency_upsell_summary(upsell_summary, currency), currency))
+
+    upsell_revenues = upsell_revenue_by_currency(all_upsell_data)
+    for currency in currencies:
+        print(f"\n=== {currency} Bevétel szerinti csoportosítás ===")
+        emit_table(format_revenue_table(categorize_upsell_by_revenue(upsell_revenues, currency), currency))
+
+    # Az összes upsell bevétel egy pénznemben, a foglalás napi árfolyamával
+    normalized = get_normalized(dataframes, 'upsell_data')
+    if normalized is not None:
+        reporting_revenue = normalized.groupby('name', observed=True)['sum_price' + REPORTING_SUFFIX].sum()
+        print(f"\n=== Upsell bevételek termékenként, riport pénznemben ({REPORTING_CURRENCY}, napi árfolyammal) ===")
+        print(reporting_revenue.sort_values(ascending=False).to_string(
+            float_format=lambda x: amount_format(REPORTING_CURRENCY).format(x)
+        ))
+
+    plot_interactive_upsell(all_upsell_data, currencies, output_dir)
+
+def main(hotel_id=1, data_root=None):
+    # Adatok beolvasása
+    dataframes = optimize_dataframes(hotel_id, data_root, lazy=True)
+    run(dataframes, hotel_id)
+
+if __name__ == "__main__":
+    main(cli_hotel_id())
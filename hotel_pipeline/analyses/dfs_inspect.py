@@ -1,14 +1,8 @@
-import pandas as pd
-import os
-from hotel_2_data_cleaner import optimize_dataframes
+from hotel_pipeline.analyses import cli_hotel_id
+from hotel_pipeline.cleaner import optimize_dataframes
 
-def main():
-    # Bemeneti könyvtár megadása
-    input_dir = '/config/workspace/verseny_dataklub_morgens/data/raw/hotel_2'
-
-    # Adatok tisztítása és betöltése
-    dfs = optimize_dataframes(input_dir)
 
+def run(dfs, hotel_id, output_dir='.'):
     # DataFramek külön változókba mentése és információk kiírása
     dataframes = {
         'booking_data': dfs['booking_data'],
@@ -45,5 +39,12 @@ def main():
     print(f"Átlagos tartózkodási idő (éjszaka): {dataframes['search_log']['nights'].mean():.2f}")
     print(f"Átlagos felnőttek száma/foglalás: {dataframes['search_log']['adults'].mean():.2f}")
 
+
+def main(hotel_id=1, data_root=None):
+    # Adatok tisztítása és betöltése
+    dfs = optimize_dataframes(hotel_id, data_root)
+    run(dfs, hotel_id)
+
+
 if __name__ == "__main__":
-    main()
+    main(cli_hotel_id())
@@ -0,0 +1,60 @@
+from hotel_pipeline.analyses import cli_hotel_id
+from hotel_pipeline.cleaner import optimize_dataframes
+from hotel_pipeline.funnel import funnel_columns, funnel_totals, get_funnel_cube, rollup
+
+# A kocka dimenziói és a kiszámításához szükséges táblák és oszlopok
+DIMENSIONS = ['currency']
+COLUMNS = funnel_columns(DIMENSIONS)
+
+
+def run(dataframes, hotel_id, output_dir='.'):
+    # Egyetlen funnel kocka pénznem szerint; az összesítés és a bontás is ebből olvas
+    cube = get_funnel_cube(dataframes, DIMENSIONS)
+    totals = funnel_totals(cube)
+
+    # Összesített számok
+    total_visitors = totals['visitors']
+    total_datepicker = totals['datepicker']
+    total_searches = totals['searches']
+    total_bookings = totals['bookings']
+
+    print("\nTELJES FUNNEL:")
+    print("-" * 50)
+    print(f"1. Összes látogató: {total_visitors:,}")
+    print(f"2. Dátumválasztó használat: {total_datepicker:,}")
+    print(f"3. Összes keresés: {total_searches:,}")
+    print(f"4. Összes foglalás: {total_bookings:,}")
+
+    print("\nKONVERZIÓS RÁTÁK:")
+    print("-" * 50)
+    print(f"Látogató → Dátumválasztó: {(total_datepicker/total_visitors*100):.2f}%")
+    print(f"Dátumválasztó → Keresés: {(total_searches/total_datepicker*100):.2f}%")
+    print(f"Keresés → Foglalás: {(total_bookings/total_searches*100):.2f}%")
+    print(f"Teljes konverzió (Látogató → Foglalás): {(total_bookings/total_visitors*100):.2f}%")
+
+    # Devizánkénti bontás
+    print("\nDEVIZÁNKÉNTI BONTÁS:")
+    print("-" * 50)
+    by_currency = rollup(cube, DIMENSIONS)
+    # A napi táblák látogatói pénznem nélkül szerepelnek a kockában
+    by_currency = by_currency[by_currency.index.notna()]
+    for currency, counts in by_currency.iterrows():
+        currency_searches = counts['searches']
+        currency_bookings = counts['bookings']
+
+        print(f"\n{currency}:")
+        print(f"Keresések száma: {currency_searches:,}")
+        print(f"Foglalások száma: {currency_bookings:,}")
+        print(f"Konverziós ráta (keresés → foglalás): {(currency_bookings/currency_searches*100):.2f}%")
+        print(f"Részesedés a keresésekből: {(currency_searches/total_searches*100):.2f}%")
+        print(f"Részesedés a foglalásokból: {(currency_bookings/total_bookings*100):.2f}%")
+
+
+def main(hotel_id=1, data_root=None):
+    # Adatok betöltése (csak a szükséges táblák és oszlopok, első hozzáféréskor)
+    dataframes = optimize_dataframes(hotel_id, data_root, lazy=True, columns=COLUMNS)
+    run(dataframes, hotel_id)
+
+
+if __name__ == "__main__":
+    main(cli_hotel_id())
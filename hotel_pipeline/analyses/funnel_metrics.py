@@ -1,32 +1,29 @@
 import pandas as pd
 import plotly.graph_objects as go
-from hotel_1_data_cleaner import optimize_dataframes
 
-def create_basic_funnel(dfs):
-    """Alap funnel számítások"""
-    # 1. Összes weboldal látogató
-    total_visitors = dfs['website_daily_users']['user_count'].sum()
+from hotel_pipeline.analyses import cli_hotel_id
+from hotel_pipeline.cleaner import optimize_dataframes
+from hotel_pipeline.figures import emit_figure, plotly_spec
+from hotel_pipeline.funnel import funnel_columns, funnel_totals, get_funnel_cube
 
-    # 2. Dátumválasztó használat
-    datepicker_users = dfs['datepicker_daily_visitors']['user_count'].sum()
+def create_basic_funnel(dfs, cube=None):
+    """Alap funnel számítások (a közös funnel kockából)"""
+    if cube is None:
+        cube = get_funnel_cube(dfs)
+    totals = funnel_totals(cube)
 
-    # 3. Keresések száma (egyedi search_log_session_id alapján)
-    searches = len(dfs['search_log']['search_log_session_id'].unique())
-
-    # 4. Foglalások száma
-    bookings = len(dfs['booking_data'])
-
-    # Funnel adatok összeállítása
+    # Látogatók, dátumválasztó használat, keresések (egyedi search_log_session_id
+    # alapján) és foglalások (a booking_data sorai)
     funnel_data = {
         'Stage': ['Website Visits', 'Datepicker Usage', 'Searches', 'Bookings'],
-        'Users': [total_visitors, datepicker_users, searches, bookings]
+        'Users': [totals['visitors'], totals['datepicker'], totals['sessions'], totals['booking_records']]
     }
 
     return pd.DataFrame(funnel_data)
 
-def plot_enhanced_funnel(dfs):
+def plot_enhanced_funnel(dfs, cube=None):
     """Fejlesztett funnel vizualizáció Plotly-val"""
-    funnel_df = create_basic_funnel(dfs)
+    funnel_df = create_basic_funnel(dfs, cube)
     
     # Konverziós ráták számítása
     conv_rates = []
@@ -108,9 +105,9 @@ def plot_enhanced_funnel(dfs):
 
     return fig
 
-def print_funnel_summary(dfs):
+def print_funnel_summary(dfs, cube=None):
     """Funnel összefoglaló statisztikák"""
-    funnel_df = create_basic_funnel(dfs)
+    funnel_df = create_basic_funnel(dfs, cube)
 
     print("\nFunnel Analysis Summary")
     print("=" * 50)
@@ -140,17 +137,20 @@ def print_funnel_summary(dfs):
     total_conversion = (funnel_df['Users'].iloc[3] / funnel_df['Users'].iloc[0]) * 100
     print(f"🔄 Website Visits → Bookings: {total_conversion:.1f}%")
 
-def main():
-    # Adatok betöltése
-    input_dir = '/config/workspace/verseny_dataklub_morgens/data/raw/hotel_1'
-    print("📂 Loading and optimizing data...")
-    dfs = optimize_dataframes(input_dir)
-
+def run(dfs, hotel_id, output_dir='.'):
     # Függvények futtatása
+    # A diagram és az összefoglaló ugyanazt a kockát olvassa
+    cube = get_funnel_cube(dfs)
     print("🎨 Generating enhanced funnel analysis...")
-    fig = plot_enhanced_funnel(dfs)
-    fig.show()
-    print_funnel_summary(dfs)
+    fig = plot_enhanced_funnel(dfs, cube)
+    emit_figure(plotly_spec('funnel', fig), output_dir)
+    print_funnel_summary(dfs, cube)
+
+def main(hotel_id=1, data_root=None):
+    # Adatok betöltése (csak a funnelhez szükséges táblák és oszlopok)
+    print("📂 Loading and optimizing data...")
+    dfs = optimize_dataframes(hotel_id, data_root, lazy=True, columns=funnel_columns())
+    run(dfs, hotel_id)
 
 if __name__ == "__main__":
-    main()
+    main(cli_hotel_id())
@@ -0,0 +1,152 @@
+import os
+
+import pandas as pd
+import numpy as np
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+from hotel_pipeline.analyses import cli_hotel_id
+from hotel_pipeline.cleaner import optimize_dataframes
+from hotel_pipeline.facts import get_booking_facts
+
+def analyze_lead_time_by_category(booking_facts):
+    # Csak a tényleges foglalásokat nézzük; a lead time és a kategória a ténytáblában van
+    actual_bookings = booking_facts[booking_facts['has_booking_record']].copy()
+
+    # Alap statisztikák számítása
+    stats = actual_bookings.groupby('guest_category').agg({
+        'lead_time': ['count', 'mean', 'median', 'std', 'min', 'max']
+    }).round(1)
+
+    # Vizualizáció
+    plt.figure(figsize=(15, 8))
+    sns.boxplot(data=actual_bookings, x='guest_category', y='lead_time', showfliers=False)
+    plt.xticks(rotation=45, ha='right')
+    plt.title('Lead Time Eloszlás Vendégkategóriánként')
+    plt.xlabel('Vendégkategória')
+    plt.ylabel('Lead Time (napok)')
+    plt.tight_layout()
+
+    # Percentilisek számítása
+    percentiles = actual_bookings.groupby('guest_category')['lead_time'].agg([
+        ('25%', lambda x: np.percentile(x, 25)),
+        ('50%', lambda x: np.percentile(x, 50)),
+        ('75%', lambda x: np.percentile(x, 75))
+    ]).round(1)
+
+    return {
+        'basic_stats': stats,
+        'percentiles': percentiles,
+        'detailed_data': actual_bookings[['guest_category', 'lead_time', 'arrival', 'utc_datetime']]
+    }
+
+#######################################
+
+def analyze_lead_time_by_source_and_category(booking_facts):
+    # Csak a tényleges foglalásokat nézzük; a marketing forrás is a ténytáblában van
+    actual_bookings = booking_facts[booking_facts['has_booking_record']]
+
+    # Csak a megadott PPC források szűrése
+    ppc_sources = ['google / cpc', 'facebook / cpc', 'instagram / cpc', 'bing / cpc']
+    ppc_bookings = actual_bookings[actual_bookings['utm_source_and_medium'].isin(ppc_sources)].copy()
+
+    # Ha nincs elegendő adat, adjunk vissza üres eredményt
+    if len(ppc_bookings) == 0:
+        print("Figyelmeztetés: Nem található megfelelő PPC forrásból származó foglalás!")
+        return None
+
+    # Alap statisztikák számítása forrás és kategória szerint
+    stats = ppc_bookings.groupby(['utm_source_and_medium', 'guest_category']).agg({
+        'lead_time': ['count', 'mean', 'median', 'std', 'min', 'max']
+    }).round(1)
+
+    # Vizualizáció
+    plt.figure(figsize=(15, 8))
+    sns.boxplot(data=ppc_bookings, x='guest_category', y='lead_time', hue='utm_source_and_medium', showfliers=False)
+    plt.xticks(rotation=45, ha='right')
+    plt.title('Lead Time Eloszlás Vendégkategóriánként és Marketing Forrásonként')
+    plt.xlabel('Vendégkategória')
+    plt.ylabel('Lead Time (napok)')
+    plt.legend(title='Marketing Forrás', bbox_to_anchor=(1.05, 1), loc='upper left')
+    plt.tight_layout()
+
+    # Havi bontás hozzáadása
+    ppc_bookings['booking_month'] = ppc_bookings['utc_datetime'].dt.month
+    monthly_stats = ppc_bookings.groupby(['utm_source_and_medium', 'guest_category', 'booking_month'])['lead_time'].mean().unstack()
+
+    return {
+        'basic_stats': stats,
+        'monthly_stats': monthly_stats.round(1),
+        'detailed_data': ppc_bookings[['guest_category', 'lead_time', 'utm_source_and_medium', 'arrival', 'utc_datetime']]
+    }
+
+def run(dataframes, hotel_id, output_dir='.'):
+    # Foglalásonkénti ténytábla
+    booking_facts = get_booking_facts(dataframes)
+
+    # Függvény használata
+    results = analyze_lead_time_by_category(booking_facts)
+
+    # Eredmények megjelenítése
+    print("\nLead Time Alapstatisztikák Kategóriánként:")
+    print("=========================================")
+    print(results['basic_stats'])
+
+    print("\nLead Time Percentilisek Kategóriánként:")
+    print("======================================")
+    print(results['percentiles'])
+
+    # Átlagos lead time-ok sorrendben
+    avg_lead_times = results['detailed_data'].groupby('guest_category')['lead_time'].mean().sort_values(ascending=False)
+    print("\nÁtlagos Lead Time Kategóriánként (csökkenő sorrendben):")
+    print("====================================================")
+    print(avg_lead_times)
+
+    # További hasznos statisztikák
+    print("\nKategóriánkénti foglalások száma:")
+    print("================================")
+    bookings_by_category = results['detailed_data']['guest_category'].value_counts()
+    print(bookings_by_category)
+
+    # Havi bontás kategóriánként
+    results['detailed_data']['booking_month'] = results['detailed_data']['utc_datetime'].dt.month
+    monthly_stats = results['detailed_data'].groupby(['guest_category', 'booking_month'])['lead_time'].mean().unstack()
+    print("\nÁtlagos Lead Time havonként és kategóriánként:")
+    print("============================================")
+    print(monthly_stats.round(1))
+
+    # Plot mentése
+    plt.savefig(os.path.join(output_dir, 'lead_time_by_category.png'))
+    plt.close()
+
+    # Mindkét függvény használata
+    results_by_category = analyze_lead_time_by_category(booking_facts)
+    results_by_source = analyze_lead_time_by_source_and_category(booking_facts)
+
+    # Eredmények megjelenítése (csak ha van adat)
+    if results_by_source is not None:
+        print("\nLead Time Statisztikák Marketing Forrás és Kategória szerint:")
+        print("========================================================")
+        print(results_by_source['basic_stats'])
+
+        print("\nHavi átlagos Lead Time Marketing Forrás és Kategória szerint:")
+        print("=======================================================")
+        print(results_by_source['monthly_stats'])
+
+        # Források szerinti foglalások száma
+        bookings_by_source = results_by_source['detailed_data']['utm_source_and_medium'].value_counts()
+        print("\nFoglalások száma Marketing Forrásonként:")
+        print("=====================================")
+        print(bookings_by_source)
+
+        # Plot mentése
+        plt.savefig(os.path.join(output_dir, 'lead_time_by_source_and_category.png'))
+        plt.close()
+
+def main(hotel_id=1, data_root=None):
+    # Adatok beolvasása és optimalizálása
+    dataframes = optimize_dataframes(hotel_id, data_root, lazy=True)
+    run(dataframes, hotel_id)
+
+if __name__ == "__main__":
+    main(cli_hotel_id())
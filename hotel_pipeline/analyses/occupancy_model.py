@@ -1,7 +1,5 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split, TimeSeriesSplit, GridSearchCV
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
@@ -10,31 +8,23 @@ from sklearn.linear_model import ElasticNet, LinearRegression, Ridge
 from sklearn.feature_selection import SelectKBest, f_regression
 from sklearn.decomposition import PCA
 import joblib
+import os
 import warnings
 warnings.filterwarnings('ignore')
 
-# Adatok betöltése
-from hotel_3_data_cleaner import optimize_dataframes
-dfs = optimize_dataframes('/config/workspace/verseny_dataklub_morgens/data/raw/hotel_3')
-
-# DataFramek külön változókba mentése
-dataframes = {
-    'booking_data': dfs['booking_data'],
-    'daily_occupancy': dfs['daily_occupancy'],
-    'daily_ppc_budget': dfs['daily_ppc_budget'],
-    'datepicker_daily_visitors': dfs['datepicker_daily_visitors'],
-    'search_log': dfs['search_log'],
-    'search_log_room_child': dfs['search_log_room_child'],
-    'search_log_room': dfs['search_log_room'],
-    'search_log_room_offer': dfs['search_log_room_offer'],
-    'search_log_session': dfs['search_log_session'],
-    'upsell_data': dfs['upsell_data'],
-    'website_daily_users': dfs['website_daily_users']
+from hotel_pipeline.analyses import cli_hotel_id
+from hotel_pipeline.cleaner import optimize_dataframes
+from hotel_pipeline.figures import emit_figure, figure_spec, panel
+from hotel_pipeline.rollups import get_rollup
+
+# Az elemzéshez szükséges oszlopok; a látogatók és a PPC költések a napi rollup táblákból jönnek
+COLUMNS = {
+    'daily_occupancy': ['recording_date', 'subject_date', 'fill_rate'],
 }
 
-def prepare_analysis_data():
-    # Datepicker adatok aggregálása
-    daily_datepicker = dataframes['datepicker_daily_visitors'].groupby('date').agg({
+def prepare_analysis_data(dataframes):
+    # Datepicker adatok napi összesítése (rollup tábla)
+    daily_datepicker = get_rollup(dataframes, 'datepicker_traffic').groupby('date').agg({
         'user_count': 'sum',
         'session_count': 'sum'
     }).reset_index()
@@ -46,9 +36,8 @@ def prepare_analysis_data():
     daily_occupancy = daily_occupancy[['subject_date', 'fill_rate']]
     daily_occupancy = daily_occupancy.rename(columns={'subject_date': 'date'})
 
-    # PPC költések
-    ppc = dataframes['daily_ppc_budget']
-    ppc['total_ppc_spend'] = ppc['daily_google_spend'] + ppc['daily_microsoft_spend'] + ppc['daily_meta_spend']
+    # PPC költések (napi rollup, a platformok összegével)
+    ppc = get_rollup(dataframes, 'ppc_spend')
 
     # Adatok összefűzése
     merged_data = daily_datepicker.merge(daily_occupancy, on='date', how='left')
@@ -174,41 +163,39 @@ def print_results(results):
         if 'Best_Params' in metrics and metrics['Best_Params'] != 'N/A':
             print(f"Legjobb paraméterek: {metrics['Best_Params']}")
 
-def plot_results(y_test, predictions, results, title_suffix=''):
+def plot_results(y_test, predictions, results, title_suffix='', output_dir='.', name_suffix=''):
     """Eredmények vizualizációja"""
-    plt.figure(figsize=(15, 8))
-
-    # Egyszerűsített index kezelés
-    x_values = range(len(y_test))
-
-    plt.plot(x_values, y_test.values, label='Tényleges', linewidth=2)
-
+    # Egyszerűsített index kezelés: a megfigyelések sorszáma az x tengely
+    lines = pd.DataFrame({'Tényleges': y_test.to_numpy()})
     for name, pred in predictions.items():
         # Eltávolítjuk a suffix-et a megjelenítéshez
         display_name = name.split('_')[0]  # Csak az első részt vesszük (a suffix előttit)
-        plt.plot(x_values, pred, label=f'{display_name} előrejelzés', alpha=0.7)
-
-    plt.title(f'Tényleges vs Előrejelzett értékek {title_suffix}')
-    plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-    plt.xlabel('Megfigyelések')
-    plt.ylabel('Érték')
-    plt.grid(True)
-    plt.tight_layout()
-    plt.show()
+        lines[f'{display_name} előrejelzés'] = np.asarray(pred)
+
+    emit_figure(figure_spec(f'elorejelzesek{name_suffix}', panel(
+        'line', lines,
+        style={'series': {
+            column: {'linewidth': 2} if column == 'Tényleges' else {'alpha': 0.7} for column in lines.columns
+        }},
+        title=f'Tényleges vs Előrejelzett értékek {title_suffix}',
+        legend={'bbox_to_anchor': (1.05, 1), 'loc': 'upper left'},
+        xlabel='Megfigyelések',
+        ylabel='Érték',
+        grid=True
+    ), figsize=(15, 8)), output_dir)
 
     # Metrikák vizualizációja
     metrics_df = pd.DataFrame({k: {metric: v[metric] for metric in ['RMSE', 'R2', 'MAE']} 
                               for k, v in results.items()}).round(3)
 
-    plt.figure(figsize=(12, 6))
-    metrics_df.plot(kind='bar')
-    plt.title(f'Modell teljesítmények összehasonlítása {title_suffix}')
-    plt.xlabel('Metrikák')
-    plt.ylabel('Érték')
-    plt.xticks(rotation=45)
-    plt.grid(True)
-    plt.tight_layout()
-    plt.show()
+    emit_figure(figure_spec(f'modell_metrikak{name_suffix}', panel(
+        'bar', metrics_df,
+        title=f'Modell teljesítmények összehasonlítása {title_suffix}',
+        xlabel='Metrikák',
+        ylabel='Érték',
+        xticks={'rotation': 45},
+        grid=True
+    ), figsize=(12, 6)), output_dir)
 
 def try_models(X_train, X_test, y_train, y_test, suffix=''):
     """Modellek kipróbálása és értékelése"""
@@ -256,10 +243,10 @@ def try_models(X_train, X_test, y_train, y_test, suffix=''):
 
     # Visszaadjuk a három szükséges objektumot
     return results, predictions, best_models
-def main():
+def run(dataframes, hotel_id, output_dir='.'):
     # Adatok előkészítése
     print("Adatok előkészítése...")
-    data = prepare_analysis_data()
+    data = prepare_analysis_data(dataframes)
     
     # Target és feature-ök szétválasztása
     X = data.drop('fill_rate', axis=1)
@@ -303,11 +290,11 @@ def main():
     # Eredmények megjelenítése és elemzése
     print("\nEredmények kiválasztott jellemzőkkel:")
     print_results(results_selected)
-    plot_results(y_test, predictions_selected, results_selected, "- Kiválasztott jellemzők")
+    plot_results(y_test, predictions_selected, results_selected, "- Kiválasztott jellemzők", output_dir, '_kivalasztott')
     
     print("\nEredmények PCA jellemzőkkel:")
     print_results(results_pca)
-    plot_results(y_test, predictions_pca, results_pca, "- PCA jellemzők")
+    plot_results(y_test, predictions_pca, results_pca, "- PCA jellemzők", output_dir, '_pca')
     
     # Legjobb modell kiválasztása és részletes elemzése
     best_method = 'Selected' if min(results_selected.values(), key=lambda x: x['RMSE'])['RMSE'] < \
@@ -328,20 +315,23 @@ def main():
     # Reziduálisok elemzése
     residuals = y_test - best_predictions[best_model_name_full]
 
-    plt.figure(figsize=(12, 6))
-    plt.subplot(1, 2, 1)
-    plt.scatter(best_predictions[best_model_name_full], residuals)
-    plt.axhline(y=0, color='r', linestyle='--')
-    plt.xlabel('Előrejelzett értékek')
-    plt.ylabel('Reziduálisok')
-    plt.title('Reziduálisok vs Előrejelzett értékek')
-
-    plt.subplot(1, 2, 2)
-    sns.histplot(residuals, kde=True)
-    plt.xlabel('Reziduálisok')
-    plt.title('Reziduálisok eloszlása')
-    plt.tight_layout()
-    plt.show()
+    # Sok tesztpontnál a pontdiagram sűrűségtérképként rajzolódik ki
+    predicted = np.asarray(best_predictions[best_model_name_full], dtype='float64')
+    residual_points = pd.DataFrame({'x': predicted, 'y': residuals.to_numpy(dtype='float64')})
+    emit_figure(figure_spec('rezidualisok', [
+        panel(
+            'scatter', residual_points,
+            axhline={'y': 0, 'color': 'r', 'linestyle': '--'},
+            xlabel='Előrejelzett értékek',
+            ylabel='Reziduálisok',
+            title='Reziduálisok vs Előrejelzett értékek'
+        ),
+        panel(
+            'hist', residuals.rename('Reziduálisok'), style={'kde': True, 'alpha': 0.6, 'edgecolor': 'white'},
+            xlabel='Reziduálisok',
+            title='Reziduálisok eloszlása'
+        )
+    ], cols=2, figsize=(12, 6)), output_dir)
 
     # Legjobb modell mentése
     best_models = best_models_selected if best_method == 'Selected' else best_models_pca
@@ -355,8 +345,14 @@ def main():
         'scaler': StandardScaler()  # Új scaler példány
     }
 
-    joblib.dump(model_info, 'best_hotel_occupancy_model.joblib')
-    print("\nLegjobb modell elmentve: 'best_hotel_occupancy_model.joblib'")
+    model_path = os.path.join(output_dir, 'best_hotel_occupancy_model.joblib')
+    joblib.dump(model_info, model_path)
+    print(f"\nLegjobb modell elmentve: '{model_path}'")
+
+def main(hotel_id=1, data_root=None):
+    # Adatok betöltése
+    dataframes = optimize_dataframes(hotel_id, data_root, lazy=True, columns=COLUMNS)
+    run(dataframes, hotel_id)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(cli_hotel_id())
@@ -0,0 +1,235 @@
+import pandas as pd
+
+from hotel_pipeline.analyses import cli_hotel_id
+from hotel_pipeline.cleaner import optimize_dataframes
+from hotel_pipeline.facts import get_booking_facts
+from hotel_pipeline.figures import emit_figure, figure_spec, panel
+from hotel_pipeline.fx import REPORTING_CURRENCY, REPORTING_SUFFIX, currency_order, get_normalized
+from hotel_pipeline.money import to_major
+from hotel_pipeline.report import emit_table, table_spec
+from hotel_pipeline.rollups import get_rollup
+
+def style_dataframe(df, caption=""):
+    """
+    Stílusos táblázat formázás (a riport színezésével és táblázat stílusával)
+    """
+    return table_spec(df, caption, "{:.2f}", gradient='YlOrRd')
+
+def clean_and_display_revenue(df, currency, caption=None):
+    """
+    Tisztítja és megjeleníti a bevételi táblázatot
+    """
+    # Csak azokat az oszlopokat tartjuk meg, ahol van érték
+    sums = df.sum()
+    non_zero_cols = sums[sums != 0].index
+
+    # Szűrjük a DataFrame-et
+    df_cleaned = df[non_zero_cols]
+
+    # Formázás és megjelenítés
+    styled_df = style_dataframe(df_cleaned, caption or f"Bevételek {currency}-ban")
+    emit_table(styled_df)
+
+    return df_cleaned
+
+def run(dataframes, hotel_id, output_dir='.'):
+    # Napi forgalom és költések a rollup táblákból
+    datepicker = get_rollup(dataframes, 'datepicker_traffic')
+    ppc_budget = get_rollup(dataframes, 'ppc_spend')
+    booking_facts = get_booking_facts(dataframes)
+
+    # Stílus beállítások
+    pd.set_option('display.precision', 2)
+    pd.set_option('display.max_columns', None)
+
+    # PPC források szűrése
+    ppc_sources = ['google / cpc', 'facebook / cpc', 'instagram / cpc', 'bing / cpc']
+    datepicker_ppc = datepicker[datepicker['utm_source_and_medium'].isin(ppc_sources)]
+
+    # Napi aggregálás forrásonként
+    daily_ppc_traffic = datepicker_ppc.groupby(['date', 'utm_source_and_medium'])\
+        .agg({
+            'user_count': 'sum',
+            'session_count': 'sum'
+        }).reset_index()
+
+    # Dátumok konvertálása
+    daily_ppc_traffic['date'] = pd.to_datetime(daily_ppc_traffic['date'])
+    ppc_budget['date'] = pd.to_datetime(ppc_budget['date'])
+
+    # Egységes színek definiálása
+    colors = {
+        'google / cpc': '#1f77b4',    # kék
+        'facebook / cpc': '#ff7f0e',  # narancssárga
+        'instagram / cpc': '#2ca02c', # zöld
+        'bing / cpc': '#d62728',      # piros
+        'Google': '#1f77b4',          # ugyanaz a kék
+        'Bing': '#d62728',           # ugyanaz a piros
+        'Meta (FB+IG)': '#2ca02c'    # ugyanaz a zöld
+    }
+
+    # Költségek és forgalom vizualizációja: forrásonként, illetve platformonként egy vonal
+    source_traffic = daily_ppc_traffic.pivot_table(
+        index='date', columns='utm_source_and_medium', values='user_count', aggfunc='sum', observed=True
+    ).reindex(columns=ppc_sources)
+    platform_spend = ppc_budget.set_index('date')[
+        ['daily_google_spend', 'daily_microsoft_spend', 'daily_meta_spend']
+    ].rename(columns={
+        'daily_google_spend': 'Google',
+        'daily_microsoft_spend': 'Bing',
+        'daily_meta_spend': 'Meta (FB+IG)'
+    })
+    emit_figure(figure_spec('ppc_forgalom_koltseg', [
+        panel(
+            'line', source_traffic,
+            style={'marker': 'o', 'series': {source: {'color': colors[source]} for source in ppc_sources}},
+            title='Napi látogatók száma PPC forrásonként',
+            xlabel='Dátum',
+            ylabel='Látogatók száma',
+            legend={},
+            grid=True
+        ),
+        panel(
+            'line', platform_spend,
+            style={'marker': 'o', 'series': {platform: {'color': colors[platform]} for platform in platform_spend}},
+            title='Napi PPC költségek platformonként',
+            xlabel='Dátum',
+            ylabel='Költség (HUF)',
+            legend={},
+            grid=True
+        )
+    ], rows=2, figsize=(15, 10)), output_dir)
+
+    # Sikeres foglalások a ténytáblából; a kategória és a forrás már hozzá van kapcsolva
+    bookings_with_source = booking_facts[booking_facts['converted']].rename(
+        columns={'guest_category': 'family_category'}
+    )
+
+    # PPC foglalások szűrése
+    ppc_bookings = bookings_with_source[
+        (bookings_with_source['utm_medium'] == 'cpc') &
+        (bookings_with_source['utm_source'].isin(['google', 'facebook', 'instagram', 'bing']))
+    ]
+
+    # Célcsoportés PPC források kereszttáblája
+    family_source_dist = pd.crosstab(
+        ppc_bookings['family_category'],
+        ppc_bookings['utm_source'],
+        normalize='columns'
+    ) * 100
+
+    # Célcsoport vizualizációja
+    colors_map = {'google': colors['google / cpc'],
+                  'facebook': colors['facebook / cpc'],
+                  'instagram': colors['instagram / cpc'],
+                  'bing': colors['bing / cpc']}
+
+    emit_figure(figure_spec('ppc_celcsoport_megoszlas', panel(
+        'bar', family_source_dist, style={'color': [colors_map[col] for col in family_source_dist.columns]},
+        title='PPC forrásból származó foglalások célcsoportonkénti eloszlása (%)',
+        xlabel='Célcsoport',
+        ylabel='Arány (%)',
+        legend={'title': 'PPC Forrás'},
+        xticks={'rotation': 45, 'ha': 'right'}
+    ), figsize=(15, 8)), output_dir)
+
+    # Konverziós arányok számítása - csak PPC források
+    ppc_mapping = {
+        'google / cpc': 'google',
+        'facebook / cpc': 'facebook',
+        'instagram / cpc': 'instagram',
+        'bing / cpc': 'bing'
+    }
+
+    # Látogatók számának összesítése PPC források szerint
+    visitors = daily_ppc_traffic.groupby('utm_source_and_medium')['user_count'].sum()
+    visitors.index = visitors.index.map(lambda x: ppc_mapping.get(x, x))
+
+    # Sikeres foglalások számának összesítése
+    bookings = ppc_bookings['utm_source'].value_counts()
+
+    # Konverziós arányok DataFrame létrehozása
+    conversions = pd.DataFrame({
+        'Összes látogató': visitors,
+        'Sikeres foglalások': bookings
+    }).fillna(0)
+
+    # Konverziós arány számítása
+    conversions['Konverziós arány (%)'] = (
+        conversions['Sikeres foglalások'] / conversions['Összes látogató'] * 100
+    ).round(3)
+
+    # Csak azokat a sorokat tartjuk meg, ahol van látogató vagy foglalás
+    conversions = conversions[
+        (conversions['Összes látogató'] > 0) | 
+        (conversions['Sikeres foglalások'] > 0)
+    ]
+
+    # Stílusos megjelenítés
+    styled_conversions = style_dataframe(conversions, "Konverziós arányok forrásonként")
+    emit_table(styled_conversions)
+
+    # Foglalások száma (abszolút értékben)
+    bookings_count = pd.crosstab(
+        ppc_bookings['family_category'],
+        ppc_bookings['utm_source']
+    )
+
+    styled_bookings_count = style_dataframe(bookings_count, "Foglalások száma PPC forrásonként (db)")
+    emit_table(styled_bookings_count)
+
+    # Bevételek elemzése pénznemenként: egy kimutatás, a pénznem a sorok első szintje
+    revenue = pd.pivot_table(
+        ppc_bookings,
+        values='total_price_final',
+        index=['currency', 'family_category'],
+        columns='utm_source',
+        aggfunc=['count', 'sum'],
+        fill_value=0,
+        observed=True
+    )
+    # Az összegek váltópénz egységben adódnak össze, a kimutatásba pénzegységben kerülnek
+    revenue = pd.concat({'count': revenue['count'], 'sum': to_major(revenue['sum'])}, axis=1)
+
+    # Tisztított táblázatok megjelenítése
+    revenue_cleaned = {
+        currency: clean_and_display_revenue(revenue.loc[currency], currency)
+        for currency in currency_order(ppc_bookings['currency'])
+    }
+
+    # Az összes PPC foglalás bevétele egy pénznemben, a foglalás napi árfolyamával
+    normalized = get_normalized(dataframes, 'search_log')
+    if normalized is not None:
+        reporting_prices = normalized.set_index('id')['total_price_final' + REPORTING_SUFFIX]
+        reporting_revenue = pd.pivot_table(
+            ppc_bookings.assign(total_price_final=ppc_bookings['search_log_id'].map(reporting_prices)),
+            values='total_price_final',
+            index='family_category',
+            columns='utm_source',
+            aggfunc=['count', 'sum'],
+            fill_value=0,
+            observed=True
+        )
+        clean_and_display_revenue(
+            reporting_revenue, REPORTING_CURRENCY,
+            f"Bevételek riport pénznemben ({REPORTING_CURRENCY}, napi árfolyammal)"
+        )
+
+    # Vizualizáció az abszolút számokkal
+    emit_figure(figure_spec('ppc_foglalasok_szama', panel(
+        'bar', bookings_count, style={'color': [colors_map[col] for col in bookings_count.columns]},
+        title='Foglalások abszolút száma forrásonként és célcsoportonként',
+        xlabel='Célcsoport',
+        ylabel='Foglalások száma (db)',
+        legend={'title': 'PPC Forrás'},
+        xticks={'rotation': 45, 'ha': 'right'},
+        grid=True
+    ), figsize=(15, 8)), output_dir)
+
+def main(hotel_id=1, data_root=None):
+    # Adatok beolvasása
+    dataframes = optimize_dataframes(hotel_id, data_root, lazy=True)
+    run(dataframes, hotel_id)
+
+if __name__ == "__main__":
+    main(cli_hotel_id())
@@ -0,0 +1,206 @@
+import pandas as pd
+import numpy as np
+
+from hotel_pipeline.analyses import cli_hotel_id
+from hotel_pipeline.cleaner import optimize_dataframes
+from hotel_pipeline.facts import get_booking_facts
+from hotel_pipeline.figures import emit_figure, figure_spec, panel
+from hotel_pipeline.fx import currency_order
+from hotel_pipeline.money import to_major
+from hotel_pipeline.report import emit_table, table_spec
+
+# Stílus beállítások
+pd.set_option('display.precision', 2)
+pd.set_option('display.max_columns', None)
+
+# Színek definiálása
+colors_map = {
+    'google': '#1f77b4',
+    'facebook': '#ff7f0e',
+    'instagram': '#2ca02c',
+    'bing': '#d62728'
+}
+
+def style_dataframe(df, caption=""):
+    """
+    Stílusos táblázat formázás (a riport színezésével és táblázat stílusával)
+    """
+    return table_spec(df, caption, "{:.2f}", gradient='YlOrRd')
+
+def currency_slice(counts, currency):
+    """Egy deviza sorai egy (deviza, ...) indexű kereszttáblából, az üres oszlopok nélkül."""
+    counts = counts.loc[currency]
+    return counts.loc[:, counts.sum() > 0]
+
+def booked_rooms(dataframes):
+    """
+    A sikeres foglalások (conversion = 1) szobánként egy sorral, a ténytábla
+    kategória és utm oszlopaival.
+    """
+    booking_facts = get_booking_facts(dataframes)
+    successful_bookings = booking_facts[booking_facts['converted']]
+    return successful_bookings.merge(
+        dataframes['search_log_room'][['search_log_id', 'picked_room']],
+        on='search_log_id',
+        how='left'
+    )
+
+def analyze_room_choices(dataframes, output_dir='.'):
+    """
+    Elemzi a szoba választásokat különböző vendég kategóriák és devizák szerint.
+    """
+    # Foglalások a szoba információkkal; a kategória a ténytáblából jön
+    booking_analysis = booked_rooms(dataframes).rename(columns={'guest_category': 'booking_category'})
+
+    results = {}
+
+    # Foglalások száma devizánként, kategóriánként és szobatípusonként egy kereszttáblában
+    all_room_counts = pd.crosstab(
+        [booking_analysis['currency'], booking_analysis['booking_category']],
+        booking_analysis['picked_room']
+    )
+
+    # Devizánkénti elemzés: csak az előforduló devizák
+    for currency in currency_order(booking_analysis['currency']):
+        if currency in all_room_counts.index:  # Csak akkor elemezzük, ha van adat az adott devizában
+            # Abszolút számok
+            room_counts = currency_slice(all_room_counts, currency)
+
+            # Szoba választások elemzése kategóriánként
+            room_choices = room_counts.div(room_counts.sum(axis=1), axis=0) * 100
+
+            # Vizualizációk devizánként
+            emit_figure(figure_spec(f'szobavalasztas_megoszlas_{currency.lower()}', panel(
+                'bar', room_choices, style={'stacked': True},
+                title=f'Szoba választások megoszlása kategóriánként ({currency})',
+                xlabel='Foglalási kategória',
+                ylabel='Százalék',
+                legend={'title': 'Szobatípus', 'bbox_to_anchor': (1.05, 1)}
+            ), figsize=(15, 8)), output_dir)
+
+            emit_figure(figure_spec(f'szobafoglalasok_kategoriak_{currency.lower()}', panel(
+                'heatmap', room_counts, style={'annot': True, 'fmt': 'd', 'cmap': 'YlOrRd'},
+                title=f'Szoba foglalások száma kategóriánként ({currency})'
+            ), figsize=(12, 8)), output_dir)
+
+            results[currency] = {
+                'percentage': room_choices,
+                'counts': room_counts
+            }
+
+    return results
+
+def analyze_room_choices_by_ppc(dataframes, output_dir='.'):
+    """
+    Elemzi a szoba választásokat PPC források szerint
+    """
+    # Foglalások a szoba és session adatokkal
+    bookings_complete = booked_rooms(dataframes)
+
+    # PPC foglalások szűrése
+    ppc_bookings = bookings_complete[
+        (bookings_complete['utm_medium'] == 'cpc') &
+        (bookings_complete['utm_source'].isin(['google', 'facebook', 'instagram', 'bing']))
+    ]
+
+    results = {}
+
+    # 1. Szoba választások megoszlása PPC forrásonként
+    room_source_dist = pd.crosstab(
+        ppc_bookings['picked_room'],
+        ppc_bookings['utm_source'],
+        normalize='columns'
+    ) * 100
+
+    # Abszolút számok
+    room_source_counts = pd.crosstab(
+        ppc_bookings['picked_room'],
+        ppc_bookings['utm_source']
+    )
+
+    # Vizualizációk
+    emit_figure(figure_spec('szobavalasztas_ppc', panel(
+        'bar', room_source_dist, style={'color': [colors_map[col] for col in room_source_dist.columns]},
+        title='Szoba választások megoszlása PPC forrásonként (%)',
+        xlabel='Szobatípus',
+        ylabel='Arány (%)',
+        legend={'title': 'PPC Forrás'},
+        xticks={'rotation': 45, 'ha': 'right'}
+    ), figsize=(15, 8)), output_dir)
+
+    emit_figure(figure_spec('szobafoglalasok_ppc', panel(
+        'heatmap', room_source_counts, style={'annot': True, 'fmt': 'd', 'cmap': 'YlOrRd'},
+        title='Szoba foglalások száma PPC forrásonként',
+        xlabel='PPC Forrás',
+        ylabel='Szobatípus'
+    ), figsize=(12, 8)), output_dir)
+
+    # 2. Devizánkénti bontás PPC forrásonként: a deviza a kereszttáblák első sor szintje
+    all_currency_counts = pd.crosstab(
+        [ppc_bookings['currency'], ppc_bookings['picked_room']],
+        ppc_bookings['utm_source']
+    )
+    all_avg_price = to_major(ppc_bookings.pivot_table(
+        values='total_price_final',
+        index=['currency', 'picked_room'],
+        columns='utm_source',
+        aggfunc='mean',
+        observed=True
+    ))
+
+    for currency in currency_order(ppc_bookings['currency']):
+        if currency in all_currency_counts.index:
+            # Abszolút számok
+            currency_counts = currency_slice(all_currency_counts, currency)
+
+            # Százalékos megoszlás
+            currency_dist = currency_counts.div(currency_counts.sum(axis=0), axis=1) * 100
+
+            # Átlagos foglalási érték
+            avg_price = all_avg_price.loc[currency].dropna(axis=1, how='all')
+
+            # Stílusos megjelenítés
+            print(f"\nSzoba választások {currency} devizában PPC forrásonként (%):")
+            styled_dist = style_dataframe(currency_dist.round(2), 
+                                        f"Szoba választások megoszlása {currency} devizában (%)")
+            emit_table(styled_dist)
+
+            print(f"\nSzoba választások {currency} devizában PPC forrásonként (db):")
+            styled_counts = style_dataframe(currency_counts, 
+                                          f"Szoba foglalások száma {currency} devizában")
+            emit_table(styled_counts)
+
+            # Átlagos foglalási érték heatmap
+            emit_figure(figure_spec(f'atlagos_foglalasi_ertek_ppc_{currency.lower()}', panel(
+                'heatmap', avg_price, style={'annot': True, 'fmt': '.0f', 'cmap': 'YlOrRd'},
+                title=f'Átlagos foglalási érték szobatípusonként és PPC forrásonként ({currency})',
+                xlabel='PPC Forrás',
+                ylabel='Szobatípus'
+            ), figsize=(12, 8)), output_dir)
+
+            results[currency] = {
+                'distribution': currency_dist,
+                'counts': currency_counts,
+                'avg_price': avg_price
+            }
+
+    return results
+
+def run(dataframes, hotel_id, output_dir='.'):
+    print("\n=== Szoba választások elemzése kategóriák szerint ===")
+    # Kategória elemzés futtatása
+    category_results = analyze_room_choices(dataframes, output_dir)
+
+    print("\n=== Szoba választások elemzése PPC források szerint ===")
+    # PPC elemzés futtatása
+    ppc_results = analyze_room_choices_by_ppc(dataframes, output_dir)
+
+    return category_results, ppc_results
+
+def main(hotel_id=1, data_root=None):
+    # Adatok tisztítása és betöltése
+    dataframes = optimize_dataframes(hotel_id, data_root, lazy=True)
+    run(dataframes, hotel_id)
+
+if __name__ == "__main__":
+    main(cli_hotel_id())
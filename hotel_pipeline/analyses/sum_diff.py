@@ -0,0 +1,104 @@
+import os
+
+import pandas as pd
+import numpy as np
+
+from hotel_pipeline.analyses import cli_hotel_id
+from hotel_pipeline.cleaner import optimize_dataframes
+from hotel_pipeline.figures import emit_figure, figure_spec, panel
+from hotel_pipeline.money import to_major
+from hotel_pipeline.reconciliation import CAUSES, currency_summary, exceptions, reconcile_bookings
+
+def create_diff_plot(currency_data, currency, save_name, hotel_id, output_dir='.'):
+    """Eltérések diagram készítése egy adott devizára (az egyeztetett sorokból)"""
+    # Külön színek a pozitív (többlet) és negatív (hiány) eltéréseknek
+    points = currency_data.loc[currency_data['diff'] != 0, ['utc_datetime', 'diff']]
+    data = pd.DataFrame({
+        'x': pd.to_datetime(points['utc_datetime']),
+        'y': points['diff'],
+        'series': np.where(points['diff'] > 0, 'Többlet', 'Hiány')
+    })
+
+    spec = figure_spec(f'elteresek_idosora_{save_name}', panel(
+        'scatter', data,
+        style={'alpha': 0.6, 'series': {'Többlet': {'color': 'blue'}, 'Hiány': {'color': 'red'}}},
+        title={'text': f'HOTEL {hotel_id} - Eltérések időbeli eloszlása ({currency})', 'fontsize': 14, 'pad': 20},
+        xlabel={'text': 'Dátum', 'fontsize': 12},
+        ylabel={'text': f'Eltérés ({currency})', 'fontsize': 12},
+        date_format='%Y-%m-%d',
+        xticks={'rotation': 45},
+        grid={'alpha': 0.4, 'linestyle': '--'},
+        axhline={'y': 0, 'color': 'black', 'linestyle': '--', 'alpha': 0.5},
+        legend=True
+    ), figsize=(12, 6))
+    emit_figure(spec, output_dir)
+
+def run(dfs, hotel_id, output_dir='.'):
+    booking_data = dfs['booking_data']
+    search_log = dfs['search_log']
+
+    # Egyeztetés egy kapcsolással; az eltérések és okaik pénznemenként egy csoportosítással
+    reconciled = reconcile_bookings(booking_data, search_log, dfs['upsell_data'])
+    exception_table = exceptions(reconciled)
+    summary = currency_summary(reconciled)
+    exceptions_by_currency = dict(tuple(exception_table.groupby('currency', observed=True)))
+
+    exception_table.to_csv(os.path.join(output_dir, 'elteresek.csv'), index=False)
+
+    # Devizánkénti elemzés
+    for currency in search_log['currency'].unique():
+        diff_count = int(summary['discrepancies'].get(currency, 0))
+
+        print(f"\n{'='*50}")
+        print(f"\nDeviza: {currency}")
+        print(f"Eltérések száma: {diff_count}")
+
+        if diff_count > 0:
+            causes = summary.loc[currency, CAUSES[1:]].astype(int)
+            print("Eltérések okai: " + ", ".join(f"{cause}: {count}" for cause, count in causes.items() if count > 0))
+
+            currency_data = exceptions_by_currency[currency]
+            print("\nTop 5 legnagyobb abszolút eltérés:")
+            top_5 = currency_data.head(5)[
+                ['search_log_id', 'sum', 'total_price_final', 'diff', 'currency']
+            ]
+            print(top_5)
+
+            create_diff_plot(currency_data, currency, currency.lower(), hotel_id, output_dir)
+
+    # Foglalási statisztikák
+    print("\n" + "="*50)
+    print("\nFoglalási statisztikák:")
+
+    # Foglalások száma és konverziós ráta
+    total_bookings = search_log['conversion'].sum()
+    total_searches = len(search_log)
+
+    print(f"\nÖsszes keresés száma: {total_searches:,}")
+    print(f"Összes foglalás száma: {int(total_bookings):,}")
+    print(f"Konverziós ráta: {(total_bookings/total_searches)*100:.2f}%")
+
+    # Foglalások devizánkénti bontásban
+    bookings_by_currency = search_log[search_log['conversion'] == 1]['currency'].value_counts()
+    print("\nFoglalások devizánként:")
+    print(bookings_by_currency)
+
+    # Foglalások nyelvi bontásban
+    bookings_by_language = search_log[search_log['conversion'] == 1]['lang_code'].value_counts()
+    print("\nFoglalások nyelvenként:")
+    print(bookings_by_language)
+
+    # Átlagos foglalási érték devizánként
+    avg_booking_value = to_major(
+        search_log[search_log['conversion'] == 1].groupby('currency')['total_price_final'].mean()
+    )
+    print("\nÁtlagos foglalási érték devizánként:")
+    print(avg_booking_value)
+
+def main(hotel_id=1, data_root=None):
+    # Adatok betöltése
+    dfs = optimize_dataframes(hotel_id, data_root, lazy=True)
+    run(dfs, hotel_id)
+
+if __name__ == "__main__":
+    main(cli_hotel_id())
@@ -0,0 +1,40 @@
+from hotel_pipeline.analyses import cli_hotel_id
+from hotel_pipeline.categorical import category_str
+from hotel_pipeline.cleaner import optimize_dataframes
+
+# Csak ezekre a táblákra és oszlopokra van szükség
+COLUMNS = {
+    'datepicker_daily_visitors': ['utm_source_and_medium']
+}
+
+
+def run(dfs, hotel_id, output_dir='.'):
+    # Datepicker DataFrame kiemelése
+    datepicker_df = dfs['datepicker_daily_visitors']
+
+    # CPC tartalmú utm_source_and_medium értékek szűrése (a kategória szótáron)
+    cpc_mask = category_str(datepicker_df['utm_source_and_medium'], 'contains', 'cpc', case=False, na=False)
+    cpc_sources = datepicker_df[cpc_mask]
+
+    # Egyedi értékek kiírása
+    unique_cpc_sources = sorted(cpc_sources['utm_source_and_medium'].unique())
+
+    print("\nCPC-t tartalmazó utm_source_and_medium értékek:")
+    print("=" * 50)
+    for source in unique_cpc_sources:
+        print(source)
+
+    # Előfordulási gyakoriság
+    print("\nElőfordulási gyakoriság:")
+    print("=" * 50)
+    print(cpc_sources['utm_source_and_medium'].value_counts())
+
+
+def main(hotel_id=1, data_root=None):
+    # Adatok tisztítása és betöltése
+    dfs = optimize_dataframes(hotel_id, data_root, lazy=True, columns=COLUMNS)
+    run(dfs, hotel_id)
+
+
+if __name__ == "__main__":
+    main(cli_hotel_id())
@@ -0,0 +1,251 @@
+import sys
+
+import pandas as pd
+
+from hotel_pipeline.analyses import cli_hotel_id
+from hotel_pipeline.cleaner import optimize_dataframes
+from hotel_pipeline.fx import currency_order
+from hotel_pipeline.journeys import converted_searches, user_column, user_journeys
+from hotel_pipeline.money import to_major
+
+def visits_by_currency(bookings, results_df):
+    """
+    Devizánkénti foglalási statisztikák és látogatás eloszlások egy menetben.
+
+    Egy felhasználó minden olyan devizánál szerepel, amelyben foglalt; az értéke
+    mindig az első foglalása előtti látogatások száma.
+
+    Returns:
+        tuple: (devizánkénti statisztikák DataFrame-je, (deviza, látogatások) ->
+        felhasználók száma Series)
+    """
+    column = user_column(bookings)
+    conversions = bookings[bookings['conversion'] == 1]
+    visits = conversions[[column, 'currency']].drop_duplicates().merge(
+        results_df[[column, 'visits_before_booking']], on=column
+    )
+
+    visit_stats = visits.groupby('currency', observed=True)['visits_before_booking'].agg(
+        ['mean', 'median', 'min', 'max']
+    )
+    booking_stats = conversions.groupby('currency', observed=True).agg(
+        users=(column, 'nunique'),
+        bookings=(column, 'size'),
+        mean_price=('total_price_final', 'mean'),
+        revenue=('total_price_final', 'sum'),
+        adults=('adults', 'sum'),
+        children=('children', 'sum')
+    )
+    booking_stats[['mean_price', 'revenue']] = to_major(booking_stats[['mean_price', 'revenue']])
+    distribution = visits.groupby(['currency', 'visits_before_booking'], observed=True).size()
+    return visit_stats.join(booking_stats, how='outer'), distribution
+
+def booker_table(bookings):
+    """
+    Felhasználónkénti foglalási összesítés a foglalási sorokból.
+
+    Args:
+        bookings (DataFrame): A konverziós sorok (uuid / uuid_key, currency,
+            total_price_final, adults, children, utm_source oszlopokkal)
+
+    Returns:
+        DataFrame: Felhasználónként egy sor uuid szerint rendezve: uuid,
+        booking_count, adults, children, guests, devizánként bookings_<deviza>,
+        revenue_<deviza> és mean_price_<deviza>, forrásonként source_<forrás>
+    """
+    column = user_column(bookings)
+    table = bookings.groupby(column, sort=False).agg(
+        uuid=('uuid', 'first'),
+        booking_count=('uuid', 'size'),
+        adults=('adults', 'sum'),
+        children=('children', 'sum')
+    )
+    table['guests'] = table['adults'] + table['children']
+
+    revenue = bookings.groupby([column, 'currency'], observed=True)['total_price_final'].agg(
+        ['size', 'sum', 'mean']
+    ).unstack('currency')
+    revenue.columns = [
+        f'{name}_{currency}'
+        for name, currency in zip(
+            revenue.columns.get_level_values(0).map({'size': 'bookings', 'sum': 'revenue', 'mean': 'mean_price'}),
+            revenue.columns.get_level_values(1)
+        )
+    ]
+    money_columns = [col for col in revenue.columns if col.startswith(('revenue_', 'mean_price_'))]
+    revenue[money_columns] = to_major(revenue[money_columns])
+    sources = bookings.groupby([column, 'utm_source'], observed=True).size().unstack(fill_value=0)
+    sources.columns = [f'source_{source}' for source in sources.columns]
+
+    table = table.join(revenue).join(sources)
+    count_columns = [col for col in table.columns if col.startswith(('bookings_', 'source_'))]
+    table[count_columns] = table[count_columns].fillna(0).astype('int64')
+    return table.sort_values('uuid', kind='stable')
+
+def analyze_hotel_bookings(data):
+    """
+    Komplex elemzés a hotel foglalásokról:
+    1. Látogatások száma foglalás előtt
+    2. Többszörös foglalók részletes elemzése
+
+    Args:
+        data (dict): Tisztított DataFramek
+    """
+    # A foglalások (konverziós keresések) a session adataival; a teljes search_log
+    # nem kapcsolódik össze a session táblával
+    bookings = converted_searches(data)
+    column = user_column(bookings)
+
+    # 1. RÉSZ: LÁTOGATÁSOK SZÁMA FOGLALÁS ELŐTT
+    print("\n=== LÁTOGATÁSOK ELEMZÉSE FOGLALÁS ELŐTT ===")
+
+    # Felhasználói utak egy menetben (növekményes tárnál vödrönként, korlátos memóriában);
+    # a foglalók értéke az első foglalásig tett látogatások száma
+    journeys = user_journeys(data)
+    results_df = journeys[journeys['conversions'] > 0].astype({'visits_before_booking': 'int64'})
+    converted_users = results_df[column]
+
+    # Alapstatisztikák kiírása
+    stats = {
+        'Átlagos látogatások száma': results_df['visits_before_booking'].mean(),
+        'Medián látogatások száma': results_df['visits_before_booking'].median(),
+        'Minimum látogatások száma': results_df['visits_before_booking'].min(),
+        'Maximum látogatások száma': results_df['visits_before_booking'].max(),
+        'Foglalók száma': len(converted_users),
+        'Összes foglalás': len(bookings)
+    }
+
+    print("\nÖsszes látogató statisztika:")
+    print("-" * 40)
+    for key, value in stats.items():
+        print(f"{key}: {value:.1f}")
+
+    # Devizánkénti statisztikák
+    currency_table, distributions = visits_by_currency(bookings, results_df)
+    searched_currencies = '|'.join(journeys['currencies']).split('|')
+    for currency in currency_order([currency for currency in searched_currencies if currency]):
+        if currency in currency_table.index:
+            row = currency_table.loc[currency]
+            currency_distribution = distributions.loc[currency]
+        else:
+            row = pd.Series(dtype='float64')
+            currency_distribution = pd.Series(dtype='int64')
+
+        currency_stats = {
+            'Átlagos látogatások száma': row.get('mean', float('nan')),
+            'Medián látogatások száma': row.get('median', float('nan')),
+            'Minimum látogatások száma': row.get('min', float('nan')),
+            'Maximum látogatások száma': row.get('max', float('nan')),
+            'Foglalók száma': row.get('users', 0),
+            'Összes foglalás': row.get('bookings', 0),
+            'Átlagos foglalási érték': row.get('mean_price', float('nan')),
+            'Összes bevétel': row.get('revenue', 0),
+            'Összes felnőtt': row.get('adults', 0),
+            'Összes gyerek': row.get('children', 0)
+        }
+
+        print(f"\n{currency} foglalások statisztikái:")
+        print("-" * 40)
+        for key, value in currency_stats.items():
+            if key in ['Átlagos foglalási érték', 'Összes bevétel']:
+                print(f"{key}: {value:,.0f} {currency}")
+            else:
+                print(f"{key}: {value:.1f}")
+
+        # Látogatások eloszlása devizánként
+        currency_users = currency_distribution.sum()
+        print(f"\n{currency} látogatások eloszlása:")
+        for visits, count in currency_distribution.items():
+            percentage = (count/currency_users)*100
+            print(f"{visits} látogatás: {count} felhasználó ({percentage:.1f}%)")
+
+    # 2. RÉSZ: TÖBBSZÖRÖS FOGLALÓK ELEMZÉSE
+    print("\n=== TÖBBSZÖRÖS FOGLALÓK ELEMZÉSE ===")
+
+    # Csak a konvertált (foglalt) felhasználókat nézzük, felhasználónként összesítve
+    bookers = booker_table(bookings)
+    repeat_bookers = bookers[bookers['booking_count'] > 1]
+
+    # A többszörös foglalók foglalásai
+    repeat_booker_details = bookings[bookings[column].isin(repeat_bookers.index)]
+
+    # Források és devizák szerinti elemzés
+    source_currency_analysis = repeat_booker_details.groupby(
+        ['utm_source', 'utm_medium', 'currency'],
+        observed=True
+    ).agg({
+        column: ['count', 'nunique'],
+        'total_price_final': ['sum', 'mean'],
+        'adults': 'sum',
+        'children': 'sum'
+    }).reset_index()
+
+    # Oszlopnevek egyszerűsítése
+    source_currency_analysis.columns = ['Forrás', 'Médium', 'Deviza', 'Összes_foglalás', 
+                                      'Egyedi_foglalók', 'Teljes_bevétel', 
+                                      'Átlagos_foglalási_érték', 'Összes_felnőtt', 
+                                      'Összes_gyerek']
+    money_columns = ['Teljes_bevétel', 'Átlagos_foglalási_érték']
+    source_currency_analysis[money_columns] = to_major(source_currency_analysis[money_columns])
+
+    print("\nForrások és devizák szerinti részletes elemzés:")
+    print("-" * 40)
+    print(f"Összes visszatérő foglaló: {len(repeat_bookers)} fő")
+
+    # Devizánkénti statisztikák
+    for currency in source_currency_analysis['Deviza'].unique():
+        currency_data = source_currency_analysis[source_currency_analysis['Deviza'] == currency]
+        if currency_data['Összes_foglalás'].sum() > 0:  # Csak akkor írjuk ki, ha van foglalás
+            print(f"\nDeviza: {currency}")
+            print(f"Összes foglalás: {currency_data['Összes_foglalás'].sum():.0f} db")
+            print(f"Teljes bevétel: {currency_data['Teljes_bevétel'].sum():,.0f} {currency}")
+            összes_vendég = currency_data['Összes_felnőtt'].sum() + currency_data['Összes_gyerek'].sum()
+            print(f"Összes vendég: {összes_vendég:.0f} fő")
+            print(f"  - Ebből felnőtt: {currency_data['Összes_felnőtt'].sum():.0f} fő")
+            print(f"  - Ebből gyerek: {currency_data['Összes_gyerek'].sum():.0f} fő")
+
+    # Foglalási gyakoriság elemzése
+    booking_frequency = repeat_bookers['booking_count'].value_counts().sort_index()
+
+    print("\nFoglalási gyakoriság:")
+    print("-" * 40)
+    for foglalás_szám, felhasználók in booking_frequency.items():
+        print(f"{foglalás_szám}x foglalt: {felhasználók} felhasználó")
+
+    # Top foglalók: részleges kiválasztás az összesítő táblán; a devizánkénti és
+    # forrásonkénti bontás a booker_table előre számolt oszlopaiból jön
+    top_bookers = repeat_bookers.nlargest(5, 'booking_count')
+    currencies = currency_order([col[len('bookings_'):] for col in bookers.columns if col.startswith('bookings_')])
+    source_labels = {f'source_{source}': source for source in bookings['utm_source'].unique()}
+    source_columns = [col for col in bookers.columns if col.startswith('source_')]
+
+    print("\nTop 5 legtöbbet foglaló felhasználó részletes adatai:")
+    print("-" * 40)
+    for key, booker in top_bookers.iterrows():
+        print(f"\nFelhasználó ID: {booker['uuid']}")
+        print(f"Foglalások száma: {booker['booking_count']} alkalom")
+        print(f"Összes vendég: {booker['guests']} fő")
+        print(f"  - Felnőttek: {booker['adults']} fő")
+        print(f"  - Gyerekek: {booker['children']} fő")
+
+        # Devizánkénti költés
+        for currency in currencies:
+            if booker[f'bookings_{currency}'] > 0:
+                print(f"Összes költés ({currency}): {booker[f'revenue_{currency}']:,.0f} {currency}")
+                print(f"Átlagos költés/foglalás ({currency}): {booker[f'mean_price_{currency}']:,.0f} {currency}")
+
+        # Források megjelenítése csak a nem 0 értékűeknél
+        források = booker[source_columns].astype('int64').sort_values(ascending=False, kind='stable')
+        források = {source_labels[col]: v for col, v in források.items() if v > 0}
+        print(f"Források: {források}")
+
+def run(dataframes, hotel_id, output_dir='.'):
+    analyze_hotel_bookings(dataframes)
+
+def main(hotel_id=1, data_root=None, incremental=False):
+    # Adatok betöltése; a növekményes tárból a felhasználói utak korlátos memóriában épülnek
+    dataframes = optimize_dataframes(hotel_id, data_root, lazy=True, incremental=incremental)
+    run(dataframes, hotel_id)
+
+if __name__ == "__main__":
+    main(cli_hotel_id(), incremental='--incremental' in sys.argv[1:])
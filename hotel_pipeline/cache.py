@@ -0,0 +1,184 @@
+import glob
+import hashlib
+import json
+import os
+
+from hotel_pipeline.schema import TABLE_SCHEMAS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # a gyorsítótár pyarrow nélkül egyszerűen kikapcsol
+    pa = None
+    pq = None
+
+# Növelni kell, ha a tisztítás logikája a sémán kívül változik
+CLEANING_VERSION = 2
+
+DEFAULT_CACHE_ROOT = os.environ.get(
+    'HOTEL_PIPELINE_CACHE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'hotel_pipeline')
+)
+
+METADATA_KEY = b'hotel_pipeline'
+
+
+def cache_available():
+    """Igaz, ha a Parquet gyorsítótárhoz szükséges pyarrow elérhető."""
+    return pq is not None
+
+
+def default_cache_dir(hotel_id):
+    """A hotel alapértelmezett gyorsítótár könyvtára."""
+    return os.path.join(DEFAULT_CACHE_ROOT, f'hotel_{hotel_id}')
+
+
+def file_fingerprint(path, content_hash=False):
+    """
+    A nyers fájl ujjlenyomata: méret, módosítási idő és opcionálisan tartalom hash.
+
+    Args:
+        path (str): A fájl elérési útja
+        content_hash (bool): Ha igaz, a teljes tartalom SHA-256 hash-e is bekerül
+
+    Returns:
+        dict: Az ujjlenyomat mezői
+    """
+    stat = os.stat(path)
+    fingerprint = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    if content_hash:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        fingerprint['sha256'] = digest.hexdigest()
+    return fingerprint
+
+
+def cache_key(path, table, encoding=None, content_hash=False):
+    """
+    Gyorsítótár kulcs a nyers fájl ujjlenyomatából és a tisztító kód verziójából.
+
+    Args:
+        path (str): A nyers CSV elérési útja
+        table (str): A tábla neve
+        encoding (str): A beolvasáshoz használt karakterkódolás
+        content_hash (bool): Tartalom hash használata a méret/idő mellett
+
+    Returns:
+        str: Hexadecimális kulcs
+    """
+    payload = {
+        'table': table,
+        'file': file_fingerprint(path, content_hash),
+        'encoding': encoding,
+        'cleaning_version': CLEANING_VERSION,
+        'schema': repr(sorted(TABLE_SCHEMAS[table].items()))
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()[:24]
+
+
+def _entry_path(cache_dir, table, key):
+    return os.path.join(cache_dir, f'{table}-{key}.parquet')
+
+
+def _encode_categories(df):
+    """
+    A tisztítás a szöveges kategóriák mellé 0 kategóriát is felvesz, amit az Arrow
+    nem tud vegyes típusú szótárként tárolni. Ezeket szövegként írjuk ki, és a
+    metaadatban jegyezzük fel az eredeti értékeket.
+    """
+    restore = {}
+    for col in df.select_dtypes(include=['category']).columns:
+        categories = df[col].cat.categories
+        if categories.dtype != object or all(isinstance(value, str) for value in categories):
+            continue
+        mapping = {str(value): value.item() if hasattr(value, 'item') else value
+                   for value in categories if not isinstance(value, str)}
+        df[col] = df[col].cat.rename_categories(lambda value: str(value))
+        restore[col] = mapping
+    return df, restore
+
+
+def _decode_categories(df, restore):
+    for col, mapping in restore.items():
+        if col in df.columns:
+            df[col] = df[col].cat.rename_categories(lambda value: mapping.get(value, value))
+    return df
+
+
+def write_parquet(df, path):
+    """
+    DataFrame atomikus mentése Parquet fájlba, a vegyes kategóriák visszaállításához
+    szükséges metaadattal együtt.
+
+    Args:
+        df (DataFrame): A mentendő tábla
+        path (str): A cél fájl elérési útja
+    """
+    encoded, restore = _encode_categories(df.copy(deep=False))
+    arrow_table = pa.Table.from_pandas(encoded, preserve_index=False)
+    metadata = dict(arrow_table.schema.metadata or {})
+    metadata[METADATA_KEY] = json.dumps(restore).encode('utf-8')
+    arrow_table = arrow_table.replace_schema_metadata(metadata)
+
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    pq.write_table(arrow_table, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def read_parquet(path, columns=None):
+    """
+    A write_parquet által írt fájl beolvasása.
+
+    Args:
+        path (str): A fájl elérési útja
+        columns (list): Csak ezek az oszlopok töltődnek be
+
+    Returns:
+        DataFrame: A tábla az eredeti típusokkal
+    """
+    arrow_table = pq.read_table(path, columns=columns)
+    metadata = arrow_table.schema.metadata or {}
+    restore = json.loads(metadata.get(METADATA_KEY, b'{}'))
+    return _decode_categories(arrow_table.to_pandas(), restore)
+
+
+def read_cached(cache_dir, table, key, columns=None):
+    """
+    Tisztított tábla betöltése a gyorsítótárból.
+
+    Args:
+        cache_dir (str): A gyorsítótár könyvtára
+        table (str): A tábla neve
+        key (str): A cache_key által adott kulcs
+        columns (list): Csak ezek az oszlopok töltődnek be
+
+    Returns:
+        DataFrame: A tábla, vagy None ha nincs érvényes bejegyzés
+    """
+    path = _entry_path(cache_dir, table, key)
+    if not cache_available() or not os.path.exists(path):
+        return None
+    return read_parquet(path, columns)
+
+
+def write_cached(cache_dir, table, key, df):
+    """
+    Tisztított tábla mentése a gyorsítótárba; a tábla régebbi bejegyzései törlődnek.
+
+    Args:
+        cache_dir (str): A gyorsítótár könyvtára
+        table (str): A tábla neve
+        key (str): A cache_key által adott kulcs
+        df (DataFrame): A tisztított tábla
+    """
+    if not cache_available():
+        return
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _entry_path(cache_dir, table, key)
+    write_parquet(df, path)
+
+    for old_path in glob.glob(os.path.join(cache_dir, f'{table}-*.parquet')):
+        if old_path != path:
+            os.remove(old_path)
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+
+def _category_values(series):
+    """
+    A kategória szótár értékei és a sorok pozíciói ebben a szótárban.
+
+    A szótár végére egy hiányzó érték kerül, erre mutatnak a hiányzó (-1 kódú) sorok,
+    így a szöveges műveletek a hiányzó értékeket is ugyanúgy kezelik, mint soronként.
+
+    Returns:
+        tuple: (a kategóriák Series-e a hiányzó értékkel, soronkénti pozíciók)
+    """
+    categories = series.cat.categories.to_numpy(dtype=object)
+    values = pd.Series(np.append(categories, np.nan), dtype=object)
+    codes = series.cat.codes.to_numpy()
+    positions = np.where(codes < 0, len(categories), codes)
+    return values, positions
+
+
+def category_str(series, method, *args, **kwargs):
+    """
+    A series.str.<method>(...) megfelelője, amely a kategória szótáron fut le egyszer.
+
+    Kategória oszlopon a művelet (split, strip, contains, replace, extract, ...) csak a
+    néhány száz különböző értékre fut le, az eredmény a kódokon keresztül kerül vissza a
+    sorokhoz. Nem kategória oszlopon a szokásos .str hívással egyezik meg.
+
+    Args:
+        series (Series): A bemeneti oszlop
+        method (str): A .str accessor metódusának neve
+        *args, **kwargs: A metódus paraméterei
+
+    Returns:
+        Series vagy DataFrame: Ugyanaz, mint a series.str.<method>(...) eredménye
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return getattr(series.str, method)(*args, **kwargs)
+
+    values, positions = _category_values(series)
+    result = getattr(values.str, method)(*args, **kwargs).take(positions)
+    result.index = series.index
+    if isinstance(result, pd.Series):
+        result.name = series.name
+    return result
+
+
+def category_transform(series, transform):
+    """
+    Tetszőleges soronkénti leképezés a kategória szótáron, kategória eredménnyel.
+
+    A transform a kategóriák Series-ét kapja (a végén egy hiányzó értékkel), és egy
+    ugyanolyan hosszú Series-t ad vissza. Az eredmény kategóriái ugyanazok, mint a
+    soronként alkalmazott leképezés után az .astype('category') hívással kapottak,
+    de a nagy oszlop szövegei egyszer sem kerülnek újra kódolásra.
+
+    Args:
+        series (Series): Kategória típusú bemeneti oszlop
+        transform (callable): Series -> Series leképezés
+
+    Returns:
+        Series: Kategória típusú eredmény a bemenet indexével
+    """
+    values, positions = _category_values(series)
+    mapped = transform(values).to_numpy(dtype=object)
+
+    # Csak a ténylegesen előforduló értékekből lesz kategória, ahogy az astype-nál
+    used = np.unique(positions)
+    dictionary = pd.Categorical(mapped[used])
+    lookup = np.full(len(mapped), -1, dtype=dictionary.codes.dtype)
+    lookup[used] = dictionary.codes
+
+    return pd.Series(
+        pd.Categorical.from_codes(lookup[positions], dtype=dictionary.dtype),
+        index=series.index,
+        name=series.name
+    )
@@ -0,0 +1,181 @@
+import glob
+import io
+import os
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from hotel_pipeline.cache import read_parquet, write_parquet
+from hotel_pipeline.schema import read_csv_kwargs, finalize_table
+
+# A memóriába egyben nem férő, darabonként tisztítandó táblák
+STREAMED_TABLES = ['search_log', 'search_log_room_offer']
+
+DEFAULT_CHUNKSIZE = 1_000_000
+
+
+def partition_paths(table_dir):
+    """A particionált tábla darabjainak elérési útjai sorrendben."""
+    return sorted(glob.glob(os.path.join(table_dir, 'part-*.parquet')))
+
+
+class _BoundedReader(io.RawIOBase):
+    """Egy bináris fájl első limit bájtja; a CSV olvasó ennél tovább nem lát."""
+
+    def __init__(self, f, limit):
+        self._f = f
+        self._remaining = limit
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        data = self._f.read(size)
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+
+def clean_table_chunked(input_dir, hotel_id, table, output_dir, encoding=None, chunksize=DEFAULT_CHUNKSIZE,
+                        nbytes=None):
+    """
+    Egy tábla darabonkénti tisztítása és particionált Parquet kiírása.
+
+    A CSV fix méretű darabokban olvasódik, minden darab ugyanazokon a típus- és
+    hiányzóérték-szabályokon megy át, majd azonnal kiíródik, így a memóriaigényt
+    a darabméret határozza meg, nem a tábla mérete. A kategória oszlopok típusát nem
+    egy-egy darab tartalma dönti el: minden darab szöveges kategóriákkal íródik ki.
+
+    Args:
+        input_dir (str): Bemeneti könyvtár elérési útja
+        hotel_id (int): A hotel azonosítója (a fájlnevek utótagja)
+        table (str): A tábla neve
+        output_dir (str): Kimeneti könyvtár; a darabok az output_dir/table alá kerülnek
+        encoding (str): Karakterkódolás, ha eltér az alapértelmezettől
+        chunksize (int): Egy darab sorainak száma
+        nbytes (int): Ha meg van adva, csak a fájl első nbytes bájtja olvasódik be
+            (pl. a még félig írt utolsó sor nélkül)
+
+    Returns:
+        dict: A kiírt darabok és sorok száma
+    """
+    table_dir = os.path.join(output_dir, table)
+    os.makedirs(table_dir, exist_ok=True)
+    for old_path in partition_paths(table_dir):
+        os.remove(old_path)
+
+    path = f'{input_dir}/{table}_hotel_{hotel_id}.csv'
+    parts = 0
+    rows = 0
+    with open(path, 'rb') as f:
+        source = path if nbytes is None else io.BufferedReader(_BoundedReader(f, nbytes))
+        with pd.read_csv(source, encoding=encoding, chunksize=chunksize, **read_csv_kwargs(table)) as reader:
+            for chunk in reader:
+                chunk = finalize_table(chunk, table, numeric_categories=False)
+                write_parquet(chunk, os.path.join(table_dir, f'part-{parts:05d}.parquet'))
+                parts += 1
+                rows += len(chunk)
+
+    return {'parts': parts, 'rows': rows}
+
+
+def clean_tables_chunked(input_dir, hotel_id, output_dir, encodings=None, tables=None, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    A nagy táblák darabonkénti tisztítása.
+
+    Args:
+        input_dir (str): Bemeneti könyvtár elérési útja
+        hotel_id (int): A hotel azonosítója (a fájlnevek utótagja)
+        output_dir (str): Kimeneti könyvtár
+        encodings (dict): Táblánkénti karakterkódolás, ha eltér az alapértelmezettől
+        tables (list): A feldolgozandó táblák (alapértelmezés: STREAMED_TABLES)
+        chunksize (int): Egy darab sorainak száma
+
+    Returns:
+        dict: táblanév -> a kiírt darabok és sorok száma
+    """
+    encodings = encodings or {}
+    return {
+        table: clean_table_chunked(input_dir, hotel_id, table, output_dir, encodings.get(table), chunksize)
+        for table in (tables or STREAMED_TABLES)
+    }
+
+
+def iter_partitions(table_dir, columns=None):
+    """
+    A particionált tábla darabjainak egyenkénti beolvasása.
+
+    Args:
+        table_dir (str): A tábla darabjait tartalmazó könyvtár
+        columns (list): Csak ezek az oszlopok töltődnek be
+
+    Yields:
+        DataFrame: Egy darab
+    """
+    for path in partition_paths(table_dir):
+        yield read_parquet(path, columns)
+
+
+def concat_partitions(parts):
+    """
+    Darabok összefűzése egy DataFrame-be.
+
+    A darabok kategóriái eltérhetnek, ezért a kategória oszlopok uniója képződik,
+    hogy az eredmény ugyanolyan kategória típusú legyen, mint az egyben tisztított tábla.
+    Ha egy korábban írt darabban az oszlop nem kategória (csupa szám vagy üres darab),
+    az is szöveges kategóriákra alakul az összefűzés előtt.
+
+    Args:
+        parts (list): A darabok (legalább egy), azonos oszlopokkal
+
+    Returns:
+        DataFrame: Az összefűzött tábla
+    """
+    category_columns = pd.Index([])
+    for part in parts:
+        category_columns = category_columns.union(part.select_dtypes(include=['category']).columns, sort=False)
+    df = pd.concat(
+        [part.drop(columns=category_columns) for part in parts],
+        ignore_index=True
+    )
+    for col in category_columns:
+        combined = union_categoricals([_text_categorical(part[col]) for part in parts])
+        df[col] = combined.set_categories(_ordered_categories(combined.categories))
+    return df[parts[0].columns]
+
+
+def read_partitioned(table_dir, columns=None):
+    """
+    A particionált tábla összefűzése egy DataFrame-be (concat_partitions).
+
+    Args:
+        table_dir (str): A tábla darabjait tartalmazó könyvtár
+        columns (list): Csak ezek az oszlopok töltődnek be
+
+    Returns:
+        DataFrame: A teljes tábla
+    """
+    parts = list(iter_partitions(table_dir, columns))
+    if not parts:
+        raise FileNotFoundError(f"Nincs particionált adat: {table_dir}")
+    return concat_partitions(parts)
+
+
+def _text_categorical(series):
+    """Az oszlop kategóriaként, szöveges (object) kategória szótárral."""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype('category')
+    categories = series.cat.categories
+    if categories.dtype != object:
+        series = series.cat.set_categories(pd.Index(list(categories), dtype=object))
+    return series
+
+
+def _ordered_categories(categories):
+    """Rendezett kategóriák; a szövegesek után a hiányzó értékek helyére került 0."""
+    strings = sorted(value for value in categories if isinstance(value, str))
+    others = sorted(value for value in categories if not isinstance(value, str))
+    return strings + others
@@ -0,0 +1,95 @@
+import time
+
+from hotel_pipeline.cache import default_cache_dir
+from hotel_pipeline.chunked import DEFAULT_CHUNKSIZE, clean_tables_chunked
+from hotel_pipeline.config import encodings_for, raw_dir
+from hotel_pipeline.incremental import default_store_dir, print_refresh_report, refresh_tables
+from hotel_pipeline.loader import LazyTables, load_tables, print_load_report
+from hotel_pipeline.rollups import print_rollup_report
+
+
+def optimize_dataframes(hotel_id, data_root=None, max_workers=None, use_cache=True, lazy=False, columns=None,
+                        incremental=False, refresh=True):
+    """
+    Beolvassa és tisztítja a hotel adatait.
+
+    Args:
+        hotel_id (int): A hotel azonosítója
+        data_root (str): A nyers adatok gyökérkönyvtára (alapértelmezés: config.DATA_ROOT)
+        max_workers (int): Ha meg van adva, a CSV-k ennyi szálon, párhuzamosan
+            töltődnek be, és kiíródnak a táblánkénti betöltési idők
+        use_cache (bool): A tisztított táblák Parquet gyorsítótárának használata;
+            változatlan nyers fájl esetén a táblák a gyorsítótárból töltődnek
+        lazy (bool): Ha igaz, szótár helyett lusta leképezést ad vissza, amely
+            egy táblát csak az első hozzáféréskor tölt be
+        columns (dict): Táblánként a szükséges oszlopok listája; a többi oszlop
+            be sem olvasódik
+        incremental (bool): Ha igaz, a hozzáfűzéssel bővülő táblákból (search_log,
+            search_log_session, website_daily_users) csak az előző futás óta érkezett
+            sorok tisztítódnak, és a táblák a növekményes tárból töltődnek; a napi
+            rollup táblákban csak az új sorok napjai számolódnak újra
+        refresh (bool): Növekményes tárnál a tár és a rollup táblák frissítése;
+            hamis, ha egy korábbi lépés (pl. a runner első fázisa) már frissítette
+
+    Returns:
+        dict: Tisztított DataFramek
+    """
+    input_dir = raw_dir(hotel_id, data_root)
+    cache_dir = default_cache_dir(hotel_id) if use_cache else None
+    store_dir = None
+
+    try:
+        if incremental:
+            store_dir = default_store_dir(hotel_id)
+            if refresh:
+                print_refresh_report(refresh_tables(input_dir, hotel_id, store_dir, encodings=encodings_for(hotel_id)))
+                if cache_dir is not None:
+                    rollup_tables = LazyTables(
+                        input_dir, hotel_id, encodings=encodings_for(hotel_id), cache_dir=cache_dir,
+                        store_dir=store_dir
+                    )
+                    print_rollup_report(rollup_tables.refresh_rollups())
+
+        if lazy:
+            return LazyTables(
+                input_dir, hotel_id, encodings=encodings_for(hotel_id), cache_dir=cache_dir, columns=columns,
+                store_dir=store_dir
+            )
+
+        # Adatok beolvasása és tisztítása a közös séma alapján (opcionálisan párhuzamosan)
+        start = time.perf_counter()
+        dataframes, timings = load_tables(
+            input_dir, hotel_id, encodings=encodings_for(hotel_id), max_workers=max_workers,
+            cache_dir=cache_dir, columns=columns, store_dir=store_dir
+        )
+        if max_workers is not None:
+            print_load_report(timings, time.perf_counter() - start)
+
+        return dataframes
+
+    except Exception as e:
+        print(f"Hiba történt a Hotel {hotel_id} adatainak feldolgozása során: {str(e)}")
+        raise
+
+
+def optimize_large_tables_chunked(hotel_id, output_dir, data_root=None, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    A search_log és search_log_room_offer táblák darabonkénti tisztítása.
+
+    A táblák nem töltődnek be egyben a memóriába: minden darab ugyanazokon a
+    típus- és hiányzóérték-szabályokon megy át, és azonnal particionált Parquet
+    fájlként íródik ki az output_dir/<tábla> könyvtárba.
+
+    Args:
+        hotel_id (int): A hotel azonosítója
+        output_dir (str): Kimeneti könyvtár
+        data_root (str): A nyers adatok gyökérkönyvtára
+        chunksize (int): Egy darab sorainak száma
+
+    Returns:
+        dict: Táblánként a kiírt darabok és sorok száma
+    """
+    return clean_tables_chunked(
+        raw_dir(hotel_id, data_root), hotel_id, output_dir,
+        encodings=encodings_for(hotel_id), chunksize=chunksize
+    )
@@ -0,0 +1,44 @@
+import os
+
+# A nyers és a tisztított adatok gyökérkönyvtárai; hotelenként hotel_<id> alkönyvtárral
+DATA_ROOT = os.environ.get('HOTEL_DATA_ROOT', '/config/workspace/verseny_dataklub_morgens/data/raw')
+CLEAN_ROOT = os.environ.get('HOTEL_CLEAN_ROOT', '/config/workspace/verseny_dataklub_morgens/data/clean')
+
+HOTEL_IDS = [1, 2, 3]
+
+# Napi árfolyam fájl (date;currency;rate, EUR alapú) és a riport pénzneme, amelyre az
+# összegek átszámolódnak (fx.py)
+FX_RATES_PATH = os.environ.get('HOTEL_FX_RATES', os.path.join(DATA_ROOT, 'fx_rates.csv'))
+REPORTING_CURRENCY = os.environ.get('HOTEL_REPORTING_CURRENCY', 'HUF')
+
+# Ennél több pontú pontdiagramok sűrűségtérképként rajzolódnak ki (figures.py)
+DENSITY_THRESHOLD = int(os.environ.get('HOTEL_DENSITY_THRESHOLD', '20000'))
+
+# Az alapértelmezettől eltérő karakterkódolású nyers fájlok hotelenként
+HOTEL_ENCODINGS = {
+    1: {},
+    2: {
+        'datepicker_daily_visitors': 'iso-8859-2',
+        'website_daily_users': 'iso-8859-2'
+    },
+    3: {
+        'datepicker_daily_visitors': 'iso-8859-2',
+        'search_log_session': 'iso-8859-2',
+        'website_daily_users': 'iso-8859-2'
+    }
+}
+
+
+def raw_dir(hotel_id, data_root=None):
+    """A hotel nyers adatainak könyvtára."""
+    return os.path.join(data_root or DATA_ROOT, f'hotel_{hotel_id}')
+
+
+def clean_dir(hotel_id, clean_root=None):
+    """A hotel tisztított adatainak könyvtára."""
+    return os.path.join(clean_root or CLEAN_ROOT, f'hotel_{hotel_id}')
+
+
+def encodings_for(hotel_id):
+    """A hotel nyers fájljainak eltérő karakterkódolásai."""
+    return HOTEL_ENCODINGS.get(hotel_id, {})
@@ -0,0 +1,64 @@
+import os
+import sys
+import zipfile
+from datetime import datetime
+
+from hotel_pipeline.cleaner import optimize_dataframes
+from hotel_pipeline.config import clean_dir
+from hotel_pipeline.money import to_major
+from hotel_pipeline.schema import TABLE_SCHEMAS
+
+
+def export_clean_csv(hotel_id, data_root=None, clean_root=None, incremental=False):
+    """
+    A tisztított táblák mentése CSV-be és tömörítése egy dátumozott ZIP fájlba.
+
+    Args:
+        hotel_id (int): A hotel azonosítója
+        data_root (str): A nyers adatok gyökérkönyvtára
+        clean_root (str): A tisztított adatok gyökérkönyvtára
+        incremental (bool): A hozzáfűzéssel bővülő táblákból csak az új sorok tisztítódnak
+
+    Returns:
+        str: A létrehozott ZIP fájl elérési útja
+    """
+    # Célmappa létrehozása, ha még nem létezik
+    output_dir = clean_dir(hotel_id, clean_root)
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Adatok beolvasása a közös séma alapján, a végleges típusokkal
+    dataframes = optimize_dataframes(hotel_id, data_root, incremental=incremental)
+
+    # Optimalizált adatok mentése csv formátumba
+    file_names = []
+    for table, df in dataframes.items():
+        file_name = f'{table}_hotel_{hotel_id}.csv'
+        # A uuid_key csak a helyi uuid szótárral értelmezhető, nem kerül a kimenetbe
+        df = df.drop(columns=['uuid_key'], errors='ignore')
+        # Az összegek a nyers adatokkal egyezően pénzegységben kerülnek ki, nem váltópénzben
+        schema = TABLE_SCHEMAS.get(table, {})
+        money_columns = [col for col in schema.get('money', []) if col in df.columns]
+        if money_columns:
+            df = df.assign(**{
+                col: to_major(df[col]).astype(schema['dtypes'][col]) for col in money_columns
+            })
+        df.to_csv(os.path.join(output_dir, file_name), index=False)
+        file_names.append(file_name)
+        print(file_name)
+
+    # ZIP fájl neve dátummal
+    zip_filename = os.path.join(output_dir, f'hotel_{hotel_id}_data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.zip')
+
+    # CSV fájlok tömörítése ZIP-be
+    with zipfile.ZipFile(zip_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for file_name in file_names:
+            zipf.write(os.path.join(output_dir, file_name), file_name)
+
+    print(f"\nZIP fájl létrehozva: {zip_filename}")
+    return zip_filename
+
+
+if __name__ == "__main__":
+    incremental = '--incremental' in sys.argv[1:]
+    for hotel_id in [int(arg) for arg in sys.argv[1:] if arg != '--incremental'] or [1]:
+        export_clean_csv(hotel_id, incremental=incremental)
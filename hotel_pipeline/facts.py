@@ -0,0 +1,150 @@
+import hashlib
+import json
+
+from hotel_pipeline.cache import cache_key, read_cached, write_cached
+from hotel_pipeline.guests import categorize_bookings
+from hotel_pipeline.joinindex import SearchJoinIndex
+from hotel_pipeline.schema import TABLE_SCHEMAS
+from hotel_pipeline.uuids import MISSING_KEY
+
+# Növelni kell, ha a ténytábla oszlopai vagy számítása változik
+FACTS_VERSION = 5
+
+# A ténytábla forrás táblái; ezek bármelyikének változása új táblát igényel
+FACT_SOURCES = ['search_log', 'search_log_session', 'search_log_room', 'search_log_room_child', 'booking_data']
+
+SEARCH_COLUMNS = [
+    'id', 'search_log_session_id', 'utc_datetime', 'arrival', 'departure', 'lang_code', 'currency',
+    'days', 'nights', 'adults', 'children', 'total_price_final'
+]
+
+BOOKING_COLUMNS = {
+    'total_price_final': 'booking_total_price_final',
+    'rooms_total_price': 'rooms_total_price',
+    'upsell_total_price': 'upsell_total_price',
+    'vouchers_total_price': 'vouchers_total_price',
+    'loyalty_discount_total': 'loyalty_discount_total',
+    'redeemed_loyalty_points_total': 'redeemed_loyalty_points_total'
+}
+
+
+def build_booking_facts(dataframes, join_index=None):
+    """
+    Foglalásonként egy sort tartalmazó, denormalizált ténytábla összeállítása.
+
+    A tábla a sikeres (conversion = 1) és a booking_data-ban szereplő keresések
+    sorait tartalmazza; a converted és has_booking_record oszlopok jelzik, melyik
+    feltétel teljesül. Egy sorban szerepel a keresés, a session utm adatai, a vendég
+    kategória, a gyerekek száma és legkisebb életkora, a lefoglalt szobák, a lead time
+    és a booking_data árösszetevői.
+
+    Args:
+        dataframes (dict): A tisztított táblák
+        join_index (SearchJoinIndex): Már felépített kapcsolati index (alapértelmezés: a
+            leképezés saját indexe, ha van, egyébként új index)
+
+    Returns:
+        DataFrame: A ténytábla, search_log sorrendben
+    """
+    search_log = dataframes['search_log']
+    search_log_room = dataframes['search_log_room']
+    search_log_room_child = dataframes['search_log_room_child']
+    booking_data = dataframes['booking_data'].drop_duplicates('search_log_id')
+
+    converted = search_log['conversion'] == 1
+    booked = search_log['id'].isin(booking_data['search_log_id'])
+    selected = converted | booked
+
+    facts = search_log.loc[selected, SEARCH_COLUMNS].rename(columns={'id': 'search_log_id'})
+    facts['converted'] = converted[selected]
+    facts['has_booking_record'] = booked[selected]
+    facts['lead_time'] = (facts['arrival'] - facts['utc_datetime']).dt.days
+    facts = facts.reset_index(drop=True)
+
+    # Session adatok: felhasználó és marketing forrás
+    sessions = dataframes['search_log_session'][['id', 'uuid', 'uuid_key', 'utm_source', 'utm_medium', 'utm_campaign']]
+    sessions = sessions.rename(columns={'id': 'search_log_session_id'}).assign(
+        utm_source_and_medium=sessions['utm_source'].astype(str) + ' / ' + sessions['utm_medium'].astype(str)
+    )
+    facts = facts.merge(sessions, on='search_log_session_id', how='left')
+    facts['uuid_key'] = facts['uuid_key'].fillna(MISSING_KEY).astype('int32')
+
+    # Szobák és gyerekek a kapcsolati indexből
+    if join_index is None and hasattr(dataframes, 'join_index'):
+        join_index = dataframes.join_index()
+    if join_index is None:
+        join_index = SearchJoinIndex(search_log_room, search_log_room_child, search_log['id'].to_numpy())
+    child_stats = join_index.child_stats()
+    facts['room_count'] = facts['search_log_id'].map(join_index.room_counts()).fillna(0).astype('int32')
+    facts['child_count'] = facts['search_log_id'].map(child_stats['child_count']).fillna(0).astype('int32')
+    facts['min_child_age'] = facts['search_log_id'].map(child_stats['min_age'])
+    facts['guest_category'] = categorize_bookings(
+        facts, search_log_room, search_log_room_child, id_column='search_log_id',
+        min_child_age=child_stats['min_age'].dropna()
+    )
+
+    rooms = join_index.rooms_for(facts['search_log_id'].to_numpy())
+    picked_rooms = rooms['picked_room'].astype(str).groupby(rooms['search_log_id'].to_numpy(), sort=False).agg(' + '.join)
+    facts['picked_rooms'] = facts['search_log_id'].map(picked_rooms)
+
+    # Árösszetevők a booking_data-ból
+    components = booking_data[['search_log_id'] + list(BOOKING_COLUMNS)].rename(columns=BOOKING_COLUMNS)
+    facts = facts.merge(components, on='search_log_id', how='left')
+    # A váltópénz egységben tárolt összegek a foglalási sor nélküli kereséseknél is egészek maradnak
+    return facts.astype({
+        BOOKING_COLUMNS[col]: 'Int64' for col in TABLE_SCHEMAS['booking_data']['money']
+    })
+
+
+def facts_cache_key(input_dir, hotel_id, encodings=None, content_hash=False):
+    """A ténytábla gyorsítótár kulcsa a forrás táblák kulcsaiból."""
+    encodings = encodings or {}
+    payload = {
+        'facts_version': FACTS_VERSION,
+        'sources': {
+            table: cache_key(f'{input_dir}/{table}_hotel_{hotel_id}.csv', table, encodings.get(table), content_hash)
+            for table in FACT_SOURCES
+        }
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()[:24]
+
+
+def load_booking_facts(dataframes, cache_dir=None, key=None, join_index=None):
+    """
+    A ténytábla betöltése a gyorsítótárból, vagy felépítése és mentése.
+
+    Args:
+        dataframes (Mapping): A tisztított táblák (lusta leképezés esetén csak
+            gyorsítótár hiány esetén töltődnek be)
+        cache_dir (str): A tisztított táblák gyorsítótár könyvtára (None: nincs mentés)
+        key (str): A facts_cache_key által adott kulcs
+        join_index (SearchJoinIndex): Már felépített kapcsolati index
+
+    Returns:
+        DataFrame: A ténytábla
+    """
+    if cache_dir is not None and key is not None:
+        facts = read_cached(cache_dir, 'booking_facts', key)
+        if facts is not None:
+            return facts
+
+    facts = build_booking_facts(dataframes, join_index)
+    if cache_dir is not None and key is not None:
+        try:
+            write_cached(cache_dir, 'booking_facts', key, facts)
+        except OSError as e:
+            print(f"Figyelmeztetés: a foglalási ténytábla nem menthető a gyorsítótárba: {str(e)}")
+    return facts
+
+
+def get_booking_facts(dataframes):
+    """
+    A betöltött táblákhoz tartozó ténytábla.
+
+    Ha a leképezés maga tudja előállítani (LazyTables), annak gyorsítótárazott
+    példánya kerül vissza, egyébként a tábla helyben épül fel.
+    """
+    booking_facts = getattr(dataframes, 'booking_facts', None)
+    if booking_facts is not None:
+        return booking_facts()
+    return build_booking_facts(dataframes)
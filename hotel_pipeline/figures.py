@@ -0,0 +1,467 @@
+"""
+Ábra leírások és párhuzamos, grafikus felület nélküli kirajzolásuk.
+
+Az elemzések nem rajzolnak közvetlenül: ábránként egy leírást (spec) adnak át
+az emit_figure függvénynek, amely az ábra adatait (DataFrame vagy Series) és a
+diagram típusát tartalmazza. Parancssori futáskor a leírás azonnal kirajzolódik
+és megjelenik; a runner alatt a leírások összegyűlnek (collect_figures), és egy
+folyamatkészlet rajzolja ki őket Agg backenddel PNG/SVG fájlokba, a Plotly
+ábrákat HTML-be (és ha a kaleido elérhető, PNG/SVG-be).
+
+Minden ábra ujjlenyomata az adatai és a beállításai hash-e; a kimeneti
+könyvtár figures.json fájlja tárolja a legutóbb kirajzolt ujjlenyomatokat, így
+újrafuttatáskor a változatlan adatú ábrák kimaradnak.
+
+A config.DENSITY_THRESHOLD-nál több pontú pontdiagramok sűrűségtérképként
+rajzolódnak ki: a pontok egy numpy 2D hisztogramba kerülnek, amely képként
+(vagy hexbin diagramként) jelenik meg, és csak a ritka cellák pontjai (a
+kiugró értékek) rajzolódnak ki egyenként. Így a kirajzolás ideje és a fájl
+mérete a cellák számától függ, nem a sorokétól.
+"""
+import contextlib
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from hotel_pipeline.config import DENSITY_THRESHOLD
+
+# Növelni kell, ha a kirajzolás logikája változik
+RENDER_VERSION = 3
+
+# A sűrűségtérkép cellái (x, y irányban), és a cellánkénti pontszám, ameddig
+# a cella pontjai kiugró értékként egyenként rajzolódnak ki
+DENSITY_BINS = (200, 100)
+DENSITY_SPARSE_COUNT = 2
+
+# A sűrűségtérkép y tartományán kívül eső (kiugró) pontok aránya oldalanként
+DENSITY_QUANTILE = 0.001
+
+# Alapértelmezett kimeneti formátumok (a Plotly ábrák HTML-je mindig elkészül)
+FORMATS = ('png',)
+
+MANIFEST_NAME = 'figures.json'
+
+# Az összegyűjtött leírások listája; None, ha az ábrák azonnal kirajzolódnak
+_COLLECTOR = None
+
+
+def panel(kind, data, style=None, **decorations):
+    """
+    Egy diagram (tengely) leírása.
+
+    Args:
+        kind (str): 'bar' (a pandas oszlopdiagramja), 'scatter' (x és y
+            oszlop; ha van series oszlop, a style['series'] címkénkénti
+            beállításaival sorozatonként), 'hist' (egy Series hisztogramja;
+            style['kde'] esetén sűrűséggörbével), 'line' (oszloponként egy vonal
+            az index mentén, a style['series'] oszloponkénti beállításaival) vagy
+            'heatmap' (színezett mátrix; style['annot'] és style['fmt'] esetén
+            cellánkénti feliratokkal)
+        data (DataFrame vagy Series): A kirajzolandó adatok
+        style (dict): A rajzoló függvénynek átadott beállítások (color, alpha, ...)
+        decorations: title, xlabel, ylabel (szöveg vagy {'text': ..., betűbeállítások}),
+            xticks, yticks (tick felirat beállítások), ylim, grid, axhline,
+            date_format, legend (beállítások vagy False); pontdiagramnál density
+            (False, vagy threshold, bins, sparse_count, quantile, method: 'image'/'hexbin', cmap)
+    """
+    return {'kind': kind, 'data': data, 'style': style or {}, **decorations}
+
+
+def figure_spec(name, panels, rows=1, cols=1, figsize=None, title=None):
+    """
+    Matplotlib ábra leírása rows x cols elrendezésű diagramokkal (soronként kitöltve).
+
+    Args:
+        name (str): Az ábra neve; a kimeneti fájlok neve is (<név>.png)
+        panels (list vagy dict): A panel() leírások
+    """
+    if isinstance(panels, dict):
+        panels = [panels]
+    return {
+        'name': name,
+        'kind': 'matplotlib',
+        'panels': list(panels),
+        'layout': {'rows': rows, 'cols': cols, 'figsize': figsize, 'title': title}
+    }
+
+
+def plotly_spec(name, figure):
+    """Plotly ábra leírása; a figure egy go.Figure vagy annak dict alakja."""
+    if hasattr(figure, 'to_dict'):
+        figure = figure.to_dict()
+    return {'name': name, 'kind': 'plotly', 'figure': figure}
+
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def _dumps(value):
+    return json.dumps(value, sort_keys=True, default=_json_default).encode('utf-8')
+
+
+def _hash_data(digest, data):
+    """Az ábra adatainak hash-e: oszlopnevek, típusok és a sorok értékei az indexszel."""
+    if isinstance(data, pd.DataFrame):
+        digest.update(_dumps([list(data.columns), [str(dtype) for dtype in data.dtypes], list(data.index.names)]))
+        digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    elif isinstance(data, pd.Series):
+        digest.update(_dumps([data.name, str(data.dtype), list(data.index.names)]))
+        digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    else:
+        digest.update(_dumps(data))
+
+
+def figure_fingerprint(spec, formats=FORMATS):
+    """Az ábra ujjlenyomata az adataiból, beállításaiból, a formátumokból és a RENDER_VERSION-ből."""
+    digest = hashlib.sha256(_dumps({
+        'render_version': RENDER_VERSION, 'formats': sorted(formats), 'density_threshold': DENSITY_THRESHOLD
+    }))
+    if spec['kind'] == 'plotly':
+        digest.update(_dumps(spec['figure']))
+    else:
+        digest.update(_dumps(spec['layout']))
+        for item in spec['panels']:
+            digest.update(_dumps({key: value for key, value in item.items() if key != 'data'}))
+            _hash_data(digest, item['data'])
+    return digest.hexdigest()[:24]
+
+
+def _text(value):
+    """Szöveg vagy {'text': ..., beállítások} -> (szöveg, beállítások)."""
+    if isinstance(value, dict):
+        value = dict(value)
+        return value.pop('text'), value
+    return value, {}
+
+
+def _scatter_points(ax, data, style, series):
+    """Pontok egyenkénti kirajzolása; series esetén címkénként a saját beállításaival."""
+    if series is None:
+        ax.scatter(data['x'], data['y'], **style)
+        return
+    for label, series_style in series.items():
+        subset = data[data['series'] == label]
+        ax.scatter(subset['x'], subset['y'], label=label, **style, **series_style)
+
+
+def sparse_points(x, y, bins=DENSITY_BINS, sparse_count=DENSITY_SPARSE_COUNT, quantile=DENSITY_QUANTILE):
+    """
+    A pontok 2D hisztogramja és a kiugró pontok.
+
+    A hisztogram y tartománya a [quantile, 1 - quantile] kvantilisek közé esik,
+    így néhány szélsőséges érték nem nyomja össze a sűrű részt. Kiugró pont az
+    y tartományon kívüli és a ritka (legfeljebb sparse_count pontú) cellába eső
+    pont.
+
+    Args:
+        x, y (ndarray): Véges float koordináták
+
+    Returns:
+        tuple: (cellánkénti darabszámok, x határok, y határok, a kiugró pontokat
+        jelző bool tömb)
+    """
+    low, high = np.quantile(y, [quantile, 1 - quantile])
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins, range=[None, [low, high] if high > low else None])
+    inside = (y >= y_edges[0]) & (y <= y_edges[-1])
+    x_bin = np.clip(np.searchsorted(x_edges, x, side='right') - 1, 0, len(x_edges) - 2)
+    y_bin = np.clip(np.searchsorted(y_edges, y, side='right') - 1, 0, len(y_edges) - 2)
+    return counts, x_edges, y_edges, ~inside | (counts[x_bin, y_bin] <= sparse_count)
+
+
+def _draw_scatter(ax, data, style, density):
+    """
+    Pontdiagram; a küszöbnél több pontnál sűrűségtérkép, a ritka cellák pontjaival.
+    """
+    import matplotlib.dates as mdates
+    from matplotlib.colors import LogNorm
+
+    series = style.pop('series', None)
+    density = {} if density in (None, True) else density
+    if density is False or len(data) <= density.get('threshold', DENSITY_THRESHOLD):
+        _scatter_points(ax, data, style, series)
+        return
+
+    dates = pd.api.types.is_datetime64_any_dtype(data['x'])
+    x = mdates.date2num(data['x']) if dates else data['x'].to_numpy(dtype='float64')
+    y = data['y'].to_numpy(dtype='float64')
+    finite = np.isfinite(x) & np.isfinite(y)
+    data, x, y = data[finite], x[finite], y[finite]
+
+    sparse_count = density.get('sparse_count', DENSITY_SPARSE_COUNT)
+    counts, x_edges, y_edges, sparse = sparse_points(
+        x, y, density.get('bins', DENSITY_BINS), sparse_count, density.get('quantile', DENSITY_QUANTILE)
+    )
+    cmap = density.get('cmap', 'viridis')
+    if (counts > sparse_count).any():
+        if density.get('method', 'image') == 'hexbin':
+            gridsize = density.get('gridsize', 100)
+            artist = ax.hexbin(x[~sparse], y[~sparse], gridsize=gridsize, bins='log', mincnt=1, cmap=cmap)
+        else:
+            dense = np.ma.masked_less_equal(counts.T, sparse_count)
+            artist = ax.imshow(
+                dense, origin='lower', aspect='auto', interpolation='nearest', cmap=cmap, norm=LogNorm(),
+                extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1])
+            )
+        ax.figure.colorbar(artist, ax=ax, label='Pontok száma')
+
+    # A kiugró értékek egyenként, a sorozatok színeivel
+    _scatter_points(ax, data[sparse], style, series)
+    if dates:
+        ax.xaxis_date()
+
+
+def _binned_kde(values, edges, points=512):
+    """
+    Gauss sűrűséggörbe a hisztogram darabszám léptékében, finom hisztogram
+    simításával (Scott sávszélesség), így a költsége nem függ a pontok számától.
+    """
+    bandwidth = values.std() * len(values) ** (-1 / 5)
+    if not bandwidth > 0:
+        return None
+    grid = np.linspace(values.min() - 3 * bandwidth, values.max() + 3 * bandwidth, points + 1)
+    counts, _ = np.histogram(values, bins=grid)
+    step = grid[1] - grid[0]
+    half = min(int(np.ceil(4 * bandwidth / step)), points // 2)
+    offsets = np.arange(-half, half + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+    smoothed = np.convolve(counts, kernel / kernel.sum(), mode='same')
+    return (grid[:-1] + grid[1:]) / 2, smoothed * (edges[1] - edges[0]) / step
+
+
+def _draw_lines(ax, data, style):
+    """Oszloponként egy vonal; a hiányzó értékek kimaradnak, a vonal összeköti a meglévőket."""
+    series = style.pop('series', {})
+    if isinstance(data, pd.Series):
+        data = data.to_frame()
+    for column in data.columns:
+        values = data[column].dropna()
+        ax.plot(values.index, values.to_numpy(), label=column, **style, **series.get(column, {}))
+
+
+def _draw_heatmap(ax, data, style):
+    """
+    Színezett mátrix a DataFrame sorai és oszlopai szerint, színskálával; a
+    cellák feliratának színe a háttér világosságához igazodik.
+    """
+    annot = style.pop('annot', False)
+    fmt = style.pop('fmt', '.2g')
+    values = data.to_numpy(dtype='float64', na_value=np.nan)
+    image = ax.imshow(np.ma.masked_invalid(values), aspect='auto', interpolation='nearest',
+                      cmap=style.pop('cmap', 'viridis'), **style)
+    ax.figure.colorbar(image, ax=ax)
+    ax.set_xticks(range(data.shape[1]), [str(column) for column in data.columns])
+    ax.set_yticks(range(data.shape[0]), [str(label) for label in data.index])
+    ax.set_xlabel(data.columns.name or '')
+    ax.set_ylabel(data.index.name or '')
+    if not annot:
+        return
+    for (row, col), value in np.ndenumerate(values):
+        if not np.isfinite(value):
+            continue
+        red, green, blue, _ = image.cmap(image.norm(value))
+        color = 'black' if 0.2126 * red + 0.7152 * green + 0.0722 * blue > 0.408 else 'white'
+        text = format(int(value), fmt) if fmt.endswith('d') else format(value, fmt)
+        ax.text(col, row, text, ha='center', va='center', color=color)
+
+
+def _draw_panel(ax, item):
+    """Egy panel kirajzolása a megadott tengelyre."""
+    import matplotlib.dates as mdates
+    import matplotlib.pyplot as plt
+
+    data, style = item['data'], dict(item['style'])
+    if item['kind'] == 'bar':
+        data.plot(kind='bar', ax=ax, **style)
+    elif item['kind'] == 'scatter':
+        _draw_scatter(ax, data, style, item.get('density'))
+    elif item['kind'] == 'line':
+        _draw_lines(ax, data, style)
+    elif item['kind'] == 'heatmap':
+        _draw_heatmap(ax, data, style)
+    elif item['kind'] == 'hist':
+        kde = style.pop('kde', False)
+        values = np.asarray(data, dtype='float64')
+        values = values[np.isfinite(values)]
+        _, edges, _ = ax.hist(values, bins=style.pop('bins', 'auto'), **style)
+        curve = _binned_kde(values, edges) if kde else None
+        if curve is not None:
+            ax.plot(*curve, color=style.get('color', 'C0'))
+    else:
+        raise ValueError(f"Ismeretlen diagram típus: {item['kind']}")
+
+    for key, setter in (('title', ax.set_title), ('xlabel', ax.set_xlabel), ('ylabel', ax.set_ylabel)):
+        if item.get(key) is not None:
+            text, kwargs = _text(item[key])
+            setter(text, **kwargs)
+    if item.get('date_format'):
+        ax.xaxis.set_major_formatter(mdates.DateFormatter(item['date_format']))
+    if item.get('xticks'):
+        plt.setp(ax.get_xticklabels(), **item['xticks'])
+    if item.get('yticks'):
+        plt.setp(ax.get_yticklabels(), **item['yticks'])
+    if item.get('ylim') is not None:
+        ax.set_ylim(*item['ylim'])
+    if item.get('grid'):
+        ax.grid(True, **(item['grid'] if isinstance(item['grid'], dict) else {}))
+    if item.get('axhline'):
+        ax.axhline(**item['axhline'])
+    legend = item.get('legend')
+    if legend is False:
+        if ax.get_legend() is not None:
+            ax.get_legend().remove()
+    elif legend is not None:
+        ax.legend(**(legend if isinstance(legend, dict) else {}))
+
+
+def _render_matplotlib(spec, output_dir, formats, show):
+    import matplotlib.pyplot as plt
+
+    layout = spec['layout']
+    fig, axes = plt.subplots(layout['rows'], layout['cols'], figsize=layout['figsize'], squeeze=False)
+    for ax, item in zip(axes.flat, spec['panels']):
+        _draw_panel(ax, item)
+    if layout.get('title'):
+        fig.suptitle(layout['title'])
+    fig.tight_layout()
+
+    files = []
+    for fmt in formats:
+        if fmt == 'html':
+            continue
+        files.append(f"{spec['name']}.{fmt}")
+        fig.savefig(os.path.join(output_dir, files[-1]), bbox_inches='tight')
+    if show:
+        plt.show()
+    plt.close(fig)
+    return files
+
+
+def _render_plotly(spec, output_dir, formats, show):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(spec['figure'])
+    files = [f"{spec['name']}.html"]
+    fig.write_html(os.path.join(output_dir, files[0]), include_plotlyjs='cdn')
+    for fmt in formats:
+        if fmt == 'html':
+            continue
+        try:
+            fig.write_image(os.path.join(output_dir, f"{spec['name']}.{fmt}"))
+        except (ImportError, ValueError):
+            # Statikus képexport csak a kaleido csomaggal; enélkül a HTML marad
+            break
+        files.append(f"{spec['name']}.{fmt}")
+    if show:
+        fig.show()
+    return files
+
+
+def render_figure(spec, output_dir='.', formats=FORMATS, show=False):
+    """
+    Egy ábra kirajzolása és mentése.
+
+    Returns:
+        dict: name, fingerprint és files (a kimeneti könyvtárhoz relatív fájlnevek)
+    """
+    fingerprint = spec.get('fingerprint') or figure_fingerprint(spec, formats)
+    if spec['kind'] == 'plotly':
+        files = _render_plotly(spec, output_dir, formats, show)
+    else:
+        files = _render_matplotlib(spec, output_dir, formats, show)
+    return {'name': spec['name'], 'fingerprint': fingerprint, 'files': files}
+
+
+@contextlib.contextmanager
+def collect_figures():
+    """A blokkban kibocsátott ábra leírások összegyűjtése kirajzolás helyett."""
+    global _COLLECTOR
+    previous, _COLLECTOR = _COLLECTOR, []
+    try:
+        yield _COLLECTOR
+    finally:
+        _COLLECTOR = previous
+
+
+def emit_figure(spec, output_dir='.'):
+    """Az ábra átadása: gyűjtés közben a listába kerül, egyébként azonnal kirajzolódik és megjelenik."""
+    if _COLLECTOR is not None:
+        _COLLECTOR.append(spec)
+        return None
+    return render_figure(spec, output_dir, show=True)
+
+
+def read_manifest(output_dir):
+    """A kimeneti könyvtár legutóbb kirajzolt ábrái: név -> {fingerprint, files}."""
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def update_manifest(output_dir, rendered):
+    """A kirajzolt ábrák (render_figure eredmények) beírása a manifest fájlba."""
+    manifest = read_manifest(output_dir)
+    for result in rendered:
+        manifest[result['name']] = {'fingerprint': result['fingerprint'], 'files': result['files']}
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def pending_figures(specs, output_dir, formats=FORMATS):
+    """
+    A kirajzolandó ábrák szétválasztása a változatlanoktól.
+
+    Egy ábra kimarad, ha az ujjlenyomata egyezik a manifestben tárolttal, és a
+    fájljai megvannak.
+
+    Returns:
+        tuple: (kirajzolandó leírások az ujjlenyomatukkal, változatlan ábrák nevei)
+    """
+    manifest = read_manifest(output_dir)
+    pending, unchanged = [], []
+    for spec in specs:
+        fingerprint = figure_fingerprint(spec, formats)
+        previous = manifest.get(spec['name'], {})
+        if previous.get('fingerprint') == fingerprint and all(
+            os.path.exists(os.path.join(output_dir, name)) for name in previous.get('files', [])
+        ):
+            unchanged.append(spec['name'])
+        else:
+            pending.append(dict(spec, fingerprint=fingerprint))
+    return pending, unchanged
+
+
+def _init_render_worker():
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def render_figures(specs, output_dir='.', formats=FORMATS, max_workers=None):
+    """
+    Ábrák párhuzamos kirajzolása egy folyamatkészletben; a változatlanok kimaradnak.
+
+    Returns:
+        tuple: (render_figure eredmények, változatlan ábrák nevei)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    pending, unchanged = pending_figures(specs, output_dir, formats)
+    if not pending:
+        return [], unchanged
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_render_worker) as executor:
+        rendered = list(executor.map(render_figure, pending, repeat(output_dir), repeat(formats)))
+    update_manifest(output_dir, rendered)
+    return rendered, unchanged
@@ -0,0 +1,206 @@
+"""
+Többdimenziós funnel kocka.
+
+A funnel szakaszainak számai a kért dimenziók (dátum, pénznem, nyelv, utm
+forrás/médium/kampány) minden előforduló kombinációjára egyetlen csoportosítással
+állnak elő forrás táblánként. Az összesítések, a pénznemenkénti bontás és a
+diagramok mind ugyanebből a kockából olvasnak, újraszámolás nélkül.
+"""
+import pandas as pd
+
+from hotel_pipeline.categorical import category_transform
+
+# A funnel szakaszai sorrendben, és hogy melyik táblából számolódnak
+STAGES = ['visitors', 'datepicker', 'searches', 'sessions', 'bookings', 'booking_records']
+
+STAGE_LABELS = {
+    'visitors': 'Website Visits',
+    'datepicker': 'Datepicker Usage',
+    'searches': 'Searches',
+    'sessions': 'Sessions',
+    'bookings': 'Bookings',
+    'booking_records': 'Booking Records'
+}
+
+# Dimenziónként a forrás oszlop a napi táblákban és a keresésekben; ahol nincs
+# ilyen oszlop, a szakasz számai a dimenzió hiányzó értékéhez kerülnek
+DAILY_DIMENSIONS = {
+    'date': 'date',
+    'utm_source': 'utm_source',
+    'utm_medium': 'utm_medium',
+    'utm_campaign': 'utm_campaign'
+}
+SEARCH_DIMENSIONS = {
+    'date': 'utc_datetime',
+    'currency': 'currency',
+    'lang_code': 'lang_code',
+    'utm_source': 'utm_source',
+    'utm_medium': 'utm_medium',
+    'utm_campaign': 'utm_campaign'
+}
+DIMENSIONS = list(SEARCH_DIMENSIONS)
+
+SESSION_DIMENSIONS = ['utm_source', 'utm_medium', 'utm_campaign']
+
+
+def funnel_columns(dimensions=()):
+    """
+    A kocka számításához szükséges táblák és oszlopok (a betöltés columns paramétere).
+    """
+    dimensions = list(dimensions)
+    daily = [DAILY_DIMENSIONS[dim] for dim in dimensions if dim in DAILY_DIMENSIONS] + ['user_count']
+    search = ['id', 'search_log_session_id', 'conversion'] + [
+        SEARCH_DIMENSIONS[dim] for dim in dimensions if dim not in SESSION_DIMENSIONS
+    ]
+    columns = {
+        'website_daily_users': daily,
+        'datepicker_daily_visitors': list(daily),
+        'search_log': search,
+        'booking_data': ['search_log_id']
+    }
+    sessions = [dim for dim in dimensions if dim in SESSION_DIMENSIONS]
+    if sessions:
+        columns['search_log_session'] = ['id'] + sessions
+    return columns
+
+
+def _strip(values):
+    return values.map(lambda value: value.strip() if isinstance(value, str) else value)
+
+
+def _dimension_values(column, dimension):
+    """Egy dimenzió értékei: a dátum napra kerekítve, a szövegek szóközök nélkül."""
+    if dimension == 'date':
+        return column.dt.normalize()
+    if dimension in SESSION_DIMENSIONS and isinstance(column.dtype, pd.CategoricalDtype):
+        # A website_daily_users utm bontása nem vágja le a szóközöket
+        return category_transform(column, _strip)
+    return column
+
+
+def _daily_counts(df, dimensions, stage):
+    """Egy napi tábla user_count összege a dimenziók szerint, egy csoportosítással."""
+    keys = {
+        dim: _dimension_values(df[DAILY_DIMENSIONS[dim]], dim)
+        for dim in dimensions if dim in DAILY_DIMENSIONS
+    }
+    if not keys:
+        return pd.DataFrame({stage: [df['user_count'].sum()]})
+    frame = pd.DataFrame(keys).assign(**{stage: df['user_count'].to_numpy()})
+    return frame.groupby(list(keys), observed=True, dropna=False, sort=False)[stage].sum().reset_index()
+
+
+def _search_counts(dataframes, dimensions):
+    """
+    A keresési szakaszok egy csoportosítással.
+
+    Egy session abban a cellában számít, ahol az első keresése van, így a sessionök
+    száma cellánként összeadható, és összesen a különböző sessionök száma. A
+    booking_data sorai a keresésükhöz kapcsolódnak; a keresés nélküli foglalási
+    sorok a dimenziók hiányzó értékénél szerepelnek.
+    """
+    search_log = dataframes['search_log']
+    booking_ids = dataframes['booking_data']['search_log_id']
+    records = booking_ids.value_counts()
+
+    frame = pd.DataFrame({
+        dim: _dimension_values(search_log[SEARCH_DIMENSIONS[dim]], dim)
+        for dim in dimensions if dim not in SESSION_DIMENSIONS
+    }, index=search_log.index)
+
+    sessions = [dim for dim in dimensions if dim in SESSION_DIMENSIONS]
+    if sessions:
+        session_table = dataframes['search_log_session'].set_index('id')
+        for dim in sessions:
+            values = session_table[dim].reindex(search_log['search_log_session_id'].to_numpy())
+            frame[dim] = _dimension_values(values, dim).to_numpy()
+
+    frame['searches'] = 1
+    frame['sessions'] = (~search_log['search_log_session_id'].duplicated()).to_numpy().astype('int64')
+    frame['bookings'] = (search_log['conversion'] == 1).to_numpy().astype('int64')
+    frame['booking_records'] = search_log['id'].map(records).fillna(0).to_numpy().astype('int64')
+
+    unmatched = int((~booking_ids.isin(search_log['id'])).sum())
+    if unmatched:
+        frame = pd.concat([frame, pd.DataFrame({'booking_records': [unmatched]})], ignore_index=True)
+
+    stages = ['searches', 'sessions', 'bookings', 'booking_records']
+    if len(dimensions) == 0:
+        return frame[stages].sum().to_frame().T
+    return frame.groupby(list(dimensions), observed=True, dropna=False, sort=False)[stages].sum().reset_index()
+
+
+def build_funnel_cube(dataframes, dimensions=()):
+    """
+    A funnel kocka: a dimenziók minden előforduló kombinációjára a szakaszok számai.
+
+    Forrás táblánként egy csoportosítás fut; a napi táblák (látogatók,
+    dátumválasztó) csak a dátum és utm dimenziók szerint bonthatók, a többi
+    dimenzió hiányzó értékénél szerepelnek. Így egy szakasz összege a kocka
+    bármely dimenziója szerint összesítve is a teljes szám marad.
+
+    Args:
+        dataframes (Mapping): A tisztított táblák
+        dimensions (iterable): A DIMENSIONS közül választott dimenziók
+
+    Returns:
+        DataFrame: A dimenzió oszlopok és a STAGES oszlopok (egész számok)
+
+    Raises:
+        ValueError: Ismeretlen dimenzió esetén
+    """
+    dimensions = list(dimensions)
+    unknown = [dim for dim in dimensions if dim not in DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Ismeretlen funnel dimenzió: {', '.join(unknown)}")
+
+    parts = [
+        _daily_counts(dataframes['website_daily_users'], dimensions, 'visitors'),
+        _daily_counts(dataframes['datepicker_daily_visitors'], dimensions, 'datepicker'),
+        _search_counts(dataframes, dimensions)
+    ]
+    # A kategória oszlopok eltérő szótárai az összefűzéskor object típusúvá válnának
+    parts = [
+        part.astype({col: object for col in dimensions if col in part.columns and col != 'date'})
+        for part in parts
+    ]
+    cube = pd.concat(parts, ignore_index=True)
+    for dim in dimensions:
+        if dim not in cube.columns:
+            cube[dim] = None
+
+    cube[STAGES] = cube[STAGES].fillna(0).astype('int64')
+    if not dimensions:
+        return cube[STAGES].sum().to_frame().T
+    return cube.groupby(dimensions, dropna=False, sort=False)[STAGES].sum().reset_index()
+
+
+def rollup(cube, dimensions=()):
+    """
+    A kocka összesítése a megadott dimenziókra (a többi dimenzió összeadódik).
+
+    Returns:
+        DataFrame: Dimenziók nélkül egysoros, egyébként a dimenziók szerinti indexű tábla
+    """
+    dimensions = list(dimensions)
+    if not dimensions:
+        return cube[STAGES].sum().to_frame().T
+    return cube.groupby(dimensions, dropna=False, sort=False)[STAGES].sum()
+
+
+def funnel_totals(cube):
+    """A szakaszok teljes számai."""
+    return cube[STAGES].sum()
+
+
+def get_funnel_cube(dataframes, dimensions=()):
+    """
+    A betöltött táblák funnel kockája.
+
+    Ha a leképezés maga tudja előállítani (LazyTables), annak tárolt példánya
+    kerül vissza, így ugyanazokra a dimenziókra csak egyszer számolódik.
+    """
+    funnel_cube = getattr(dataframes, 'funnel_cube', None)
+    if funnel_cube is not None:
+        return funnel_cube(tuple(dimensions))
+    return build_funnel_cube(dataframes, dimensions)
@@ -0,0 +1,180 @@
+"""
+Pénznem normalizálás napi árfolyamokkal.
+
+A helyi árfolyam fájl (config.FX_RATES_PATH) soronként egy nap egy pénznemének
+EUR alapú árfolyamát tartalmazza (date;currency;rate: egy EUR hány egység az
+adott pénznemből, mint az EKB referencia árfolyamoknál). A search_log,
+booking_data és upsell_data összegei a keresés ideje (utc_datetime) szerinti,
+arra a napra vagy a legutóbbi korábbi napra érvényes árfolyammal (as-of
+kapcsolás) számolódnak át a riport pénznemére, egyetlen rendezett merge_asof
+hívással. Így az elemzések egyszer összesíthetnek az összes foglaláson, a
+pénznemenkénti bontás pedig egy csoportosítási dimenzió.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from hotel_pipeline.config import FX_RATES_PATH, REPORTING_CURRENCY
+from hotel_pipeline.money import to_major
+from hotel_pipeline.schema import TABLE_SCHEMAS
+
+# Az árfolyam fájl alap pénzneme (árfolyama mindig 1)
+FX_BASE_CURRENCY = 'EUR'
+
+# A riport pénznemére átszámolt oszlopok utótagja
+REPORTING_SUFFIX = '_reporting'
+
+# Táblánként az átszámolandó összeg oszlopok
+FX_AMOUNTS = {
+    'search_log': TABLE_SCHEMAS['search_log']['money'],
+    'booking_data': TABLE_SCHEMAS['booking_data']['money'],
+    'upsell_data': TABLE_SCHEMAS['upsell_data']['money']
+}
+
+# Megjelenítéskor a tizedesjegyek száma pénznemenként (alapértelmezés: 2)
+CURRENCY_DECIMALS = {'HUF': 0}
+
+
+def load_fx_rates(path=None):
+    """
+    A napi árfolyam fájl beolvasása.
+
+    Returns:
+        DataFrame: date, currency, rate oszlopok dátum szerint rendezve; None, ha
+        nincs árfolyam fájl
+    """
+    path = path or FX_RATES_PATH
+    if not os.path.exists(path):
+        return None
+    rates = pd.read_csv(path, sep=None, engine='python', dtype={'currency': str, 'rate': 'float64'},
+                        parse_dates=['date'])
+    rates['currency'] = rates['currency'].str.strip()
+    return rates.sort_values('date', kind='stable').reset_index(drop=True)
+
+
+def fx_factors(rates, reporting_currency=None):
+    """
+    Naponként és pénznemenként a riport pénznemére váltás szorzója.
+
+    A pénznemek árfolyamai napra igazítva, az utolsó ismert értékkel kitöltve
+    kerülnek egymás mellé, így egy nap szorzója mindig ugyanazon a napon érvényes
+    két árfolyam hányadosa.
+
+    Returns:
+        DataFrame: date, currency, factor oszlopok dátum szerint rendezve
+    """
+    reporting_currency = reporting_currency or REPORTING_CURRENCY
+    wide = rates.pivot_table(index='date', columns='currency', values='rate', aggfunc='last').sort_index().ffill()
+    wide[FX_BASE_CURRENCY] = 1.0
+    if reporting_currency not in wide.columns:
+        raise ValueError(f"Nincs árfolyam a riport pénznemére: {reporting_currency}")
+    factors = wide.rdiv(wide[reporting_currency], axis=0)
+    factors.columns.name = 'currency'
+    return factors.stack().rename('factor').reset_index().sort_values('date', kind='stable')
+
+
+def reporting_amounts(amounts, times, currencies, factors):
+    """
+    Összegek a riport pénznemében, az időpontjukban érvényes árfolyammal.
+
+    Az időpont előtti legutóbbi árfolyam (merge_asof) érvényes; az első árfolyam
+    előtti időpontokra a pénznem első árfolyama. Ismeretlen pénznemnél vagy
+    hiányzó időpontnál az eredmény NaN.
+
+    Args:
+        amounts (DataFrame): Pénzegységben megadott összeg oszlopok
+        times (array): Soronkénti időpontok
+        currencies (array): Soronkénti pénznemek
+
+    Returns:
+        DataFrame: Az összegek a riport pénznemében (float64), az amounts indexével
+    """
+    currencies = pd.Series(currencies, dtype=object)
+    keys = pd.DataFrame({
+        'time': pd.to_datetime(pd.Series(times)).to_numpy(),
+        'currency': currencies.where(currencies.map(lambda value: isinstance(value, str)), '').to_numpy(),
+        'row': np.arange(len(amounts))
+    }).dropna(subset=['time']).sort_values('time', kind='stable')
+
+    merged = pd.merge_asof(keys, factors, left_on='time', right_on='date', by='currency', direction='backward')
+    first = factors.groupby('currency')['factor'].first()
+    factor = merged['factor'].fillna(merged['currency'].map(first))
+
+    row_factor = np.full(len(amounts), np.nan)
+    row_factor[merged['row'].to_numpy()] = factor.to_numpy(dtype='float64')
+    return amounts.astype('float64').mul(row_factor, axis=0)
+
+
+def normalize_table(dataframes, table, factors):
+    """
+    A tábla másolata a riport pénznemére átszámolt <oszlop>_reporting oszlopokkal.
+
+    A booking_data és upsell_data sorainak pénzneme és időpontja a keresésükből
+    (search_log) jön; a váltópénz egységben tárolt összegek pénzegységre váltva
+    számolódnak át.
+    """
+    df = dataframes[table]
+    if table == 'search_log':
+        times, currencies = df['utc_datetime'].to_numpy(), df['currency'].to_numpy()
+    else:
+        searches = dataframes['search_log'][['id', 'utc_datetime', 'currency']].set_index('id')
+        search_ids = df['search_log_id'].to_numpy()
+        times = searches['utc_datetime'].reindex(search_ids).to_numpy()
+        currencies = searches['currency'].reindex(search_ids).to_numpy()
+
+    columns = FX_AMOUNTS[table]
+    money = TABLE_SCHEMAS[table].get('money', [])
+    amounts = pd.DataFrame({col: to_major(df[col]) if col in money else df[col] for col in columns})
+    converted = reporting_amounts(amounts, times, currencies, factors)
+    return df.assign(**{col + REPORTING_SUFFIX: converted[col].to_numpy() for col in columns})
+
+
+def get_fx_factors(dataframes):
+    """
+    A riport pénznemére váltás szorzói; None, ha nincs árfolyam fájl.
+
+    Ha a leképezés maga tudja előállítani (LazyTables), annak tárolt példánya
+    kerül vissza.
+    """
+    factors = getattr(dataframes, 'fx_factors', None)
+    if factors is not None:
+        return factors()
+    rates = load_fx_rates()
+    return fx_factors(rates) if rates is not None else None
+
+
+def get_normalized(dataframes, table):
+    """
+    A tábla a riport pénznemére átszámolt oszlopokkal; None, ha nincs árfolyam fájl.
+
+    Ha a leképezés maga tudja előállítani (LazyTables), annak tárolt példánya
+    kerül vissza, így táblánként csak egyszer számolódik.
+    """
+    normalized = getattr(dataframes, 'normalized', None)
+    if normalized is not None:
+        return normalized(table)
+    factors = get_fx_factors(dataframes)
+    return normalize_table(dataframes, table, factors) if factors is not None else None
+
+
+def currency_order(currencies):
+    """Az előforduló pénznemek: elöl a riport pénzneme, utána betűrendben (a 0 kitöltés nélkül)."""
+    present = {value for value in pd.unique(np.asarray(currencies, dtype=object)) if isinstance(value, str)}
+    return sorted(present, key=lambda currency: (currency != REPORTING_CURRENCY, currency))
+
+
+def currency_groups(df, column='currency'):
+    """
+    A tábla pénznemenkénti részei egyetlen csoportosítással, currency_order sorrendben.
+
+    Returns:
+        list: (pénznem, rész tábla) párok; csak az előforduló pénznemek
+    """
+    groups = dict(tuple(df.groupby(column, observed=True, sort=False)))
+    return [(currency, groups[currency]) for currency in currency_order(list(groups))]
+
+
+def amount_format(currency):
+    """Az összegek formátuma a pénznem tizedesjegyeivel (pl. '{:,.0f}' HUF-ra)."""
+    return '{:,.%df}' % CURRENCY_DECIMALS.get(currency, 2)
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+from hotel_pipeline.joinindex import SearchJoinIndex
+
+# Vendég kategóriák a kiértékelés sorrendjében
+SINGLE = 'Egyedülálló'
+COUPLE = 'Pár'
+THREE_ADULTS = 'Három felnőtt'
+FOUR_ADULTS = 'Négy felnőtt'
+LARGE_GROUP = 'Nagy csoport (5+ felnőtt)'
+FAMILY_TODDLER = 'Család kisgyerekkel (0-2 év)'
+FAMILY_1_CHILD = 'Család 1 gyerekkel'
+FAMILY_2_CHILDREN = 'Család 2 gyerekkel'
+FAMILY_3_CHILDREN = 'Család 3+ gyerekkel'
+
+GUEST_CATEGORIES = [
+    SINGLE, COUPLE, THREE_ADULTS, FOUR_ADULTS, LARGE_GROUP,
+    FAMILY_TODDLER, FAMILY_1_CHILD, FAMILY_2_CHILDREN, FAMILY_3_CHILDREN
+]
+
+# Ennyi éves korig számít egy gyerek kisgyereknek
+TODDLER_MAX_AGE = 2
+
+
+def min_child_age_by_search(search_log_room, search_log_room_child, join_index=None):
+    """
+    A keresésenként megadott gyerekek legkisebb életkora.
+
+    Args:
+        search_log_room (DataFrame): Szobák (id, search_log_id)
+        search_log_room_child (DataFrame): Gyerekek (search_log_room_id, age)
+        join_index (SearchJoinIndex): Már felépített kapcsolati index (alapértelmezés: új index)
+
+    Returns:
+        Series: search_log_id -> legkisebb életkor (csak a gyereket tartalmazó keresések)
+    """
+    if join_index is None:
+        join_index = SearchJoinIndex(search_log_room, search_log_room_child)
+    return join_index.child_stats()['min_age'].dropna()
+
+
+def categorize_bookings(bookings, search_log_room, search_log_room_child, id_column='id', min_child_age=None):
+    """
+    Foglalások vendég kategóriába sorolása a felnőttek és gyerekek száma, valamint a
+    legkisebb gyerek életkora alapján.
+
+    A gyerekek életkora keresésenként egyetlen csoportosítással áll elő, a
+    kategóriák pedig tömbműveletekkel, így a futási idő a táblák méretével
+    lineárisan nő. A foglalást mindig a keresés azonosítója (id_column) köti a
+    szobáihoz, nem a DataFrame indexe.
+
+    Args:
+        bookings (DataFrame): adults, children és a keresés azonosítója
+        search_log_room (DataFrame): Szobák (id, search_log_id)
+        search_log_room_child (DataFrame): Gyerekek (search_log_room_id, age)
+        id_column (str): A keresés azonosítóját tartalmazó oszlop a bookings táblában
+        min_child_age (Series): Előre kiszámolt min_child_age_by_search eredmény
+
+    Returns:
+        Series: Kategória nevek a bookings indexével
+    """
+    if min_child_age is None:
+        min_child_age = min_child_age_by_search(search_log_room, search_log_room_child)
+
+    adults = bookings['adults'].to_numpy()
+    children = bookings['children'].to_numpy()
+    has_toddler = (bookings[id_column].map(min_child_age) <= TODDLER_MAX_AGE).to_numpy()
+
+    no_children = children == 0
+    categories = np.select(
+        [
+            no_children & (adults == 1),
+            no_children & (adults == 2),
+            no_children & (adults == 3),
+            no_children & (adults == 4),
+            no_children,
+            has_toddler,
+            children == 1,
+            children == 2
+        ],
+        [SINGLE, COUPLE, THREE_ADULTS, FOUR_ADULTS, LARGE_GROUP, FAMILY_TODDLER, FAMILY_1_CHILD, FAMILY_2_CHILDREN],
+        default=FAMILY_3_CHILDREN
+    )
+    return pd.Series(categories.astype(object), index=bookings.index)
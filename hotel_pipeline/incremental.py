@@ -0,0 +1,244 @@
+import hashlib
+import io
+import json
+import os
+
+import pandas as pd
+
+from hotel_pipeline.cache import CLEANING_VERSION, default_cache_dir, read_parquet, write_parquet
+from hotel_pipeline.chunked import DEFAULT_CHUNKSIZE, clean_table_chunked, partition_paths
+from hotel_pipeline.schema import TABLE_SCHEMAS, read_csv_kwargs, finalize_table
+
+# Csak hozzáfűzéssel bővülő táblák és a vízjelük oszlopa. A már feldolgozott sorokat
+# a bájt pozíció zárja ki, a vízjel csak a késve érkezett sorok számolására szolgál:
+# az azonosítók egyediek, így a vízjelnél nem nagyobb id késett sor; a napi
+# táblákban az utolsó nap sorai több szállítmányban is érkezhetnek, ezért ott csak
+# a korábbi napok sorai számítanak késettnek. A késett sorok is a tárba kerülnek.
+INCREMENTAL_TABLES = {
+    'search_log': {'column': 'id', 'strict': True},
+    'search_log_session': {'column': 'id', 'strict': True},
+    'website_daily_users': {'column': 'date', 'strict': False}
+}
+
+STATE_FILE = '_state.json'
+
+# Ennyi bájt a fájl elejéről azonosítja, hogy a nyers fájlt nem írták-e újra
+HEAD_BYTES = 1 << 16
+
+
+def default_store_dir(hotel_id):
+    """A hotel növekményesen frissített tárának alapértelmezett könyvtára."""
+    return os.path.join(default_cache_dir(hotel_id), 'incremental')
+
+
+def _head_digest(path, length):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read(length)).hexdigest()
+
+
+def _schema_digest(table):
+    return hashlib.sha256(f'{CLEANING_VERSION}|{TABLE_SCHEMAS[table]!r}'.encode('utf-8')).hexdigest()
+
+
+def _watermark_value(value):
+    """A vízjel JSON-ban tárolható alakja."""
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return int(value)
+
+
+def _parse_watermark(table, value):
+    if INCREMENTAL_TABLES[table]['column'] == 'date':
+        return pd.Timestamp(value)
+    return value
+
+
+def read_state(table_dir):
+    """A tábla tárolt állapota (bájt pozíció, vízjel), vagy None."""
+    path = os.path.join(table_dir, STATE_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_state(table_dir, state):
+    path = os.path.join(table_dir, STATE_FILE)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _needs_rebuild(state, path, table):
+    """Igaz, ha a tárolt állapot nem folytatható: új séma, újraírt vagy rövidebb fájl."""
+    return (
+        state is None
+        or state['schema'] != _schema_digest(table)
+        or os.path.getsize(path) < state['offset']
+        or _head_digest(path, state['head_bytes']) != state['head']
+    )
+
+
+def _complete_size(path, block=1 << 16):
+    """A fájl elejének hossza az utolsó sorvégig; a még félig írt utolsó sor nem tartozik bele."""
+    with open(path, 'rb') as f:
+        end = f.seek(0, os.SEEK_END)
+        while end > 0:
+            start = max(0, end - block)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b'\n')
+            if newline >= 0:
+                return start + newline + 1
+            end = start
+    return 0
+
+
+def _rebuild(path, input_dir, hotel_id, table, store_dir, encoding, chunksize):
+    """
+    A tábla teljes újratisztítása particionált Parquet tárba, az állapot felvételével.
+
+    Csak a lezárt (sorvéggel végződő) sorok dolgozódnak fel; a félig írt utolsó sor
+    a következő frissítéskor olvasódik be.
+    """
+    size = _complete_size(path)
+    header = pd.read_csv(path, nrows=0, encoding=encoding, delimiter=TABLE_SCHEMAS[table]['delimiter'])
+    stats = clean_table_chunked(input_dir, hotel_id, table, store_dir, encoding, chunksize, nbytes=size)
+
+    column = INCREMENTAL_TABLES[table]['column']
+    table_dir = os.path.join(store_dir, table)
+    watermark = None
+    for part_path in partition_paths(table_dir):
+        part_max = read_parquet(part_path, [column])[column].max()
+        watermark = part_max if watermark is None else max(watermark, part_max)
+
+    state = {
+        'schema': _schema_digest(table),
+        'head': _head_digest(path, min(HEAD_BYTES, size)),
+        'head_bytes': min(HEAD_BYTES, size),
+        'header': list(header.columns),
+        'offset': size,
+        'watermark': None if watermark is None else _watermark_value(watermark),
+        'rows': stats['rows']
+    }
+    _write_state(table_dir, state)
+    return {'mode': 'teljes', 'rows': stats['rows'], 'new_rows': stats['rows'], 'watermark': state['watermark']}
+
+
+def _read_tail(path, table, state, encoding):
+    """
+    A legutóbbi feldolgozás óta hozzáfűzött sorok beolvasása a séma típusaival.
+
+    Csak az utolsó sorvégig olvas; a félig írt utolsó sor nem számít feldolgozottnak,
+    a következő futás a teljes sort olvassa be.
+
+    Returns:
+        tuple: (DataFrame vagy None, a feldolgozott bájtok száma)
+    """
+    with open(path, 'rb') as f:
+        f.seek(state['offset'])
+        data = f.read()
+    data = data[:data.rfind(b'\n') + 1]
+    if not data.strip():
+        return None, len(data)
+
+    df = pd.read_csv(
+        io.BytesIO(data), header=None, names=state['header'], encoding=encoding, **read_csv_kwargs(table)
+    )
+    return df, len(data)
+
+
+def refresh_table(input_dir, hotel_id, table, store_dir, encoding=None, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Egy hozzáfűzéssel bővülő tábla frissítése a tisztított tárban.
+
+    Az első futás (vagy újraírt nyers fájl, illetve megváltozott séma) teljes
+    tisztítást végez. Utána csak a legutóbbi futás óta a fájl végére került bájtok
+    olvasódnak be, és tisztítva új Parquet darabként kerülnek a tábla könyvtárába;
+    a vízjelnél régebbi (késve érkezett) sorok száma az eredményben szerepel.
+
+    Args:
+        input_dir (str): Bemeneti könyvtár elérési útja
+        hotel_id (int): A hotel azonosítója (a fájlnevek utótagja)
+        table (str): A tábla neve (INCREMENTAL_TABLES egyike)
+        store_dir (str): A tisztított tár könyvtára; a tábla a store_dir/table alá kerül
+        encoding (str): Karakterkódolás, ha eltér az alapértelmezettől
+        chunksize (int): Teljes újratisztításkor egy darab sorainak száma
+
+    Returns:
+        dict: A frissítés módja, a tábla, az új és ebből a késett sorok száma, valamint a vízjel
+    """
+    if table not in INCREMENTAL_TABLES:
+        raise KeyError(f"A(z) {table} tábla nem frissíthető növekményesen")
+
+    path = f'{input_dir}/{table}_hotel_{hotel_id}.csv'
+    table_dir = os.path.join(store_dir, table)
+    state = read_state(table_dir)
+    if _needs_rebuild(state, path, table):
+        return _rebuild(path, input_dir, hotel_id, table, store_dir, encoding, chunksize)
+
+    df, consumed = _read_tail(path, table, state, encoding)
+    new_rows = 0
+    late_rows = 0
+    if df is not None:
+        column = INCREMENTAL_TABLES[table]['column']
+        if state['watermark'] is not None:
+            watermark = _parse_watermark(table, state['watermark'])
+            if INCREMENTAL_TABLES[table]['strict']:
+                late_rows = int((df[column] <= watermark).sum())
+            else:
+                late_rows = int((df[column] < watermark).sum())
+
+        if len(df) > 0:
+            df = finalize_table(df.reset_index(drop=True), table, numeric_categories=False)
+            part = len(partition_paths(table_dir))
+            write_parquet(df, os.path.join(table_dir, f'part-{part:05d}.parquet'))
+            new_rows = len(df)
+
+            new_max = df[column].max()
+            if state['watermark'] is not None:
+                new_max = max(new_max, _parse_watermark(table, state['watermark']))
+            state['watermark'] = _watermark_value(new_max)
+
+    state['offset'] += consumed
+    state['rows'] += new_rows
+    _write_state(table_dir, state)
+    return {
+        'mode': 'növekményes', 'rows': state['rows'], 'new_rows': new_rows, 'late_rows': late_rows,
+        'watermark': state['watermark']
+    }
+
+
+def refresh_tables(input_dir, hotel_id, store_dir, encodings=None, tables=None, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    A hozzáfűzéssel bővülő táblák frissítése.
+
+    Args:
+        input_dir (str): Bemeneti könyvtár elérési útja
+        hotel_id (int): A hotel azonosítója (a fájlnevek utótagja)
+        store_dir (str): A tisztított tár könyvtára
+        encodings (dict): Táblánkénti karakterkódolás, ha eltér az alapértelmezettől
+        tables (list): A frissítendő táblák (alapértelmezés: INCREMENTAL_TABLES)
+        chunksize (int): Teljes újratisztításkor egy darab sorainak száma
+
+    Returns:
+        dict: táblanév -> a refresh_table eredménye
+    """
+    encodings = encodings or {}
+    return {
+        table: refresh_table(input_dir, hotel_id, table, store_dir, encodings.get(table), chunksize)
+        for table in (tables or INCREMENTAL_TABLES)
+    }
+
+
+def print_refresh_report(results):
+    """Táblánkénti frissítési eredmények kiírása."""
+    print("\nNövekményes frissítés táblánként:")
+    print("-" * 50)
+    for table, result in results.items():
+        print(
+            f"{table:<25} {result['mode']:<12} új sorok: {result['new_rows']:>10,}  "
+            f"összesen: {result['rows']:>12,}  vízjel: {result['watermark']}"
+        )
+        if result.get('late_rows'):
+            print(f"{'':<25} ebből a vízjelnél korábbi (késve érkezett) sor: {result['late_rows']:,}")
@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+
+# Ha a kulcsok tartománya legfeljebb ennyiszer nagyobb a kulcsok számánál, a kulcs ->
+# pozíció keresés közvetlen címzésű tömbbel történik (O(1)), egyébként bináris kereséssel
+DENSE_KEY_FACTOR = 4
+
+
+def sorted_unique(values):
+    """Rendezett egyedi egész értékek (rendezéssel; a hash alapú np.unique itt lassabb)."""
+    values = np.sort(np.asarray(values, dtype=np.int64))
+    if len(values) == 0:
+        return values
+    return values[np.concatenate(([True], values[1:] != values[:-1]))]
+
+
+class KeyLookup:
+    """
+    Egész kulcsok -> pozíció leképezése.
+
+    Args:
+        keys (array): Rendezett, egyedi egész kulcsok
+    """
+
+    def __init__(self, keys):
+        self.keys = np.asarray(keys, dtype=np.int64)
+        self._table = None
+        if len(self.keys) > 0:
+            low, high = self.keys[0], self.keys[-1]
+            if high - low + 1 <= DENSE_KEY_FACTOR * len(self.keys) + 1024:
+                self._table = np.full(high - low + 1, -1, dtype=np.int64)
+                self._table[self.keys - low] = np.arange(len(self.keys))
+
+    def positions(self, keys):
+        """A kulcsok pozíciói; az ismeretlen kulcsoké -1."""
+        keys = np.asarray(keys, dtype=np.int64)
+        if len(self.keys) == 0:
+            return np.full(len(keys), -1, dtype=np.int64)
+
+        if self._table is not None:
+            offset = keys - self.keys[0]
+            inside = (offset >= 0) & (offset < len(self._table))
+            result = np.full(len(keys), -1, dtype=np.int64)
+            result[inside] = self._table[offset[inside]]
+            return result
+
+        result = np.searchsorted(self.keys, keys)
+        result[result == len(self.keys)] = 0
+        return np.where(self.keys[result] == keys, result, -1)
+
+
+def _csr(parent_lookup, child_keys):
+    """
+    CSR szerkezet: a gyerek sorok szülő szerinti sorrendje és szülőnkénti kezdőpozíciói.
+
+    Returns:
+        tuple: (sorrend a gyerek táblában, len(szülők) + 1 hosszú eltolás tömb)
+    """
+    parent_positions = parent_lookup.positions(child_keys)
+    # A szülő nélküli gyerek sorok egy szülőből sem érhetők el
+    rows = np.flatnonzero(parent_positions >= 0)
+    order = rows[np.argsort(parent_positions[rows], kind='stable')]
+    counts = np.bincount(parent_positions[rows], minlength=len(parent_lookup.keys))
+    offsets = np.zeros(len(parent_lookup.keys) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return order, offsets
+
+
+def _gather(order, offsets, positions):
+    """A megadott szülő pozíciók összes gyerek sorának pozíciója, szülőnként egymás után."""
+    positions = positions[positions >= 0]
+    starts = offsets[positions]
+    counts = offsets[positions + 1] - starts
+    total = counts.sum()
+    within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return order[np.repeat(starts, counts) + within]
+
+
+class SearchJoinIndex:
+    """
+    Egyszer felépített kapcsolati index a keresések, szobák és gyerekek között.
+
+    A search_log.id -> search_log_room és a search_log_room.id -> search_log_room_child
+    kapcsolatok CSR formában (rendezett sorpozíciók és szülőnkénti eltolások)
+    tárolódnak, így egy kulcs gyerekei O(1) idő alatt, tetszőleges kulcslista
+    gyerekei pedig a találatok számával arányos idő alatt gyűjthetők ki, a teljes
+    táblák szűrése nélkül.
+
+    Args:
+        search_log_room (DataFrame): Szobák (id, search_log_id, ...)
+        search_log_room_child (DataFrame): Gyerekek (search_log_room_id, age, ...)
+        search_ids (array): A keresések azonosítói (alapértelmezés: a szobákban szereplők)
+    """
+
+    def __init__(self, search_log_room, search_log_room_child, search_ids=None):
+        self.search_log_room = search_log_room
+        self.search_log_room_child = search_log_room_child
+
+        room_search_ids = search_log_room['search_log_id'].to_numpy()
+        if search_ids is None:
+            search_ids = room_search_ids
+        self.searches = KeyLookup(sorted_unique(search_ids))
+        self.rooms = KeyLookup(sorted_unique(search_log_room['id'].to_numpy()))
+
+        # A szoba azonosítók egyediek, így a rendezett kulcsok sorrendje egyben a sorok sorrendje
+        room_rows = np.argsort(search_log_room['id'].to_numpy(), kind='stable')
+        self._room_row_of_key = room_rows
+
+        self._room_order, self._room_offsets = _csr(self.searches, room_search_ids)
+        self._child_order, self._child_offsets = _csr(
+            self.rooms, search_log_room_child['search_log_room_id'].to_numpy()
+        )
+
+    @classmethod
+    def from_tables(cls, dataframes):
+        """Index a betöltött táblákból; a keresések köre a search_log azonosítói."""
+        return cls(
+            dataframes['search_log_room'], dataframes['search_log_room_child'],
+            dataframes['search_log']['id'].to_numpy()
+        )
+
+    def room_rows(self, search_ids):
+        """A keresések szobáinak sorpozíciói a search_log_room táblában."""
+        return _gather(self._room_order, self._room_offsets, self.searches.positions(search_ids))
+
+    def child_rows(self, room_ids):
+        """A szobák gyerekeinek sorpozíciói a search_log_room_child táblában."""
+        return _gather(self._child_order, self._child_offsets, self.rooms.positions(room_ids))
+
+    def rooms_for(self, search_ids):
+        """A keresések szobái (a search_log_room sorai), keresésenként egymás után."""
+        return self.search_log_room.iloc[self.room_rows(np.atleast_1d(search_ids))]
+
+    def children_for(self, room_ids):
+        """A szobák gyerekei (a search_log_room_child sorai), szobánként egymás után."""
+        return self.search_log_room_child.iloc[self.child_rows(np.atleast_1d(room_ids))]
+
+    def room_counts(self):
+        """Keresésenként a szobák száma."""
+        return pd.Series(
+            np.diff(self._room_offsets), index=pd.Index(self.searches.keys, name='search_log_id'), name='room_count'
+        )
+
+    def child_stats(self):
+        """
+        Keresésenkénti gyerek statisztikák a szobákon keresztül összesítve.
+
+        Returns:
+            DataFrame: search_log_id indexszel; child_count, min_age, max_age és mean_age
+            oszlopok (gyerek nélküli keresésnél az életkorok hiányoznak)
+        """
+        # Minden gyerek sorhoz a szobáján keresztül a keresés pozíciója
+        child_rows = self._child_order
+        room_positions = np.repeat(np.arange(len(self.rooms.keys)), np.diff(self._child_offsets))
+        room_search_ids = self.search_log_room['search_log_id'].to_numpy()[self._room_row_of_key]
+        search_positions = self.searches.positions(room_search_ids[room_positions])
+
+        known = search_positions >= 0
+        search_positions = search_positions[known]
+        ages = self.search_log_room_child['age'].to_numpy()[child_rows[known]].astype(np.float64)
+
+        order = np.argsort(search_positions, kind='stable')
+        search_positions = search_positions[order]
+        ages = ages[order]
+
+        n_searches = len(self.searches.keys)
+        counts = np.bincount(search_positions, minlength=n_searches)
+        min_age = np.full(n_searches, np.nan)
+        max_age = np.full(n_searches, np.nan)
+        mean_age = np.full(n_searches, np.nan)
+        if len(ages) > 0:
+            has_children = counts > 0
+            starts = np.searchsorted(search_positions, np.flatnonzero(has_children))
+            min_age[has_children] = np.minimum.reduceat(ages, starts)
+            max_age[has_children] = np.maximum.reduceat(ages, starts)
+            mean_age[has_children] = np.add.reduceat(ages, starts) / counts[has_children]
+
+        return pd.DataFrame(
+            {'child_count': counts, 'min_age': min_age, 'max_age': max_age, 'mean_age': mean_age},
+            index=pd.Index(self.searches.keys, name='search_log_id')
+        )
@@ -0,0 +1,332 @@
+"""
+Felhasználói utak (journey) egy menetben, felhasználó és idő szerint rendezett
+keresési adatokon.
+
+A search_log és a search_log_session összekapcsolt sorai (uuid, utc_datetime)
+szerint rendezve darabokban érkeznek; a darabok végén félbemaradt felhasználó
+sorai átkerülnek a következő darabba, így a memóriaigényt a darabméret és a
+legnagyobb felhasználó sorainak száma határozza meg, nem a tábla mérete.
+
+Ha a táblák a növekményes tárból töltődnek, a search_log particionált darabjai
+egy menetben felhasználói vödrökre osztva íródnak ki, és vödrönként olvasódnak
+vissza (iter_bucketed_chunks), így a teljes tábla egyszer sem kerül a memóriába.
+"""
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from hotel_pipeline.cache import write_parquet
+from hotel_pipeline.chunked import concat_partitions, iter_partitions, partition_paths, read_partitioned
+from hotel_pipeline.joinindex import sorted_unique
+
+SEARCH_COLUMNS = ['id', 'search_log_session_id', 'utc_datetime', 'conversion', 'currency', 'lang_code']
+SESSION_COLUMNS = ['id', 'uuid', 'uuid_key']
+
+JOURNEY_COLUMNS = [
+    'uuid_key', 'uuid', 'searches', 'sessions', 'first_search', 'last_search', 'conversions',
+    'first_conversion', 'time_to_first_conversion', 'visits_before_booking', 'currencies', 'languages'
+]
+
+DEFAULT_CHUNKSIZE = 1_000_000
+
+# A particionált search_log ennyi felhasználói vödörben olvasódik be
+DEFAULT_BUCKETS = 8
+
+_NAT = np.iinfo(np.int64).min
+_NEVER = np.iinfo(np.int64).max
+
+
+def user_column(df):
+    """A felhasználó oszlopa: a uuid_key egész kulcs, ha van, egyébként a uuid."""
+    return 'uuid_key' if 'uuid_key' in df.columns else 'uuid'
+
+
+def session_searches(search_log, search_log_session):
+    """
+    A keresések a session felhasználójával (uuid, uuid_key).
+
+    Returns:
+        DataFrame: SEARCH_COLUMNS és a felhasználó oszlopai; a session nélküli
+        keresések kimaradnak
+    """
+    sessions = search_log_session[[col for col in SESSION_COLUMNS if col in search_log_session.columns]]
+    return search_log[SEARCH_COLUMNS].merge(
+        sessions.rename(columns={'id': 'search_log_session_id'}), on='search_log_session_id'
+    )
+
+
+def sort_by_user_time(df):
+    """
+    A sorok felhasználónként összefüggő, azon belül időrendi stabil rendezése.
+
+    A uuid_key egész kulcs esetén a rendezés közvetlenül a kulcsokon fut. Csak
+    uuid esetén ugyanazt a sorrendet adja, mint a sort_values(['uuid',
+    'utc_datetime'], kind='stable'), de a szöveges uuid-okat egyszer kódolja egész
+    számokká. A hiányzó értékek mindkét esetben a végére kerülnek.
+
+    Returns:
+        DataFrame: A rendezett tábla
+    """
+    if user_column(df) == 'uuid_key':
+        user_codes = df['uuid_key'].to_numpy()
+        user_codes = np.where(user_codes < 0, np.iinfo(user_codes.dtype).max, user_codes)
+    else:
+        user_codes, users = pd.factorize(df['uuid'], sort=True)
+        user_codes = np.where(user_codes < 0, len(users), user_codes)
+    times = _times(df)
+    times = np.where(times == _NAT, _NEVER, times)
+    return df.take(np.lexsort((times, user_codes)))
+
+
+def iter_sorted_chunks(df, chunksize=DEFAULT_CHUNKSIZE):
+    """Egy már rendezett tábla darabjai."""
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+
+def iter_bucketed_chunks(search_log_dir, search_log_session, buckets=DEFAULT_BUCKETS, spill_dir=None):
+    """
+    Particionált search_log felhasználó szerint rendezett darabjai, korlátos memóriában.
+
+    A felhasználók a uuid_key maradéka szerint vödrökbe kerülnek. Egyetlen menet
+    olvassa végig a darabokat (csak a szükséges oszlopokkal), és minden darab
+    sorait vödrönként külön Parquet fájlba írja ki; ezután a vödrök egyenként
+    töltődnek be és rendeződnek, így egyszerre a tábla kb. 1/buckets része van a
+    memóriában. A vödrök egymás után, önmagukban rendezve érkeznek.
+
+    Args:
+        search_log_dir (str): A particionált search_log könyvtára
+        search_log_session (DataFrame): Session tábla uuid_key oszloppal
+        buckets (int): A vödrök száma
+        spill_dir (str): Az ideiglenes vödör fájlok helye (alapértelmezés: a tár
+            könyvtára); a fájlok a bejárás végén törlődnek
+
+    Yields:
+        DataFrame: Egy vödör sorai felhasználó és idő szerint rendezve
+    """
+    sessions = search_log_session[SESSION_COLUMNS].rename(columns={'id': 'search_log_session_id'})
+    sessions = sessions[sessions['uuid_key'] >= 0]
+    spill_dir = spill_dir or os.path.dirname(os.path.abspath(search_log_dir))
+    with tempfile.TemporaryDirectory(prefix='journeys-', dir=spill_dir) as tmp_dir:
+        bucket_dirs = [os.path.join(tmp_dir, f'bucket-{bucket:03d}') for bucket in range(buckets)]
+        for bucket_dir in bucket_dirs:
+            os.makedirs(bucket_dir)
+
+        for i, part in enumerate(iter_partitions(search_log_dir, SEARCH_COLUMNS)):
+            part = part.merge(sessions, on='search_log_session_id')
+            part_buckets = part['uuid_key'].to_numpy() % buckets
+            for bucket in np.unique(part_buckets):
+                write_parquet(
+                    part[part_buckets == bucket],
+                    os.path.join(bucket_dirs[bucket], f'part-{i:05d}.parquet')
+                )
+
+        for bucket_dir in bucket_dirs:
+            if partition_paths(bucket_dir):
+                yield sort_by_user_time(read_partitioned(bucket_dir))
+
+
+def _times(df):
+    return df['utc_datetime'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+
+def _user_starts(users):
+    """A felhasználók kezdő sorai egy rendezett tömbben."""
+    new_user = np.ones(len(users), dtype=bool)
+    new_user[1:] = users[1:] != users[:-1]
+    return np.flatnonzero(new_user)
+
+
+def _is_placeholder(value):
+    """A tisztítás a hiányzó kategória értékeket 0-val tölti ki."""
+    return isinstance(value, (int, np.integer)) and value == 0
+
+
+def _value_sets(values, starts, group_ids):
+    """
+    Felhasználónként a használt értékek rendezett, '|' jellel összefűzött listája.
+
+    Kevés különböző érték (pénznem, nyelv) esetén a halmazok bitmaszkként állnak
+    elő, így felhasználónként nincs Python szintű művelet. A hiányzó értékek és a
+    helyükre került 0 kategória nem számítanak használt értéknek.
+    """
+    codes, uniques = pd.factorize(values)
+    names = np.array([str(value) for value in uniques], dtype=object)
+    valid = codes >= 0
+    valid[valid] = ~np.array([_is_placeholder(value) for value in uniques], dtype=bool)[codes[valid]]
+
+    if len(uniques) <= 62:
+        bits = np.zeros(len(codes), dtype=np.int64)
+        bits[valid] = np.left_shift(1, codes[valid].astype(np.int64))
+        masks = np.bitwise_or.reduceat(bits, starts)
+        labels = {
+            mask: '|'.join(sorted(names[bit] for bit in range(len(names)) if mask >> bit & 1))
+            for mask in np.unique(masks)
+        }
+        return pd.Series(masks).map(labels).to_numpy(dtype=object)
+
+    frame = pd.DataFrame({'group': group_ids[valid], 'value': names[codes[valid]]}).drop_duplicates()
+    labels = frame.sort_values(['group', 'value']).groupby('group')['value'].agg('|'.join)
+    return labels.reindex(np.arange(len(starts)), fill_value='').to_numpy(dtype=object)
+
+
+def summarize_journeys(rows):
+    """
+    Felhasználónkénti összesítés rendezett sorokból; minden felhasználó összes sora
+    ebben a táblában van.
+
+    Args:
+        rows (DataFrame): Felhasználó és utc_datetime szerint rendezett sorok
+
+    Returns:
+        DataFrame: JOURNEY_COLUMNS oszlopok, felhasználónként egy sor
+    """
+    column = user_column(rows)
+    users = rows[column].to_numpy(dtype=object, na_value=None) if column == 'uuid' else rows[column].to_numpy()
+    starts = _user_starts(users)
+    counts = np.diff(np.append(starts, len(rows)))
+    group_ids = np.repeat(np.arange(len(starts)), counts)
+    times = _times(rows)
+    valid_times = times != _NAT
+    converted = (rows['conversion'] == 1).to_numpy()
+
+    # Különböző sessionök: (felhasználó, session) párok rendezéssel
+    pairs = sorted_unique((group_ids.astype(np.int64) << 32) | rows['search_log_session_id'].to_numpy().astype(np.uint32))
+    sessions = np.bincount(pairs >> 32, minlength=len(starts))
+
+    first_search = np.minimum.reduceat(np.where(valid_times, times, _NEVER), starts)
+    last_search = np.maximum.reduceat(times, starts)
+    first_conversion = np.minimum.reduceat(np.where(converted & valid_times, times, _NEVER), starts)
+    conversions = np.add.reduceat(converted.astype(np.int64), starts)
+
+    # Szigorúan az első foglalás előtti látogatások; időpont nélküli foglalásnál 0
+    earlier = valid_times & (times < first_conversion[group_ids])
+    visits = np.add.reduceat(earlier.astype(np.int64), starts)
+
+    visits_before_booking = pd.array(visits, dtype='Int64')
+    visits_before_booking[conversions == 0] = pd.NA
+
+    first_search = pd.to_datetime(np.where(first_search == _NEVER, _NAT, first_search))
+    first_conversion = pd.to_datetime(np.where(first_conversion == _NEVER, _NAT, first_conversion))
+    return pd.DataFrame({
+        'uuid_key': rows['uuid_key'].to_numpy()[starts] if 'uuid_key' in rows.columns else -1,
+        'uuid': rows['uuid'].to_numpy()[starts],
+        'searches': counts,
+        'sessions': sessions,
+        'first_search': first_search,
+        'last_search': pd.to_datetime(last_search),
+        'conversions': conversions,
+        'first_conversion': first_conversion,
+        'time_to_first_conversion': first_conversion - first_search,
+        'visits_before_booking': visits_before_booking,
+        'currencies': _value_sets(rows['currency'].to_numpy(dtype=object), starts, group_ids),
+        'languages': _value_sets(rows['lang_code'].to_numpy(dtype=object), starts, group_ids)
+    }, columns=JOURNEY_COLUMNS)
+
+
+def iter_journeys(chunks):
+    """
+    Felhasználói utak egy menetben rendezett darabokból.
+
+    A darab végén álló felhasználó sorai a következő darabbal együtt dolgozódnak
+    fel, így egy felhasználó mindig egyetlen összesítésbe kerül. A hiányzó
+    felhasználójú sorok kimaradnak.
+
+    Args:
+        chunks (iterable): Felhasználó és utc_datetime szerint rendezett darabok
+            (pl. iter_sorted_chunks vagy iter_bucketed_chunks)
+
+    Yields:
+        DataFrame: A lezárt felhasználók útjai (summarize_journeys)
+
+    Raises:
+        ValueError: Ha egy darab nincs felhasználó szerint rendezve
+    """
+    carry = None
+    for chunk in chunks:
+        column = user_column(chunk)
+        chunk = chunk[chunk[column] >= 0] if column == 'uuid_key' else chunk[chunk[column].notna()]
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        if len(chunk) == 0:
+            continue
+
+        users = chunk[column].to_numpy()
+        starts = _user_starts(users)
+        if len(starts) != len(pd.unique(users)):
+            raise ValueError("A bemenet nincs felhasználó szerint rendezve")
+
+        carry = chunk.iloc[starts[-1]:]
+        if starts[-1] > 0:
+            yield summarize_journeys(chunk.iloc[:starts[-1]])
+
+    if carry is not None and len(carry) > 0:
+        yield summarize_journeys(carry)
+
+
+def build_journeys(chunks):
+    """Az összes felhasználói út egy táblában."""
+    parts = list(iter_journeys(chunks))
+    if not parts:
+        return pd.DataFrame(columns=JOURNEY_COLUMNS)
+    return pd.concat(parts, ignore_index=True)
+
+
+def search_log_store(dataframes):
+    """A particionált search_log könyvtára, ha a táblák növekményes tárból töltődnek; egyébként None."""
+    store_dir = getattr(dataframes, 'store_dir', None)
+    if store_dir is None:
+        return None
+    table_dir = os.path.join(store_dir, 'search_log')
+    return table_dir if partition_paths(table_dir) else None
+
+
+def converted_searches(dataframes):
+    """
+    A konverziós (conversion = 1) keresések a session oszlopaival.
+
+    Particionált tárnál a search_log darabonként szűrődik, így csak a konverziós
+    sorok kerülnek a memóriába.
+
+    Returns:
+        DataFrame: A search_log konverziós sorai (id_search) és a session oszlopai
+        (id_session), search_log sorrendben; a session nélküli keresések kimaradnak
+    """
+    search_log_dir = search_log_store(dataframes)
+    if search_log_dir is None:
+        search_log = dataframes['search_log']
+        conversions = search_log[search_log['conversion'] == 1]
+    else:
+        conversions = concat_partitions([
+            part[part['conversion'] == 1] for part in iter_partitions(search_log_dir)
+        ])
+    return conversions.merge(
+        dataframes['search_log_session'],
+        left_on='search_log_session_id',
+        right_on='id',
+        suffixes=('_search', '_session')
+    )
+
+
+def user_journeys(dataframes, chunksize=DEFAULT_CHUNKSIZE, buckets=DEFAULT_BUCKETS):
+    """
+    A betöltött táblák felhasználói útjai.
+
+    Particionált tárnál a search_log vödrönként olvasódik be (iter_bucketed_chunks),
+    egyébként a betöltött táblák összekapcsolt, rendezett sorai darabolódnak.
+
+    Args:
+        dataframes (Mapping): A tisztított táblák
+        chunksize (int): Egy feldolgozott darab sorainak száma
+        buckets (int): Particionált tárnál a felhasználói vödrök száma
+
+    Returns:
+        DataFrame: Felhasználónként egy sor (JOURNEY_COLUMNS)
+    """
+    search_log_dir = search_log_store(dataframes)
+    if search_log_dir is not None:
+        return build_journeys(iter_bucketed_chunks(search_log_dir, dataframes['search_log_session'], buckets))
+    rows = sort_by_user_time(session_searches(dataframes['search_log'], dataframes['search_log_session']))
+    return build_journeys(iter_sorted_chunks(rows, chunksize))
@@ -0,0 +1,299 @@
+import os
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from hotel_pipeline.cache import cache_key, read_cached, write_cached
+from hotel_pipeline.facts import facts_cache_key, load_booking_facts
+from hotel_pipeline.chunked import read_partitioned
+from hotel_pipeline.funnel import build_funnel_cube
+from hotel_pipeline.fx import fx_factors, load_fx_rates, normalize_table
+from hotel_pipeline.incremental import INCREMENTAL_TABLES
+from hotel_pipeline.joinindex import SearchJoinIndex
+from hotel_pipeline.rollups import ROLLUPS, refresh_rollup, rollup_key
+from hotel_pipeline.schema import TABLE_SCHEMAS, read_csv_kwargs, finalize_table
+from hotel_pipeline.timerollups import TimeRollups
+from hotel_pipeline.uuids import add_uuid_key
+
+# A legnagyobb táblák kerülnek először a poolba, a kisebbek ezek árnyékában töltődnek
+LARGE_TABLES = ['search_log_room_offer', 'search_log']
+
+
+def _read_table(input_dir, hotel_id, table, encoding=None, cache_dir=None, content_hash=False, columns=None,
+                store_dir=None):
+    """A tisztított tábla a tárból, a gyorsítótárból vagy a nyers CSV-ből."""
+    path = f'{input_dir}/{table}_hotel_{hotel_id}.csv'
+
+    if store_dir is not None and table in INCREMENTAL_TABLES:
+        return read_partitioned(os.path.join(store_dir, table), columns)
+
+    if cache_dir is not None:
+        key = cache_key(path, table, encoding, content_hash)
+        df = read_cached(cache_dir, table, key, columns)
+        if df is not None:
+            return df
+
+    df = pd.read_csv(path, encoding=encoding, **read_csv_kwargs(table, columns))
+    df = finalize_table(df, table, columns)
+
+    # Csak a teljes táblák kerülnek a gyorsítótárba
+    if cache_dir is not None and columns is None:
+        try:
+            write_cached(cache_dir, table, key, df)
+        except OSError as e:
+            print(f"Figyelmeztetés: a(z) {table} tábla nem menthető a gyorsítótárba: {str(e)}")
+
+    return df
+
+
+def load_table(input_dir, hotel_id, table, encoding=None, cache_dir=None, content_hash=False, columns=None,
+               store_dir=None):
+    """
+    Egy tábla beolvasása és tisztítása a séma alapján.
+
+    A search_log_session tábla uuid_key oszlopot is kap: a uuid sűrű int32 kulcsa a
+    cache_dir-ben tárolt, csak bővülő szótár alapján (uuids.encode_uuids).
+
+    Args:
+        input_dir (str): Bemeneti könyvtár elérési útja
+        hotel_id (int): A hotel azonosítója (a fájlnevek utótagja)
+        table (str): A tábla neve
+        encoding (str): Karakterkódolás, ha eltér az alapértelmezettől
+        cache_dir (str): Ha meg van adva, a tisztított tábla innen töltődik
+            (ha a nyers fájl nem változott), illetve ide mentődik
+        content_hash (bool): A gyorsítótár kulcsa a fájl tartalmának hash-ét is tartalmazza
+        columns (list): Ha meg van adva, csak ezek az oszlopok töltődnek be; a többi
+            oszlop nem kerül feldolgozásra
+        store_dir (str): A növekményesen frissített tár könyvtára; a hozzáfűzéssel
+            bővülő táblák innen töltődnek a nyers CSV helyett
+
+    Returns:
+        tuple: (tisztított DataFrame, betöltési idő másodpercben)
+    """
+    start = time.perf_counter()
+
+    # A uuid_key nem nyers oszlop, a uuid oszlopból áll elő a szótár alapján
+    read_columns = columns
+    if table == 'search_log_session' and columns is not None and 'uuid_key' in columns:
+        read_columns = [col for col in columns if col != 'uuid_key']
+        if 'uuid' not in read_columns:
+            read_columns.append('uuid')
+
+    df = _read_table(input_dir, hotel_id, table, encoding, cache_dir, content_hash, read_columns, store_dir)
+
+    if table == 'search_log_session' and 'uuid' in df.columns:
+        add_uuid_key(df, cache_dir)
+        if columns is not None:
+            df = df[list(columns)]
+
+    return df, time.perf_counter() - start
+
+
+def load_tables(input_dir, hotel_id, encodings=None, max_workers=None, cache_dir=None, content_hash=False,
+                columns=None, store_dir=None):
+    """
+    Beolvassa és tisztítja a hotel összes tábláját.
+
+    Args:
+        input_dir (str): Bemeneti könyvtár elérési útja
+        hotel_id (int): A hotel azonosítója (a fájlnevek utótagja)
+        encodings (dict): Táblánkénti karakterkódolás, ha eltér az alapértelmezettől
+        max_workers (int): Párhuzamos betöltő szálak száma; None esetén egymás után tölt
+        cache_dir (str): A tisztított táblák gyorsítótár könyvtára (None: nincs gyorsítótár)
+        content_hash (bool): A gyorsítótár kulcsa a fájlok tartalmának hash-ét is tartalmazza
+        columns (dict): Táblánként a betöltendő oszlopok listája; a nem szereplő táblák teljesen töltődnek
+        store_dir (str): A növekményesen frissített tár könyvtára (None: minden tábla a CSV-ből)
+
+    Returns:
+        tuple: (táblanév -> tisztított DataFrame, táblanév -> betöltési idő másodpercben)
+    """
+    encodings = encodings or {}
+    columns = columns or {}
+    order = LARGE_TABLES + [t for t in TABLE_SCHEMAS if t not in LARGE_TABLES]
+
+    if max_workers is None:
+        results = {
+            table: load_table(
+                input_dir, hotel_id, table, encodings.get(table), cache_dir, content_hash, columns.get(table),
+                store_dir
+            )
+            for table in order
+        }
+    else:
+        # A pandas C parsere elengedi a GIL-t, így a szálas beolvasás valóban párhuzamos
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                table: executor.submit(
+                    load_table, input_dir, hotel_id, table, encodings.get(table), cache_dir, content_hash,
+                    columns.get(table), store_dir
+                )
+                for table in order
+            }
+            results = {table: future.result() for table, future in futures.items()}
+
+    frames = {table: results[table][0] for table in TABLE_SCHEMAS}
+    timings = {table: results[table][1] for table in TABLE_SCHEMAS}
+    return frames, timings
+
+
+class LazyTables(Mapping):
+    """
+    A load_tables lusta változata: egy tábla csak az első hozzáféréskor töltődik
+    be és tisztítódik, utána a memóriában marad.
+
+    Args:
+        input_dir (str): Bemeneti könyvtár elérési útja
+        hotel_id (int): A hotel azonosítója (a fájlnevek utótagja)
+        encodings (dict): Táblánkénti karakterkódolás, ha eltér az alapértelmezettől
+        cache_dir (str): A tisztított táblák gyorsítótár könyvtára (None: nincs gyorsítótár)
+        content_hash (bool): A gyorsítótár kulcsa a fájlok tartalmának hash-ét is tartalmazza
+        columns (dict): Táblánként a szükséges oszlopok; a többi oszlop be sem olvasódik
+        store_dir (str): A növekményesen frissített tár könyvtára (None: minden tábla a CSV-ből)
+    """
+
+    def __init__(self, input_dir, hotel_id, encodings=None, cache_dir=None, content_hash=False, columns=None,
+                 store_dir=None):
+        self.input_dir = input_dir
+        self.hotel_id = hotel_id
+        self.encodings = encodings or {}
+        self.cache_dir = cache_dir
+        self.content_hash = content_hash
+        self.columns = columns or {}
+        self.store_dir = store_dir
+        self.timings = {}
+        self._frames = {}
+        self._locks = {table: threading.Lock() for table in TABLE_SCHEMAS}
+        self._join_index = None
+        self._join_index_lock = threading.Lock()
+        self._booking_facts = None
+        self._booking_facts_lock = threading.Lock()
+        self._funnel_cubes = {}
+        self._funnel_cube_lock = threading.Lock()
+        self._rollups = {}
+        self._rollup_lock = threading.Lock()
+        self._time_rollups = None
+        self._fx_factors = None
+        self._normalized = {}
+        self._fx_lock = threading.Lock()
+
+    def __getitem__(self, table):
+        if table not in TABLE_SCHEMAS:
+            raise KeyError(table)
+        with self._locks[table]:
+            if table not in self._frames:
+                df, seconds = load_table(
+                    self.input_dir, self.hotel_id, table, self.encodings.get(table),
+                    self.cache_dir, self.content_hash, self.columns.get(table), self.store_dir
+                )
+                self._frames[table] = df
+                self.timings[table] = seconds
+        return self._frames[table]
+
+    def __iter__(self):
+        return iter(TABLE_SCHEMAS)
+
+    def __len__(self):
+        return len(TABLE_SCHEMAS)
+
+    def loaded_tables(self):
+        """A már betöltött táblák nevei."""
+        return list(self._frames)
+
+    def join_index(self):
+        """A keresés -> szoba -> gyerek kapcsolati index; az első híváskor épül fel."""
+        with self._join_index_lock:
+            if self._join_index is None:
+                self._join_index = SearchJoinIndex.from_tables(self)
+        return self._join_index
+
+    def booking_facts(self):
+        """
+        A foglalási ténytábla; változatlan forrás táblák esetén a gyorsítótárból
+        töltődik, a forrás táblák betöltése nélkül.
+        """
+        with self._booking_facts_lock:
+            if self._booking_facts is None:
+                key = None
+                if self.cache_dir is not None:
+                    key = facts_cache_key(self.input_dir, self.hotel_id, self.encodings, self.content_hash)
+                self._booking_facts = load_booking_facts(self, self.cache_dir, key)
+        return self._booking_facts
+
+    def funnel_cube(self, dimensions=()):
+        """A funnel kocka a megadott dimenziókra; dimenziónként egyszer számolódik."""
+        dimensions = tuple(dimensions)
+        with self._funnel_cube_lock:
+            if dimensions not in self._funnel_cubes:
+                self._funnel_cubes[dimensions] = build_funnel_cube(self, dimensions)
+        return self._funnel_cubes[dimensions]
+
+    def _load_columns(self, table, columns):
+        """Egy tábla megadott oszlopai, a leképezés oszlopszűrésétől függetlenül."""
+        df = self._frames.get(table)
+        if df is not None and all(col in df.columns for col in columns):
+            return df[columns]
+        return load_table(
+            self.input_dir, self.hotel_id, table, self.encodings.get(table), self.cache_dir,
+            self.content_hash, columns, self.store_dir
+        )[0]
+
+    def refresh_rollups(self, names=None):
+        """
+        A napi rollup táblák frissítése (a gyorsítótár rollups alkönyvtárában).
+
+        Returns:
+            dict: rollup név -> a frissítés módja és az újraszámolt napok száma
+        """
+        rollup_dir = os.path.join(self.cache_dir, 'rollups') if self.cache_dir is not None else None
+        results = {}
+        with self._rollup_lock:
+            for name in (names or ROLLUPS):
+                key = rollup_key(self.input_dir, self.hotel_id, name, self.encodings, self.content_hash)
+                self._rollups[name], results[name] = refresh_rollup(
+                    name, self._load_columns, rollup_dir, key, self.store_dir
+                )
+            self._time_rollups = None
+        return results
+
+    def rollup(self, name):
+        """Egy napi rollup tábla; az első híváskor frissül."""
+        if name not in self._rollups:
+            self.refresh_rollups([name])
+        return self._rollups[name]
+
+    def time_rollups(self):
+        """A napi rollupokból képzett heti, havi és ISO éves összesítések."""
+        if self._time_rollups is None:
+            self._time_rollups = TimeRollups.from_tables(self)
+        return self._time_rollups
+
+    def fx_factors(self):
+        """A riport pénznemére váltás napi szorzói; None, ha nincs árfolyam fájl."""
+        with self._fx_lock:
+            if self._fx_factors is None:
+                rates = load_fx_rates()
+                self._fx_factors = fx_factors(rates) if rates is not None else False
+        return self._fx_factors if self._fx_factors is not False else None
+
+    def normalized(self, table):
+        """A tábla a riport pénznemére átszámolt oszlopokkal; táblánként egyszer számolódik."""
+        factors = self.fx_factors()
+        if factors is None:
+            return None
+        with self._fx_lock:
+            if table not in self._normalized:
+                self._normalized[table] = normalize_table(self, table, factors)
+        return self._normalized[table]
+
+
+def print_load_report(timings, wall_time):
+    """Táblánkénti betöltési idők kiírása."""
+    print("\nBetöltési idők táblánként:")
+    print("-" * 50)
+    for table, seconds in sorted(timings.items(), key=lambda item: item[1], reverse=True):
+        print(f"{table:<30} {seconds:8.2f} s")
+    print(f"{'Teljes falióra idő':<30} {wall_time:8.2f} s")
+    print(f"{'Táblák összesített ideje':<30} {sum(timings.values()):8.2f} s")
@@ -0,0 +1,60 @@
+"""
+Pénzösszegek pontos, egész számos tárolása.
+
+A booking_data és upsell_data összegei int64 váltópénz egységben (fillér, cent)
+tárolódnak, így az összeadásuk és különbségük pontos: nincs float32 kerekítési
+hiba, amely eltérésnek látszana. A két tábla sorai nem hordoznak pénznemet,
+ezért a lépték minden pénznemre egységesen MINOR_UNITS; az adatok HUF összegei
+is tartalmaznak tizedes (fél) értékeket, így ez a HUF-ra is szükséges.
+"""
+import numpy as np
+import pandas as pd
+
+# Egy pénzegység váltópénz egységei (HUF: fillér, EUR: cent)
+MINOR_UNITS = 100
+
+
+def to_minor(values):
+    """
+    Összegek váltópénz egységben, int64 típussal (a legközelebbi egészre kerekítve).
+
+    Args:
+        values (Series vagy array): Pénzegységben megadott összegek
+
+    Returns:
+        Series vagy ndarray: A bemenettel azonos alakú int64 értékek
+    """
+    minor = np.rint(np.asarray(values, dtype='float64') * MINOR_UNITS).astype(np.int64)
+    if isinstance(values, pd.Series):
+        return pd.Series(minor, index=values.index, name=values.name)
+    return minor
+
+
+def to_major(values):
+    """Váltópénz egységben tárolt összegek pénzegységben (float64), megjelenítéshez."""
+    if isinstance(values, (pd.Series, pd.DataFrame)):
+        return values.astype('float64') / MINOR_UNITS
+    return np.asarray(values, dtype='float64') / MINOR_UNITS
+
+
+def money_sum(values):
+    """Egy összeg oszlop pontos (egész) összege pénzegységben."""
+    return int(np.asarray(values, dtype=np.int64).sum()) / MINOR_UNITS
+
+
+def money_group_sum(df, by, columns):
+    """
+    Összeg oszlopok csoportonkénti összege pénzegységben.
+
+    Az összeadás az int64 értékeken történik, így pontos; a pénzegységre váltás
+    csak a csoportok összegein fut le.
+
+    Args:
+        df (DataFrame): A tábla
+        by (str vagy list): A csoportosító oszlop(ok)
+        columns (str vagy list): Váltópénz egységben tárolt összeg oszlop(ok)
+
+    Returns:
+        Series vagy DataFrame: A groupby(...).sum() eredménye pénzegységben
+    """
+    return to_major(df.groupby(by, observed=True)[columns].sum())
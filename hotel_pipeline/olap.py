@@ -0,0 +1,289 @@
+"""
+Hotelek közötti OLAP kocka a funnel, bevétel és költés mérőszámaira.
+
+Az összes hotel tisztított tábláiból egy sűrű numpy tömb épül a hotel x nap x
+pénznem x utm forrás x vendég kategória dimenziókkal. A szeletelés tömb
+indexelés, az összesítés tengelyek menti összeadás, így egy portfólió szintű
+összevetés nem igényli az elemzések hotelenkénti újrafuttatását.
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+from hotel_pipeline.cleaner import optimize_dataframes
+from hotel_pipeline.config import HOTEL_IDS
+from hotel_pipeline.guests import GUEST_CATEGORIES, categorize_bookings
+from hotel_pipeline.joinindex import SearchJoinIndex
+from hotel_pipeline.money import to_major
+
+DIMENSIONS = ['hotel_id', 'date', 'currency', 'utm_source', 'guest_category']
+MEASURES = ['searches', 'bookings', 'revenue', 'upsell_revenue', 'ppc_spend']
+
+# Darabszám jellegű mérőszámok; ezek egész tömbként tárolódnak
+COUNT_MEASURES = ['searches', 'bookings']
+
+# Összeg mérőszámok; váltópénz egységben, egész tömbként tárolódnak, így az
+# összeadásuk pontos, és csak az összesítés eredménye váltódik pénzegységre
+MONEY_MEASURES = ['revenue', 'upsell_revenue']
+
+# A PPC költések platformjai és az utm források, amelyekhez a költésük tartozik. A
+# Meta költése a facebook és instagram források között a napi keresések arányában
+# oszlik meg (keresés nélküli napon egyenlően), így a forrás tengely a költésre is
+# ugyanazokat a címkéket használja, mint a keresésekre.
+PPC_SOURCES = {
+    'daily_google_spend': ['google'],
+    'daily_microsoft_spend': ['bing'],
+    'daily_meta_spend': ['facebook', 'instagram']
+}
+
+# Csak ezekre a táblákra és oszlopokra van szükség
+COLUMNS = {
+    'search_log': ['id', 'search_log_session_id', 'utc_datetime', 'currency', 'adults', 'children', 'conversion',
+                   'total_price_final'],
+    'search_log_session': ['id', 'utm_source'],
+    'search_log_room': ['id', 'search_log_id'],
+    'search_log_room_child': ['search_log_room_id', 'age'],
+    'booking_data': ['search_log_id', 'upsell_total_price'],
+    'daily_ppc_budget': ['date'] + list(PPC_SOURCES)
+}
+
+
+def _labels(values):
+    """Szöveges címkék; a tisztításkor 0-val kitöltött kategória hiányzó értéknek számít."""
+    values = pd.Series(values, dtype=object)
+    return values.where(values.map(lambda value: isinstance(value, str)), None)
+
+
+def hotel_rows(dataframes, hotel_id):
+    """
+    Egy hotel mérőszámai a kocka dimenziói szerint összesítve.
+
+    A keresések, foglalások (conversion = 1), bevételük és a booking_data
+    upsell összegei keresésenként állnak elő, a vendég kategória a
+    keresések felnőtt/gyerek adataiból. Az összegek váltópénz egységben
+    maradnak (MONEY_MEASURES). A PPC költés csak naphoz és
+    platformhoz (utm forrás) köthető, pénznem és vendég kategória nélkül.
+
+    Returns:
+        DataFrame: DIMENSIONS és MEASURES oszlopok
+    """
+    search_log = dataframes['search_log']
+    join_index = dataframes.join_index() if hasattr(dataframes, 'join_index') else None
+    if join_index is None:
+        join_index = SearchJoinIndex.from_tables(dataframes)
+
+    sessions = dataframes['search_log_session'].set_index('id')['utm_source']
+    upsell = dataframes['booking_data'].groupby('search_log_id')['upsell_total_price'].sum()
+    converted = (search_log['conversion'] == 1).to_numpy()
+
+    searches = pd.DataFrame({
+        'date': search_log['utc_datetime'].dt.normalize().to_numpy(),
+        'currency': _labels(search_log['currency'].to_numpy()).to_numpy(),
+        'utm_source': _labels(sessions.reindex(search_log['search_log_session_id'].to_numpy()).to_numpy()).to_numpy(),
+        'guest_category': categorize_bookings(
+            search_log, dataframes['search_log_room'], dataframes['search_log_room_child'], id_column='id',
+            min_child_age=join_index.child_stats()['min_age'].dropna()
+        ).to_numpy(),
+        'searches': 1,
+        'bookings': converted.astype('int64'),
+        'revenue': search_log['total_price_final'].to_numpy() * converted,
+        'upsell_revenue': search_log['id'].map(upsell).fillna(0).astype('int64').to_numpy()
+    })
+
+    rows = pd.concat([searches, ppc_spend_rows(dataframes['daily_ppc_budget'], searches)], ignore_index=True)
+    rows[MEASURES] = rows[MEASURES].fillna(0).astype({measure: 'int64' for measure in COUNT_MEASURES + MONEY_MEASURES})
+    rows = rows.groupby(DIMENSIONS[1:], dropna=False, sort=False)[MEASURES].sum().reset_index()
+    rows.insert(0, 'hotel_id', hotel_id)
+    return rows
+
+
+def ppc_spend_rows(ppc, searches):
+    """
+    A napi PPC költések (nap, utm forrás) soronként; a több forráshoz tartozó
+    platform költése a források aznapi kereséseinek arányában oszlik meg.
+
+    Args:
+        ppc (DataFrame): A daily_ppc_budget tábla
+        searches (DataFrame): Keresések date és utm_source oszloppal
+
+    Returns:
+        DataFrame: date, utm_source és ppc_spend oszlopok
+    """
+    daily_searches = searches.groupby(['date', 'utm_source']).size()
+    dates = ppc['date'].to_numpy()
+    frames = []
+    for column, sources in PPC_SOURCES.items():
+        weights = np.column_stack([
+            daily_searches.reindex(pd.MultiIndex.from_arrays([dates, [source] * len(dates)]), fill_value=0).to_numpy()
+            for source in sources
+        ]).astype('float64')
+        totals = weights.sum(axis=1, keepdims=True)
+        weights = np.where(totals > 0, weights / np.where(totals > 0, totals, 1), 1 / len(sources))
+        amounts = ppc[column].to_numpy().astype('float64')
+        frames.extend(
+            pd.DataFrame({'date': dates, 'utm_source': source, 'ppc_spend': amounts * weights[:, i]})
+            for i, source in enumerate(sources)
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+class OlapCube:
+    """
+    Sűrű mérőszám tömbök a DIMENSIONS tengelyeken.
+
+    Minden dimenzió címkéi egy Index-ben vannak (a hiányzó érték a None címke),
+    a mérőszámok tömbjeinek tengelyei ugyanebben a sorrendben követik egymást.
+
+    Args:
+        labels (dict): dimenzió -> Index a tengely címkéivel
+        values (dict): mérőszám -> ndarray a tengelyek szerinti alakkal
+    """
+
+    def __init__(self, labels, values):
+        self.labels = labels
+        self.values = values
+        self.dimensions = list(labels)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Kocka a dimenzió és mérőszám oszlopokat tartalmazó sorokból."""
+        labels, codes = {}, []
+        for dim in DIMENSIONS:
+            values = rows[dim]
+            if dim == 'hotel_id':
+                uniques = pd.Index(sorted(values.unique()))
+            elif dim == 'date':
+                uniques = pd.DatetimeIndex(sorted(values.dropna().unique())).append(pd.DatetimeIndex([pd.NaT]))
+            elif dim == 'guest_category':
+                uniques = pd.Index(GUEST_CATEGORIES + [None], dtype=object)
+            else:
+                uniques = pd.Index(sorted(values.dropna().unique()) + [None], dtype=object)
+            dim_codes = uniques.get_indexer(values)
+            # A hiányzó érték a tengely utolsó (None / NaT) címkéje
+            dim_codes[dim_codes < 0] = len(uniques) - 1
+            labels[dim] = uniques
+            codes.append(dim_codes)
+
+        shape = tuple(len(labels[dim]) for dim in DIMENSIONS)
+        flat = np.ravel_multi_index(codes, shape)
+        size = int(np.prod(shape))
+        values = {}
+        for measure in MEASURES:
+            if measure in COUNT_MEASURES + MONEY_MEASURES:
+                summed = np.zeros(size, dtype=np.int64)
+                np.add.at(summed, flat, rows[measure].to_numpy(dtype=np.int64))
+            else:
+                summed = np.bincount(flat, weights=rows[measure].to_numpy(dtype='float64'), minlength=size)
+            values[measure] = summed.reshape(shape)
+        return cls(labels, values)
+
+    def _positions(self, dim, selection):
+        """A kiválasztott címkék pozíciói egy tengelyen (lista, egy érték vagy dátum szelet)."""
+        labels = self.labels[dim]
+        if isinstance(selection, slice):
+            start = 0 if selection.start is None else labels.searchsorted(pd.Timestamp(selection.start), 'left')
+            stop = labels.searchsorted(pd.Timestamp(selection.stop), 'right') if selection.stop is not None else None
+            positions = np.arange(len(labels))[start:stop]
+            return positions[pd.notna(labels[positions])]
+        selection = [selection] if np.ndim(selection) == 0 else list(selection)
+        positions = labels.get_indexer(selection)
+        if (positions < 0).any():
+            missing = [value for value, position in zip(selection, positions) if position < 0]
+            raise KeyError(f"Ismeretlen {dim} érték(ek): {missing}")
+        return positions
+
+    def slice(self, **selections):
+        """
+        A kocka egy szelete, pl. slice(hotel_id=[1, 2], currency='HUF',
+        date=slice('2023-01-01', '2023-03-31')).
+
+        Returns:
+            OlapCube: A kiválasztott címkékre szűkített kocka
+        """
+        labels = dict(self.labels)
+        index = []
+        for dim in self.dimensions:
+            if dim in selections:
+                positions = self._positions(dim, selections[dim])
+                labels[dim] = self.labels[dim][positions]
+                index.append(positions)
+            else:
+                index.append(np.arange(len(self.labels[dim])))
+        mesh = np.ix_(*index)
+        return OlapCube(labels, {measure: values[mesh] for measure, values in self.values.items()})
+
+    def rollup(self, dimensions=(), measures=None):
+        """
+        Összesítés a megadott dimenziókra; a többi tengely összeadódik.
+
+        Returns:
+            DataFrame: A megmaradó dimenziók szerinti (Multi)Index, mérőszám
+            oszlopok (az összegek pénzegységben); a csupa nulla sorok nélkül
+        """
+        dimensions = list(dimensions)
+        measures = list(measures or MEASURES)
+        axes = tuple(i for i, dim in enumerate(self.dimensions) if dim not in dimensions)
+        if not dimensions:
+            return pd.DataFrame({measure: [self.total(measure)] for measure in measures})
+
+        # A megmaradó tengelyek a kért sorrendbe kerülnek
+        kept = [dim for dim in self.dimensions if dim in dimensions]
+        order = [kept.index(dim) for dim in dimensions]
+        summed = {measure: self.values[measure].sum(axis=axes).transpose(order) for measure in measures}
+        index = pd.MultiIndex.from_product([self.labels[dim] for dim in dimensions], names=dimensions)
+        frame = pd.DataFrame({measure: values.reshape(-1) for measure, values in summed.items()}, index=index)
+        frame = frame[(frame != 0).any(axis=1)]
+        money = [measure for measure in measures if measure in MONEY_MEASURES]
+        if money:
+            frame[money] = to_major(frame[money])
+        if len(dimensions) == 1:
+            frame.index = frame.index.get_level_values(0)
+        return frame
+
+    def total(self, measure):
+        """Egy mérőszám teljes összege (összeg mérőszámnál pénzegységben)."""
+        total = self.values[measure].sum()
+        return to_major(total).item() if measure in MONEY_MEASURES else total
+
+
+def build_olap_cube(tables_by_hotel):
+    """
+    OLAP kocka több hotel tábláiból.
+
+    Args:
+        tables_by_hotel (dict): hotel azonosító -> a hotel tisztított táblái
+
+    Returns:
+        OlapCube: A kocka
+    """
+    rows = pd.concat(
+        [hotel_rows(dataframes, hotel_id) for hotel_id, dataframes in tables_by_hotel.items()], ignore_index=True
+    )
+    rows['hotel_id'] = rows['hotel_id'].astype('category')
+    return OlapCube.from_rows(rows)
+
+
+def load_portfolio_cube(hotel_ids=None, data_root=None):
+    """A hotelek tábláinak betöltése (csak a szükséges oszlopok) és a kocka felépítése."""
+    return build_olap_cube({
+        hotel_id: optimize_dataframes(hotel_id, data_root, lazy=True, columns=COLUMNS)
+        for hotel_id in (hotel_ids or HOTEL_IDS)
+    })
+
+
+def print_portfolio_summary(cube):
+    """Hotelenkénti és pénznemenkénti összevetés."""
+    print("\nPORTFÓLIÓ ÖSSZESÍTÉS HOTELENKÉNT:")
+    print("-" * 50)
+    by_hotel = cube.rollup(['hotel_id'], ['searches', 'bookings', 'ppc_spend'])
+    by_hotel['conversion_rate'] = by_hotel['bookings'] / by_hotel['searches'] * 100
+    print(by_hotel.round(2).to_string())
+
+    print("\nBEVÉTELEK HOTELENKÉNT ÉS PÉNZNEMENKÉNT:")
+    print("-" * 50)
+    print(cube.rollup(['hotel_id', 'currency'], ['bookings', 'revenue', 'upsell_revenue']).round(2).to_string())
+
+
+if __name__ == "__main__":
+    print_portfolio_summary(load_portfolio_cube([int(arg) for arg in sys.argv[1:]] or None))
@@ -0,0 +1,149 @@
+"""
+A booking_data árösszetevőinek egyeztetése a végső árral.
+
+Foglalásonként a szobaár + upsell - voucher - hűségkedvezmény - beváltott
+hűségpont összeg és a total_price_final különbsége egyetlen kapcsolással
+(a keresés pénzneme és ideje) és tömbműveletekkel áll elő. Az összegek int64
+váltópénz egységben vannak (money.py), így az egyezés pontos összehasonlítás,
+tűréshatár nélkül. A beváltott hűségpontok darabszámként tárolódnak; az összegben
+pontonként egy pénzegységet érnek, ezért itt váltódnak át váltópénz egységre. Az eltérések okát az határozza meg, hogy melyik összetevővel
+egyezik meg az eltérés nagysága.
+"""
+import numpy as np
+import pandas as pd
+
+from hotel_pipeline.money import MINOR_UNITS, to_major, to_minor
+
+# Az eltérések okai a kiértékelés sorrendjében
+MATCH = 'egyezik'
+ROUNDING = 'kerekítés'
+VOUCHER = 'voucher'
+LOYALTY = 'hűségpont'
+UPSELL = 'upsell'
+OTHER = 'egyéb'
+
+CAUSES = [MATCH, ROUNDING, VOUCHER, LOYALTY, UPSELL, OTHER]
+
+# Egy pénzegységnél (váltópénz egységben) kisebb eltérés kerekítésnek számít
+ROUNDING_LIMIT = MINOR_UNITS
+
+# Váltópénz egységben tárolt oszlopok; a kimutatásokban pénzegységben szerepelnek
+MONEY_COLUMNS = ['sum', 'total_price_final', 'diff', 'abs_diff', 'upsell_gap']
+
+EXCEPTION_COLUMNS = [
+    'search_log_id', 'utc_datetime', 'currency', 'sum', 'total_price_final', 'diff', 'abs_diff', 'upsell_gap', 'cause'
+]
+
+
+def _close(values, targets):
+    """Igaz, ahol a cél nem nulla és az érték megegyezik vele."""
+    return (targets != 0) & (values == targets)
+
+
+def reconcile_bookings(booking_data, search_log, upsell_data=None):
+    """
+    Foglalásonkénti egyeztetés: összeg, eltérés és az eltérés oka.
+
+    Args:
+        booking_data (DataFrame): A foglalások árösszetevői
+        search_log (DataFrame): Keresések (id, utc_datetime, currency)
+        upsell_data (DataFrame): Upsell tételek (search_log_id, sum_price); ha meg
+            van adva, a tételek összegének eltérése is okként szerepel
+
+    Returns:
+        DataFrame: A booking_data sorai (eredeti index és sorrend) a sum, diff,
+        abs_diff, upsell_gap (váltópénz egységben), cause, utc_datetime és
+        currency oszlopokkal
+    """
+    reconciled = booking_data.copy()
+    searches = search_log[['id', 'utc_datetime', 'currency']].set_index('id')
+    search_ids = reconciled['search_log_id'].to_numpy()
+    reconciled['utc_datetime'] = searches['utc_datetime'].reindex(search_ids).to_numpy()
+    reconciled['currency'] = searches['currency'].reindex(search_ids).to_numpy()
+
+    rooms = reconciled['rooms_total_price'].to_numpy()
+    upsell = reconciled['upsell_total_price'].to_numpy()
+    vouchers = reconciled['vouchers_total_price'].to_numpy()
+    loyalty = reconciled['loyalty_discount_total'].to_numpy()
+    points = to_minor(reconciled['redeemed_loyalty_points_total'].to_numpy())
+    total = reconciled['total_price_final'].to_numpy()
+
+    components_sum = rooms + upsell - vouchers - loyalty - points
+    diff = components_sum - total
+    abs_diff = np.abs(diff)
+
+    # Az upsell tételek összege és a foglalás upsell összege közti különbség
+    upsell_gap = np.zeros(len(reconciled), dtype=np.int64)
+    if upsell_data is not None:
+        items = upsell_data.groupby('search_log_id')['sum_price'].sum()
+        upsell_gap = upsell - items.reindex(search_ids, fill_value=0).to_numpy()
+
+    cause = np.select(
+        [
+            abs_diff == 0,
+            abs_diff < ROUNDING_LIMIT,
+            _close(abs_diff, vouchers),
+            _close(abs_diff, loyalty) | _close(abs_diff, points) | _close(abs_diff, loyalty + points),
+            _close(abs_diff, upsell) | _close(abs_diff, np.abs(upsell_gap))
+        ],
+        [MATCH, ROUNDING, VOUCHER, LOYALTY, UPSELL],
+        default=OTHER
+    )
+
+    reconciled['sum'] = components_sum
+    reconciled['diff'] = diff
+    reconciled['abs_diff'] = abs_diff
+    reconciled['upsell_gap'] = upsell_gap
+    reconciled['cause'] = pd.Categorical(cause, categories=CAUSES)
+    return reconciled
+
+
+def exceptions(reconciled):
+    """Az eltéréses foglalások táblája pénzegységben, a legnagyobb abszolút eltérés elöl."""
+    table = reconciled.loc[reconciled['cause'] != MATCH, [col for col in EXCEPTION_COLUMNS if col in reconciled]]
+    table = table.sort_values('abs_diff', ascending=False, kind='stable')
+    return table.assign(**{col: to_major(table[col]) for col in MONEY_COLUMNS})
+
+
+def currency_summary(reconciled):
+    """
+    Pénznemenkénti összesítés egy csoportosítással: foglalások, eltérések
+    száma és összege, a legnagyobb eltérés és okonkénti darabszám. Az összegek
+    egészként adódnak össze, és csak a végén váltanak pénzegységre.
+
+    Returns:
+        DataFrame: currency indexű tábla
+    """
+    grouped = reconciled.assign(
+        discrepancy=reconciled['cause'] != MATCH,
+        discrepancy_diff=np.where(reconciled['cause'] != MATCH, reconciled['diff'], 0)
+    ).groupby(['currency', 'cause'], observed=True, dropna=False).agg(
+        bookings=('diff', 'size'),
+        discrepancies=('discrepancy', 'sum'),
+        diff_sum=('discrepancy_diff', 'sum'),
+        abs_diff_sum=('abs_diff', 'sum'),
+        max_abs_diff=('abs_diff', 'max')
+    )
+    summary = grouped.groupby(level='currency', observed=True, dropna=False).agg(
+        {'bookings': 'sum', 'discrepancies': 'sum', 'diff_sum': 'sum', 'abs_diff_sum': 'sum', 'max_abs_diff': 'max'}
+    )
+    money = ['diff_sum', 'abs_diff_sum', 'max_abs_diff']
+    summary[money] = to_major(summary[money])
+    by_cause = grouped['bookings'].unstack('cause', fill_value=0)
+    return summary.join(by_cause.reindex(columns=CAUSES, fill_value=0))
+
+
+def reconcile_hotels(tables_by_hotel):
+    """
+    Több hotel egyeztetése egy táblában (hotel_id oszloppal).
+
+    Args:
+        tables_by_hotel (dict): hotel azonosító -> a hotel tisztított táblái
+    """
+    return pd.concat(
+        {
+            hotel_id: reconcile_bookings(tables['booking_data'], tables['search_log'], tables['upsell_data'])
+            for hotel_id, tables in tables_by_hotel.items()
+        },
+        names=['hotel_id', None]
+    ).reset_index(level='hotel_id')
@@ -0,0 +1,336 @@
+"""
+Eredmény táblák statikus riportja: HTML, JSON és Parquet, Jupyter kernel nélkül.
+
+Az elemzések a táblázataikat nem display() hívással, Stylerként jelenítik meg,
+hanem egy leírást (table_spec) adnak át az emit_table függvénynek. Parancssori
+futáskor a tábla formázott szövegként kiíródik; a runner alatt a táblák
+összegyűlnek (collect_tables), az elemzés folyamata kiírja őket
+(write_tables), a futás végén pedig hotelenként egyetlen report.html és
+report.json áll össze (assemble_report).
+
+A színezés (a Styler background_gradient megfelelője) táblánként egyszer
+számolódik: az oszloponkénti minimum és maximum egy lépésben, a cellák színei
+pedig egy előre kiszámolt színtáblából tömbindexeléssel jönnek. A nagy táblák
+HTML sorai és adatfájljai CHUNK_ROWS soros darabokban íródnak ki, így a
+memóriaigény nem függ a tábla méretétől.
+"""
+import contextlib
+import html
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow nélkül az adatfájlok JSON Lines formátumban íródnak
+    pa = None
+    pq = None
+
+# Ennyi soronként íródnak ki a HTML sorok és az adatfájlok
+CHUNK_ROWS = 10000
+
+# A színezés alapértelmezett színskálája és a színtábla mérete
+DEFAULT_CMAP = 'YlOrRd'
+LUT_SIZE = 256
+
+# Ennél sötétebb (relatív fényesség) háttéren világos a szöveg, mint a Stylernél
+TEXT_COLOR_THRESHOLD = 0.408
+
+TABLE_DIR = 'tables'
+FRAGMENT_SUFFIX = '.tables.html'
+
+REPORT_CSS = """
+body { font-family: Arial, sans-serif; margin: 24px; color: #2c3e50; }
+table { border-collapse: collapse; margin: 16px 0; }
+caption { caption-side: top; font-size: 16px; font-weight: bold; padding: 6px; }
+th { background-color: #f0f0f0; color: black; font-weight: bold; text-align: center; }
+th, td { border: 1px solid gray; padding: 5px; text-align: center; }
+"""
+
+# Az összegyűjtött táblák listája; None, ha a táblák azonnal kiíródnak
+_COLLECTOR = None
+
+
+def table_spec(df, caption=None, formats=None, gradient=None, na_rep=''):
+    """
+    Egy eredmény tábla leírása.
+
+    Args:
+        df (DataFrame): A tábla
+        caption (str): A tábla címe
+        formats (str vagy dict): Formátum minden számoszlopra (pl. '{:.2f}'), vagy
+            oszloponként
+        gradient (str, bool vagy list): Színskála neve (True: DEFAULT_CMAP); list
+            esetén csak ezek az oszlopok színeződnek, DEFAULT_CMAP-pel
+        na_rep (str): A hiányzó értékek szövege
+    """
+    return {'df': df, 'caption': caption, 'formats': formats, 'gradient': gradient, 'na_rep': na_rep}
+
+
+@contextlib.contextmanager
+def collect_tables():
+    """A blokkban kibocsátott táblák összegyűjtése kiírás helyett."""
+    global _COLLECTOR
+    previous, _COLLECTOR = _COLLECTOR, []
+    try:
+        yield _COLLECTOR
+    finally:
+        _COLLECTOR = previous
+
+
+def emit_table(spec):
+    """A tábla átadása: gyűjtés közben a listába kerül, egyébként formázott szövegként kiíródik."""
+    if _COLLECTOR is not None:
+        _COLLECTOR.append(spec)
+        return
+    if spec['caption']:
+        print(spec['caption'])
+    print(format_cells(spec['df'], spec['formats'], spec['na_rep']).to_string())
+
+
+def format_cells(df, formats=None, na_rep=''):
+    """A cellák szövege: a formátum a számoszlopokra vonatkozik, a hiányzó érték na_rep."""
+    columns = []
+    for position, column in enumerate(df.columns):
+        values = df.iloc[:, position]
+        fmt = formats.get(column) if isinstance(formats, dict) else formats
+        missing = values.isna().to_numpy()
+        if fmt is not None and pd.api.types.is_numeric_dtype(values):
+            # Python számokon (tolist) a formázás jóval gyorsabb, mint numpy skalárokon
+            text = list(map(fmt.format, values.fillna(0).tolist()))
+            if missing.any():
+                text = np.where(missing, na_rep, np.array(text, dtype=object))
+        else:
+            text = np.where(missing, na_rep, values.astype(str).to_numpy(dtype=object))
+        columns.append(pd.Series(text, index=df.index, dtype=object))
+    return pd.DataFrame(dict(enumerate(columns)), index=df.index).set_axis(df.columns, axis=1)
+
+
+def _gradient_lut(cmap):
+    """
+    A színskála LUT_SIZE lépéses színtáblája kész style attribútumokként: a
+    háttérszín és a hozzá illő (a fényességtől függő) szövegszín.
+    """
+    import matplotlib
+
+    rgb = matplotlib.colormaps[cmap](np.linspace(0, 1, LUT_SIZE))[:, :3]
+    linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    luminance = linear @ np.array([0.2126, 0.7152, 0.0722])
+    return np.array([
+        ' style="background-color: #%02x%02x%02x; color: %s"' % (*color, '#f1f1f1' if dark else '#000000')
+        for color, dark in zip(np.rint(rgb * 255).astype(int), luminance < TEXT_COLOR_THRESHOLD)
+    ], dtype=object)
+
+
+def _gradient_columns(df, gradient):
+    """A színezendő oszlopok pozíciói és a színskála neve."""
+    if not gradient:
+        return [], None
+    if isinstance(gradient, (list, tuple)):
+        positions = [position for position, column in enumerate(df.columns) if column in gradient]
+        cmap = DEFAULT_CMAP
+    else:
+        positions = list(range(len(df.columns)))
+        cmap = DEFAULT_CMAP if gradient is True else gradient
+    positions = [position for position in positions if pd.api.types.is_numeric_dtype(df.iloc[:, position])]
+    return positions, cmap
+
+
+def gradient_styles(values, low, high, lut):
+    """
+    Cellánkénti style attribútumok oszloponkénti min-max normálással: a
+    normált értékek a színtábla indexei, így a színezés tömbindexelés.
+
+    Args:
+        values (ndarray): 2D float tömb (sorok x színezett oszlopok)
+        low, high (ndarray): Oszloponkénti minimum és maximum a teljes tábla véges értékein
+        lut (ndarray): A _gradient_lut eredménye
+
+    Returns:
+        ndarray: ' style="..."' szövegek; üres a hiányzó és a nem véges értékeknél
+    """
+    span = high - low
+    missing = ~np.isfinite(values)
+    norm = np.divide(values - low, span, out=np.zeros_like(values), where=(span > 0) & ~missing)
+    index = np.rint(np.clip(norm, 0, 1) * (LUT_SIZE - 1)).astype(int)
+    return np.where(missing, '', lut[index])
+
+
+def _escape(values):
+    return [html.escape(str(value)) for value in values]
+
+
+def _header_html(df):
+    """A fejléc sorai: oszlop szintenként egy sor, az egymás melletti azonos feliratok összevonva."""
+    index_names = [name if name is not None else '' for name in df.index.names]
+    levels = df.columns.nlevels
+    rows = []
+    for level in range(levels):
+        labels = df.columns.get_level_values(level) if levels > 1 else df.columns
+        lead = index_names if level == levels - 1 else [''] * len(index_names)
+        cells = [f'<th>{html.escape(str(name))}</th>' for name in lead]
+        start = 0
+        while start < len(labels):
+            end = start + 1
+            if level < levels - 1:
+                while end < len(labels) and df.columns[end][:level + 1] == df.columns[start][:level + 1]:
+                    end += 1
+            span = f' colspan="{end - start}"' if end - start > 1 else ''
+            cells.append(f'<th{span}>{html.escape(str(labels[start]))}</th>')
+            start = end
+        rows.append('<tr>' + ''.join(cells) + '</tr>')
+    return '<thead>\n' + '\n'.join(rows) + '\n</thead>\n'
+
+
+def write_table_html(f, spec):
+    """
+    Egy tábla HTML-je a megnyitott fájlba, CHUNK_ROWS soros darabokban.
+
+    A színezés határai és a színtábla egyszer számolódnak ki a teljes táblára.
+    """
+    df = spec['df']
+    positions, cmap = _gradient_columns(df, spec['gradient'])
+    if positions:
+        # A végtelen értékek (pl. 0 látogatóra jutó konverzió) nem színeződnek
+        gradient_values = df.iloc[:, positions].replace([np.inf, -np.inf], np.nan)
+        low = gradient_values.min().to_numpy(dtype='float64')
+        high = gradient_values.max().to_numpy(dtype='float64')
+        lut = _gradient_lut(cmap)
+
+    f.write('<table>\n')
+    if spec['caption']:
+        f.write(f'<caption>{html.escape(spec["caption"])}</caption>\n')
+    f.write(_header_html(df))
+    f.write('<tbody>\n')
+    for start in range(0, len(df), CHUNK_ROWS):
+        chunk = df.iloc[start:start + CHUNK_ROWS]
+        text = format_cells(chunk, spec['formats'], spec['na_rep'])
+        styles = np.full(chunk.shape, '', dtype=object)
+        if positions:
+            values = chunk.iloc[:, positions].to_numpy(dtype='float64', na_value=np.nan)
+            styles[:, positions] = gradient_styles(values, low, high, lut)
+
+        # Oszloponként a cellák szövege, soronként egyetlen összefűzéssel
+        cells = [
+            [f'<th>{label}</th>' for label in _escape(chunk.index.get_level_values(level))]
+            for level in range(chunk.index.nlevels)
+        ]
+        for position in range(chunk.shape[1]):
+            column_text = text.iloc[:, position].to_numpy(dtype=object)
+            if not pd.api.types.is_numeric_dtype(chunk.iloc[:, position]):
+                column_text = _escape(column_text)
+            cells.append([f'<td{style}>{value}</td>' for style, value in zip(styles[:, position], column_text)])
+        f.write('\n'.join('<tr>' + ''.join(row) + '</tr>' for row in zip(*cells)))
+        f.write('\n')
+    f.write('</tbody>\n</table>\n')
+
+
+def _column_label(column):
+    """Oszlopnév szövegként; a többszintű nevek részei ' / ' jellel összefűzve."""
+    if isinstance(column, tuple):
+        return ' / '.join(str(part) for part in column if str(part))
+    return str(column)
+
+
+def _flat_columns(df):
+    """A tábla adatfájlba írható alakja: az index oszlopként, egyedi szöveges oszlopnevekkel."""
+    flat = df.copy()
+    flat.columns = [_column_label(column) for column in flat.columns]
+    index_names = [name if name is not None else f'index_{level}' for level, name in enumerate(flat.index.names)]
+    flat.index = flat.index.set_names(index_names)
+    flat = flat.reset_index()
+    # Az object és a vegyes kategóriájú (pl. a 0 kitöltést is tartalmazó) oszlopok szövegként
+    for position in range(flat.shape[1]):
+        values = flat.iloc[:, position]
+        if isinstance(values.dtype, pd.CategoricalDtype) and values.cat.categories.dtype == object:
+            values = values.astype(object)
+        if values.dtype == object:
+            flat.isetitem(position, values.astype(str).where(values.notna()))
+    return flat
+
+
+def write_table_data(df, path):
+    """
+    A tábla adatai Parquet fájlba (pyarrow esetén) vagy JSON Lines fájlba, darabonként.
+
+    Args:
+        path (str): A fájl útvonala kiterjesztés nélkül
+
+    Returns:
+        str: A megírt fájl útvonala
+    """
+    flat = _flat_columns(df)
+    if pq is None:
+        path += '.jsonl'
+        with open(path, 'w', encoding='utf-8') as f:
+            for start in range(0, len(flat), CHUNK_ROWS):
+                f.write(flat.iloc[start:start + CHUNK_ROWS].to_json(orient='records', lines=True, force_ascii=False))
+                f.write('\n')
+        return path
+
+    path += '.parquet'
+    schema = pa.Schema.from_pandas(flat, preserve_index=False)
+    with pq.ParquetWriter(path, schema) as writer:
+        for start in range(0, max(len(flat), 1), CHUNK_ROWS):
+            writer.write_table(pa.Table.from_pandas(
+                flat.iloc[start:start + CHUNK_ROWS], schema=schema, preserve_index=False
+            ))
+    return path
+
+
+def write_tables(specs, output_dir, section):
+    """
+    Egy elemzés tábláinak kiírása: HTML részlet (<section>.tables.html) és
+    táblánként egy adatfájl a tables/ alkönyvtárban.
+
+    Returns:
+        list: A táblák leírása a report.json-hoz (caption, file, rows, columns)
+    """
+    if not specs:
+        return []
+    os.makedirs(os.path.join(output_dir, TABLE_DIR), exist_ok=True)
+    entries = []
+    with open(os.path.join(output_dir, section + FRAGMENT_SUFFIX), 'w', encoding='utf-8') as f:
+        for number, spec in enumerate(specs, start=1):
+            write_table_html(f, spec)
+            path = write_table_data(spec['df'], os.path.join(output_dir, TABLE_DIR, f'{section}_{number:02d}'))
+            entries.append({
+                'caption': spec['caption'],
+                'file': os.path.relpath(path, output_dir),
+                'rows': len(spec['df']),
+                'columns': [_column_label(column) for column in spec['df'].columns]
+            })
+    return entries
+
+
+def assemble_report(output_dir, sections, title='Riport'):
+    """
+    A hotel riportjának összeállítása az elemzések HTML részleteiből.
+
+    A részletek átmásolódnak (nem töltődnek be egészben) a report.html-be,
+    majd törlődnek; a report.json a táblák leírását tartalmazza.
+
+    Args:
+        sections (list): (elemzés neve, write_tables eredménye) párok a riport sorrendjében
+    """
+    with open(os.path.join(output_dir, 'report.html'), 'w', encoding='utf-8') as report:
+        report.write('<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n')
+        report.write(f'<title>{html.escape(title)}</title>\n<style>{REPORT_CSS}</style>\n</head>\n<body>\n')
+        report.write(f'<h1>{html.escape(title)}</h1>\n')
+        for section, entries in sections:
+            if not entries:
+                continue
+            report.write(f'<h2 id="{html.escape(section)}">{html.escape(section)}</h2>\n')
+            fragment = os.path.join(output_dir, section + FRAGMENT_SUFFIX)
+            with open(fragment, encoding='utf-8') as f:
+                shutil.copyfileobj(f, report)
+            os.remove(fragment)
+        report.write('</body>\n</html>\n')
+
+    index = {'title': title, 'sections': [{'name': section, 'tables': entries} for section, entries in sections if entries]}
+    with open(os.path.join(output_dir, 'report.json'), 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,333 @@
+"""
+Napi összesítő (rollup) táblák hotelenként.
+
+A keresések, konverziók és bevételek pénznem, nyelv és utm szerint, a foglalások
+és bevételeik pénznem szerint, a weboldal és a dátumválasztó forgalma
+forrásonként, valamint a PPC költések naponként kis Parquet táblákban
+tárolódnak. A hozzáfűzéssel bővülő táblák (növekményes tár) új darabjai csak az
+általuk érintett napokat frissítik; a többi forrás változásakor a rollup a
+teljes (kicsi vagy egyszer beolvasott) táblából épül újra. Az elemzések ezeket
+a táblákat olvassák a nyers naplók helyett.
+"""
+import hashlib
+import json
+import os
+import threading
+
+import pandas as pd
+
+from hotel_pipeline.cache import cache_available, cache_key, read_parquet, write_parquet
+from hotel_pipeline.chunked import partition_paths
+from hotel_pipeline.incremental import INCREMENTAL_TABLES, read_state
+
+try:
+    import fcntl
+except ImportError:  # fcntl nélkül (Windows) csak a folyamaton belüli zár védi a rollupokat
+    fcntl = None
+
+# Növelni kell, ha egy rollup oszlopai vagy számítása változik
+ROLLUP_VERSION = 3
+
+SESSION_COLUMNS = ['id', 'utm_source', 'utm_medium', 'utm_campaign']
+
+PPC_SPEND_COLUMNS = ['daily_google_spend', 'daily_microsoft_spend', 'daily_meta_spend']
+
+_lock = threading.Lock()
+
+
+def _search_rows(search_log, load):
+    """Keresésenként egy sor a napi összesítés dimenzióival és mértékeivel (a bevétel váltópénz egységben)."""
+    sessions = load('search_log_session', SESSION_COLUMNS).set_index('id')
+    session_ids = search_log['search_log_session_id'].to_numpy()
+    converted = (search_log['conversion'] == 1).to_numpy()
+
+    rows = pd.DataFrame({
+        'date': search_log['utc_datetime'].dt.normalize().to_numpy(),
+        'currency': search_log['currency'].to_numpy(),
+        'lang_code': search_log['lang_code'].to_numpy()
+    })
+    for col in SESSION_COLUMNS[1:]:
+        rows[col] = sessions[col].reindex(session_ids).to_numpy()
+    rows['searches'] = 1
+    rows['conversions'] = converted.astype('int64')
+    rows['revenue'] = search_log['total_price_final'].to_numpy() * converted
+    return rows
+
+
+def _booking_rows(booking_data, load):
+    """Foglalási soronként egy sor a keresés napjával és pénznemével (összegek váltópénz egységben)."""
+    searches = load('search_log', ['id', 'utc_datetime', 'currency']).set_index('id')
+    search_ids = booking_data['search_log_id'].to_numpy()
+    return pd.DataFrame({
+        'date': searches['utc_datetime'].reindex(search_ids).dt.normalize().to_numpy(),
+        'currency': searches['currency'].reindex(search_ids).to_numpy(),
+        'booking_records': 1,
+        'booking_revenue': booking_data['total_price_final'].to_numpy(),
+        'upsell_revenue': booking_data['upsell_total_price'].to_numpy()
+    })
+
+
+def _traffic_rows(df, load):
+    return df[['date', 'utm_source_and_medium', 'user_count', 'session_count']].astype(
+        {'user_count': 'int64', 'session_count': 'int64'}
+    )
+
+
+def _spend_rows(df, load):
+    rows = df[['date'] + PPC_SPEND_COLUMNS].astype({col: 'int64' for col in PPC_SPEND_COLUMNS})
+    rows['total_ppc_spend'] = rows[PPC_SPEND_COLUMNS].sum(axis=1)
+    return rows
+
+
+# Rollup neve -> forrás tábla és oszlopai, kiegészítő (lookup) táblák, a kiegészítő
+# táblában nem talált sorokat jelző oszlop, kulcsok és összeadható mértékek
+ROLLUPS = {
+    'searches': {
+        'source': 'search_log',
+        'columns': ['search_log_session_id', 'utc_datetime', 'currency', 'lang_code', 'conversion',
+                    'total_price_final'],
+        'lookups': ['search_log_session'],
+        'unresolved': 'utm_source',
+        'rows': _search_rows,
+        'keys': ['date', 'currency', 'lang_code', 'utm_source', 'utm_medium', 'utm_campaign'],
+        'measures': ['searches', 'conversions', 'revenue']
+    },
+    'bookings': {
+        'source': 'booking_data',
+        'columns': ['search_log_id', 'total_price_final', 'upsell_total_price'],
+        'lookups': ['search_log'],
+        'unresolved': 'currency',
+        'rows': _booking_rows,
+        'keys': ['date', 'currency'],
+        'measures': ['booking_records', 'booking_revenue', 'upsell_revenue']
+    },
+    'website_traffic': {
+        'source': 'website_daily_users',
+        'columns': ['date', 'utm_source_and_medium', 'user_count', 'session_count'],
+        'lookups': [],
+        'unresolved': None,
+        'rows': _traffic_rows,
+        'keys': ['date', 'utm_source_and_medium'],
+        'measures': ['user_count', 'session_count']
+    },
+    'datepicker_traffic': {
+        'source': 'datepicker_daily_visitors',
+        'columns': ['date', 'utm_source_and_medium', 'user_count', 'session_count'],
+        'lookups': [],
+        'unresolved': None,
+        'rows': _traffic_rows,
+        'keys': ['date', 'utm_source_and_medium'],
+        'measures': ['user_count', 'session_count']
+    },
+    'ppc_spend': {
+        'source': 'daily_ppc_budget',
+        'columns': ['date'] + PPC_SPEND_COLUMNS,
+        'lookups': [],
+        'unresolved': None,
+        'rows': _spend_rows,
+        'keys': ['date'],
+        'measures': PPC_SPEND_COLUMNS + ['total_ppc_spend']
+    }
+}
+
+
+def _aggregate(spec, rows):
+    """A sorok napi összesítése; a szöveges kulcsok kategóriaként, dátum szerint rendezve."""
+    keys = spec['keys']
+    rows = rows.astype({col: object for col in keys[1:] if isinstance(rows[col].dtype, pd.CategoricalDtype)})
+    rollup = rows.groupby(keys, dropna=False, sort=False)[spec['measures']].sum().reset_index()
+    rollup = rollup.sort_values('date', kind='stable', ignore_index=True)
+    return rollup.astype({col: 'category' for col in keys[1:]})
+
+
+def build_rollup(name, load):
+    """
+    Egy rollup tábla felépítése a teljes forrás táblából.
+
+    Args:
+        name (str): A rollup neve (ROLLUPS egyike)
+        load (callable): (tábla, oszlopok) -> DataFrame; a tisztított táblák betöltője
+
+    Returns:
+        DataFrame: A kulcs és mérték oszlopok, naponként rendezve
+    """
+    spec = ROLLUPS[name]
+    return _aggregate(spec, spec['rows'](load(spec['source'], spec['columns']), load))
+
+
+def merge_days(name, rollup, update):
+    """
+    Új sorok összesítésének beolvasztása a rollupba.
+
+    Csak az update napjai számolódnak újra (a meglévő és az új értékek összege),
+    a többi nap sorai változatlanul maradnak.
+    """
+    spec = ROLLUPS[name]
+    affected = rollup['date'].isin(update['date'].unique())
+    merged = _aggregate(spec, pd.concat([rollup[affected], update], ignore_index=True))
+    return _aggregate(spec, pd.concat([rollup[~affected], merged], ignore_index=True))
+
+
+def rollup_key(input_dir, hotel_id, name, encodings=None, content_hash=False):
+    """A rollup kulcsa a forrás táblák gyorsítótár kulcsaiból."""
+    encodings = encodings or {}
+    spec = ROLLUPS[name]
+    payload = {
+        'rollup_version': ROLLUP_VERSION,
+        'sources': {
+            table: cache_key(f'{input_dir}/{table}_hotel_{hotel_id}.csv', table, encodings.get(table), content_hash)
+            for table in [spec['source']] + spec['lookups']
+        }
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()[:24]
+
+
+def _store_identity(store_dir, table):
+    """A növekményes tár egy táblájának azonosítója; újratisztításkor megváltozik."""
+    if store_dir is None or table not in INCREMENTAL_TABLES:
+        return None
+    state = read_state(os.path.join(store_dir, table))
+    if state is None:
+        return None
+    return f"{ROLLUP_VERSION}:{state['schema']}:{state['head']}"
+
+
+def _lookup_identities(store_dir, spec):
+    """A kiegészítő táblák tárbeli azonosítói a darabszámukkal együtt."""
+    identities = {}
+    for table in spec['lookups']:
+        store = _store_identity(store_dir, table)
+        if store is not None:
+            store = f'{store}:{len(partition_paths(os.path.join(store_dir, table)))}'
+        identities[table] = store
+    return identities
+
+
+def _unresolved(spec, rollup):
+    """Igaz, ha a rollup tartalmaz a kiegészítő táblában nem talált sorokat."""
+    column = spec['unresolved']
+    return column is not None and bool(rollup[column].isna().any())
+
+
+def _state_path(rollup_dir, name):
+    return os.path.join(rollup_dir, f'{name}.json')
+
+
+def _read_rollup_state(rollup_dir, name):
+    path = _state_path(rollup_dir, name)
+    if not os.path.exists(path) or not os.path.exists(os.path.join(rollup_dir, f'{name}.parquet')):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_rollup_state(rollup_dir, name, state):
+    path = _state_path(rollup_dir, name)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _partition_rollup(name, paths, load):
+    """A növekményes tár megadott darabjainak összesítése."""
+    if not paths:
+        return build_rollup(name, load)
+    spec = ROLLUPS[name]
+
+    # A kiegészítő táblák (pl. session utm adatok) darabonként ugyanazok
+    lookups = {}
+
+    def load_once(table, columns):
+        if table not in lookups:
+            lookups[table] = load(table, columns)
+        return lookups[table]
+
+    parts = [_aggregate(spec, spec['rows'](read_parquet(path, spec['columns']), load_once)) for path in paths]
+    return _aggregate(spec, pd.concat(parts, ignore_index=True))
+
+
+def refresh_rollup(name, load, rollup_dir=None, key=None, store_dir=None):
+    """
+    Egy rollup tábla frissítése és betöltése.
+
+    Ha a forrás tábla a növekményes tárból jön, a legutóbbi frissítés óta
+    keletkezett darabjai összesítődnek, és csak az érintett napok számolódnak
+    újra. Egyéb esetben a forrás táblák kulcsának változásakor a rollup teljesen
+    újraépül, változatlan kulcsnál a tárolt tábla töltődik be.
+
+    Args:
+        name (str): A rollup neve (ROLLUPS egyike)
+        load (callable): (tábla, oszlopok) -> DataFrame; a tisztított táblák betöltője
+        rollup_dir (str): A rollup táblák könyvtára (None: nincs mentés)
+        key (str): A rollup_key által adott kulcs
+        store_dir (str): A növekményes tár könyvtára
+
+    Returns:
+        tuple: (rollup tábla, a frissítés módja és az újraszámolt napok száma)
+    """
+    if rollup_dir is None or not cache_available():
+        rollup = build_rollup(name, load)
+        return rollup, {'mode': 'teljes', 'days': rollup['date'].nunique(dropna=False)}
+
+    spec = ROLLUPS[name]
+    path = os.path.join(rollup_dir, f'{name}.parquet')
+    store = _store_identity(store_dir, spec['source'])
+
+    os.makedirs(rollup_dir, exist_ok=True)
+    with _lock, open(os.path.join(rollup_dir, f'{name}.lock'), 'w') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        state = _read_rollup_state(rollup_dir, name)
+
+        if store is not None:
+            parts = partition_paths(os.path.join(store_dir, spec['source']))
+            lookups = _lookup_identities(store_dir, spec)
+            if state.get('store') == store and state.get('lookups') != lookups:
+                # A kiegészítő táblában korábban hiányzó sorok (pl. később érkezett
+                # session) csak teljes újraépítéssel kerülnek a helyükre
+                if _unresolved(spec, read_parquet(path)):
+                    state = {}
+            if state.get('store') == store:
+                new_parts = parts[state['partitions']:]
+                rollup = read_parquet(path)
+                if not new_parts:
+                    return rollup, {'mode': 'változatlan', 'days': 0}
+                update = _partition_rollup(name, new_parts, load)
+                rollup = merge_days(name, rollup, update)
+                result = {'mode': 'növekményes', 'days': update['date'].nunique(dropna=False)}
+            else:
+                rollup = _partition_rollup(name, parts, load)
+                result = {'mode': 'teljes', 'days': rollup['date'].nunique(dropna=False)}
+            state = {'store': store, 'partitions': len(parts), 'lookups': lookups}
+        else:
+            if key is not None and state.get('key') == key:
+                return read_parquet(path), {'mode': 'változatlan', 'days': 0}
+            rollup = build_rollup(name, load)
+            result = {'mode': 'teljes', 'days': rollup['date'].nunique(dropna=False)}
+            state = {'key': key}
+
+        write_parquet(rollup, path)
+        _write_rollup_state(rollup_dir, name, state)
+    return rollup, result
+
+
+def get_rollup(dataframes, name):
+    """
+    A betöltött táblákhoz tartozó rollup tábla.
+
+    Ha a leképezés maga tudja előállítani (LazyTables), annak tárolt példánya
+    kerül vissza, egyébként a tábla helyben épül fel.
+    """
+    rollup = getattr(dataframes, 'rollup', None)
+    if rollup is not None:
+        return rollup(name)
+    return build_rollup(name, lambda table, columns: dataframes[table][columns])
+
+
+def print_rollup_report(results):
+    """Rollup táblánkénti frissítési eredmények kiírása."""
+    print("\nNapi rollup táblák:")
+    print("-" * 50)
+    for name, result in results.items():
+        print(f"{name:<25} {result['mode']:<12} újraszámolt napok: {result['days']:>6,}")
@@ -0,0 +1,313 @@
+"""
+Az összes hotel összes elemzésének párhuzamos futtatása egy folyamatkészletben.
+
+Parancssorból:
+    python -m hotel_pipeline.runner --hotels 1 2 3 --output-dir eredmenyek
+
+A futás két fázisból áll: először hotelenként egy feladat feltölti a tisztított
+táblák Parquet gyorsítótárát, utána minden (hotel, elemzés) pár külön feladat.
+A munkafolyamatok egyszer importálják az elemző modulokat, és hotelenként
+megtartják a már betöltött táblákat, így a későbbi feladatok nem töltik be újra
+ugyanazokat az adatokat.
+
+Az elemzések ábra leírásai (figures.py) nem az elemzés folyamatában rajzolódnak
+ki: ábránként külön feladatként ugyanabba a készletbe kerülnek, és a
+változatlan adatú ábrák újrafuttatáskor kimaradnak. A még közvetlenül
+matplotlibbel rajzoló elemzések nyitva maradt ábrái továbbra is a futás végén
+mentődnek. Az elemzések eredmény táblái (report.py) az elemzés folyamatában
+íródnak ki, és a futás végén hotelenként egy report.html és report.json
+riportba állnak össze.
+
+Alapértelmezésben a táblák a memóriába töltődnek. A --incremental kapcsolóval az
+első fázis a növekményes tárat is frissíti, és az elemzések a particionált tárból
+dolgoznak; a felhasználói utak (visits_before_booking) csak ekkor épülnek
+korlátos memóriában, vödrönként.
+"""
+import argparse
+import contextlib
+import os
+import time
+import traceback
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from hotel_pipeline.analyses import ANALYSES, get_analysis
+from hotel_pipeline.cleaner import optimize_dataframes
+from hotel_pipeline.config import HOTEL_IDS
+from hotel_pipeline.figures import FORMATS, collect_figures, pending_figures, render_figure, update_manifest
+from hotel_pipeline.report import assemble_report, collect_tables, write_tables
+
+# Munkafolyamatonkénti állapot: a nyers adatok gyökere, a növekményes tár
+# használata és hotelenként a lusta táblák
+_DATA_ROOT = None
+_INCREMENTAL = False
+_HOTEL_TABLES = {}
+
+
+class IsolatedTables(Mapping):
+    """
+    Egy elemzés saját nézete a hotel tábláira.
+
+    Az elemzések helyben is módosítják a kapott DataFrameket (új oszlopok,
+    dátumkonverzió), ezért minden tábla első hozzáféréskor másolatként kerül
+    átadásra; a munkafolyamatban tárolt eredeti táblák változatlanok maradnak.
+    """
+
+    def __init__(self, tables):
+        self._tables = tables
+        self._copies = {}
+        self._booking_facts = None
+        self._funnel_cubes = {}
+        self._normalized = {}
+
+    def __getitem__(self, table):
+        if table not in self._copies:
+            self._copies[table] = self._tables[table].copy()
+        return self._copies[table]
+
+    def __iter__(self):
+        return iter(self._tables)
+
+    def __len__(self):
+        return len(self._tables)
+
+    @property
+    def store_dir(self):
+        """A növekményes tár könyvtára, ha a táblák onnan töltődnek (különben None)."""
+        return getattr(self._tables, 'store_dir', None)
+
+    def join_index(self):
+        """A hotel közös kapcsolati indexe (csak olvasásra használják az elemzések)."""
+        return self._tables.join_index()
+
+    def booking_facts(self):
+        """A hotel ténytáblájának saját másolata."""
+        if self._booking_facts is None:
+            self._booking_facts = self._tables.booking_facts().copy()
+        return self._booking_facts
+
+    def funnel_cube(self, dimensions=()):
+        """A hotel közös funnel kockájának saját másolata."""
+        dimensions = tuple(dimensions)
+        if dimensions not in self._funnel_cubes:
+            self._funnel_cubes[dimensions] = self._tables.funnel_cube(dimensions).copy()
+        return self._funnel_cubes[dimensions]
+
+    def rollup(self, name):
+        """A hotel napi rollup táblájának másolata."""
+        return self._tables.rollup(name).copy()
+
+    def time_rollups(self):
+        """A hotel közös idősoros összesítései (csak olvasásra használják az elemzések)."""
+        return self._tables.time_rollups()
+
+    def fx_factors(self):
+        """A hotel közös árfolyam szorzói (csak olvasásra használják az elemzések)."""
+        return self._tables.fx_factors()
+
+    def normalized(self, table):
+        """A riport pénznemére átszámolt tábla saját másolata; None, ha nincs árfolyam fájl."""
+        if table not in self._normalized:
+            normalized = self._tables.normalized(table)
+            self._normalized[table] = normalized.copy() if normalized is not None else None
+        return self._normalized[table]
+
+
+def _init_worker(data_root, analyses, incremental=False):
+    """Munkafolyamat indítása: grafikus felület nélküli backend, elemzők előzetes importja."""
+    global _DATA_ROOT, _INCREMENTAL
+    import matplotlib
+    matplotlib.use('Agg')
+
+    _DATA_ROOT = data_root
+    _INCREMENTAL = incremental
+    for name in analyses:
+        try:
+            get_analysis(name)
+        except ImportError:
+            # A hiányzó függőség az elemzés futásakor, annak naplójában jelenik meg
+            pass
+
+
+def _hotel_tables(hotel_id):
+    """A hotel lusta táblái; munkafolyamatonként egyszer jönnek létre (a növekményes tárat az első fázis frissíti)."""
+    if hotel_id not in _HOTEL_TABLES:
+        _HOTEL_TABLES[hotel_id] = optimize_dataframes(
+            hotel_id, _DATA_ROOT, lazy=True, incremental=_INCREMENTAL, refresh=False
+        )
+    return _HOTEL_TABLES[hotel_id]
+
+
+def _warm_cache(hotel_id):
+    """A hotel összes táblájának, ténytáblájának és rollup tábláinak betöltése, hogy a Parquet gyorsítótár naprakész legyen."""
+    start = time.perf_counter()
+    dataframes = optimize_dataframes(hotel_id, _DATA_ROOT, incremental=_INCREMENTAL)
+    rows = sum(len(df) for df in dataframes.values())
+    _hotel_tables(hotel_id).booking_facts()
+    _hotel_tables(hotel_id).refresh_rollups()
+    return hotel_id, rows, time.perf_counter() - start
+
+
+def _save_open_figures(output_dir, name):
+    """A futás közben nyitva maradt ábrák mentése és bezárása."""
+    import matplotlib.pyplot as plt
+
+    paths = []
+    for number in plt.get_fignums():
+        path = os.path.join(output_dir, f'{name}_fig{number:02d}.png')
+        plt.figure(number).savefig(path, bbox_inches='tight')
+        paths.append(path)
+    plt.close('all')
+    return paths
+
+
+def _run_analysis(hotel_id, name, output_root, formats=FORMATS):
+    """
+    Egy elemzés futtatása egy hotelre; a kimenet a <output_root>/hotel_<id>/<név>.log fájlba kerül.
+
+    Returns:
+        tuple: (hotel_id, elemzés, másodperc, ábrák száma, hiba, kirajzolandó ábra
+        leírások, változatlan ábrák nevei, a kiírt táblák leírása)
+    """
+    output_dir = os.path.join(output_root, f'hotel_{hotel_id}')
+    os.makedirs(output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    error = None
+    with open(os.path.join(output_dir, f'{name}.log'), 'w', encoding='utf-8') as log:
+        with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log), \
+                collect_figures() as specs, collect_tables() as tables:
+            try:
+                get_analysis(name).run(IsolatedTables(_hotel_tables(hotel_id)), hotel_id, output_dir)
+            except Exception:
+                error = traceback.format_exc()
+                print(error)
+            figures = _save_open_figures(output_dir, name)
+
+        # Az ábrák és táblák kiírásának hibája is csak ezt az elemzést érinti
+        pending, unchanged, report = [], [], []
+        try:
+            pending, unchanged = pending_figures(specs, output_dir, formats)
+            report = write_tables(tables, output_dir, name)
+        except Exception:
+            output_error = traceback.format_exc()
+            log.write(output_error)
+            error = output_error if error is None else error + output_error
+
+    figure_count = len(figures) + len(specs)
+    return hotel_id, name, time.perf_counter() - start, figure_count, error, pending, unchanged, report
+
+
+def run_all(hotel_ids=None, analyses=None, data_root=None, output_root='.', max_workers=None, formats=FORMATS,
+            incremental=False):
+    """
+    Elemzések futtatása több hotelre párhuzamosan.
+
+    Args:
+        hotel_ids (list): A hotelek azonosítói (alapértelmezés: config.HOTEL_IDS)
+        analyses (list): Az elemzések nevei (alapértelmezés: az összes)
+        data_root (str): A nyers adatok gyökérkönyvtára
+        output_root (str): Kimeneti könyvtár; hotelenként hotel_<id> alkönyvtárral
+        max_workers (int): A munkafolyamatok száma (alapértelmezés: a magok száma)
+        formats (tuple): Az ábrák kimeneti formátumai (png, svg)
+        incremental (bool): A növekményes tár frissítése és használata (lásd a modul leírását)
+
+    Returns:
+        list: (hotel_id, elemzés, másodperc, ábrák száma, hiba) elemek
+    """
+    hotel_ids = list(hotel_ids or HOTEL_IDS)
+    analyses = list(analyses or ANALYSES)
+    for name in analyses:
+        if name not in ANALYSES:
+            raise KeyError(f"Ismeretlen elemzés: {name}")
+
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_worker, initargs=(data_root, analyses, incremental)
+    ) as executor:
+        # 1. fázis: gyorsítótár feltöltése hotelenként
+        for future in as_completed([executor.submit(_warm_cache, hotel_id) for hotel_id in hotel_ids]):
+            hotel_id, rows, seconds = future.result()
+            print(f"Hotel {hotel_id}: {rows:,} sor betöltve ({seconds:.2f} s)")
+
+        # 2. fázis: elemzések hotelenként sorban beküldve; a kész elemzések ábrái
+        # külön feladatként kerülnek a készletbe, a többi elemzéssel párhuzamosan
+        futures = [
+            executor.submit(_run_analysis, hotel_id, name, output_root, formats)
+            for hotel_id in hotel_ids
+            for name in analyses
+        ]
+        render_futures = {}
+        unchanged_count = 0
+        reports = {hotel_id: {} for hotel_id in hotel_ids}
+        for future in as_completed(futures):
+            hotel_id, name, seconds, figures, error, pending, unchanged, report = future.result()
+            results.append((hotel_id, name, seconds, figures, error))
+            reports[hotel_id][name] = report
+            status = 'HIBA' if error else 'OK'
+            print(f"Hotel {hotel_id} {name:<25} {status:<4} {seconds:>8.2f} s  ({figures} ábra)")
+
+            output_dir = os.path.join(output_root, f'hotel_{hotel_id}')
+            unchanged_count += len(unchanged)
+            for spec in pending:
+                render_futures[executor.submit(render_figure, spec, output_dir, formats)] = (hotel_id, spec['name'])
+
+        # Az elkészült ábrák kimeneti könyvtáranként egyszer kerülnek a manifestbe
+        rendered = {}
+        for future in as_completed(render_futures):
+            hotel_id, figure_name = render_futures[future]
+            try:
+                rendered.setdefault(hotel_id, []).append(future.result())
+            except Exception as exc:
+                print(f"Hotel {hotel_id} ábra {figure_name}: HIBA ({exc})")
+        for hotel_id, hotel_rendered in rendered.items():
+            update_manifest(os.path.join(output_root, f'hotel_{hotel_id}'), hotel_rendered)
+        print(f"Ábrák: {sum(map(len, rendered.values()))} kirajzolva, {unchanged_count} változatlan")
+
+    # Hotelenként egy riport az elemzések sorrendjében
+    for hotel_id, report in reports.items():
+        assemble_report(
+            os.path.join(output_root, f'hotel_{hotel_id}'),
+            [(name, report[name]) for name in analyses if name in report],
+            f'Hotel {hotel_id}'
+        )
+
+    return results
+
+
+def print_run_report(results, wall_time):
+    """Összesítés a futásról."""
+    failed = [(hotel_id, name) for hotel_id, name, _, _, error in results if error]
+    total = sum(seconds for _, _, seconds, _, _ in results)
+
+    print("\nFutás összesítése")
+    print("-" * 50)
+    print(f"Elemzések száma: {len(results)}")
+    print(f"Sikertelen: {len(failed)}")
+    for hotel_id, name in sorted(failed):
+        print(f"  Hotel {hotel_id}: {name}")
+    print(f"Elemzési idők összege: {total:.2f} s")
+    print(f"Teljes futási idő: {wall_time:.2f} s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Hotel elemzések párhuzamos futtatása')
+    parser.add_argument('--hotels', type=int, nargs='+', default=HOTEL_IDS)
+    parser.add_argument('--analyses', nargs='+', choices=sorted(ANALYSES), default=list(ANALYSES))
+    parser.add_argument('--data-root', default=None)
+    parser.add_argument('--output-dir', default='.')
+    parser.add_argument('--max-workers', type=int, default=None)
+    parser.add_argument('--figure-formats', nargs='+', choices=['png', 'svg'], default=list(FORMATS))
+    parser.add_argument('--incremental', action='store_true',
+                        help='a növekményes tár frissítése és használata (korlátos memóriájú felhasználói utak)')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = run_all(args.hotels, args.analyses, args.data_root, args.output_dir, args.max_workers,
+                      tuple(args.figure_formats), args.incremental)
+    print_run_report(results, time.perf_counter() - start)
+    return 1 if any(result[-1] for result in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,279 @@
+import pandas as pd
+
+from hotel_pipeline.categorical import category_transform
+from hotel_pipeline.money import to_minor
+
+# Táblánkénti séma: elválasztó, oszloptípusok, dátum oszlopok és átnevezések.
+# A típusok közvetlenül a CSV olvasónak adódnak át, így minden oszlop egyszer,
+# már a végleges, tömör típusában jön létre. A 'money' oszlopok float64-ként
+# olvasódnak be, és int64 váltópénz egységben tárolódnak (money.to_minor).
+TABLE_SCHEMAS = {
+    'booking_data': {
+        'delimiter': ';',
+        'dtypes': {
+            'search_log_id': 'int32',
+            'total_price_final': 'float64',
+            'rooms_total_price': 'float64',
+            'upsell_total_price': 'float64',
+            'vouchers_total_price': 'int32',
+            'loyalty_discount_total': 'float64',
+            'redeemed_loyalty_points_total': 'float64'
+        },
+        # A redeemed_loyalty_points_total pontszám, nem összeg: nem skálázódik és nem váltódik át
+        'money': ['total_price_final', 'rooms_total_price', 'upsell_total_price', 'vouchers_total_price',
+                  'loyalty_discount_total']
+    },
+    'daily_occupancy': {
+        'delimiter': ';',
+        'dtypes': {
+            'fill_rate': 'float32'
+        },
+        'dates': ['recording_date', 'subject_date']
+    },
+    'daily_ppc_budget': {
+        'delimiter': ',',
+        'rename': {'Unnamed: 0': 'date'},
+        'dtypes': {
+            'daily_google_spend': 'int32',
+            'daily_microsoft_spend': 'int32',
+            'daily_meta_spend': 'int32'
+        },
+        'dates': ['date']
+    },
+    'datepicker_daily_visitors': {
+        'delimiter': ';',
+        'dtypes': {
+            'utm_source_and_medium': 'category',
+            'utm_campaign': 'category',
+            'user_count': 'int32',
+            'session_count': 'int32'
+        },
+        'dates': ['date'],
+        'utm_split': {'strip': True}
+    },
+    'search_log': {
+        'delimiter': ';',
+        'dtypes': {
+            'id': 'int32',
+            'search_log_session_id': 'int32',
+            'lang_code': 'category',
+            'currency': 'category',
+            'days': 'int32',
+            'nights': 'int32',
+            'adults': 'int32',
+            'children': 'int32',
+            'conversion': 'float32',
+            'total_price_final': 'float64'
+        },
+        'dates': ['utc_datetime', 'arrival', 'departure'],
+        'money': ['total_price_final']
+    },
+    'search_log_room_child': {
+        'delimiter': ';',
+        'dtypes': {
+            'id': 'int32',
+            'search_log_room_id': 'int32',
+            'age': 'int32',
+            'baby_bed': 'int32'
+        }
+    },
+    'search_log_room': {
+        'delimiter': ';',
+        'dtypes': {
+            'id': 'int32',
+            'search_log_id': 'int32',
+            'adults': 'int32',
+            'children': 'int32',
+            'picked_price': 'float32',
+            'picked_room': 'category'
+        }
+    },
+    'search_log_room_offer': {
+        'delimiter': ';',
+        'dtypes': {
+            'id': 'int32',
+            'search_log_id': 'int32',
+            'search_log_room_id': 'int32',
+            'room_code': 'category',
+            'room_price_min': 'float32',
+            'room_price_max': 'float32'
+        }
+    },
+    'search_log_session': {
+        'delimiter': ';',
+        'dtypes': {
+            'id': 'int32',
+            'uuid': 'string',
+            'session_id': 'int32',
+            'utm_source': 'category',
+            'utm_medium': 'category',
+            'utm_campaign': 'category'
+        }
+    },
+    'upsell_data': {
+        'delimiter': ';',
+        'dtypes': {
+            'search_log_id': 'int32',
+            'upsell_type': 'int32',
+            'name': 'category',
+            'unit_price': 'float64',
+            'pieces': 'int32',
+            'sum_price': 'float64'
+        },
+        'money': ['unit_price', 'sum_price']
+    },
+    'website_daily_users': {
+        'delimiter': ';',
+        'dtypes': {
+            'utm_source_and_medium': 'category',
+            'utm_campaign': 'category',
+            'user_count': 'int32',
+            'session_count': 'int32'
+        },
+        'dates': ['date'],
+        'utm_split': {'strip': False}
+    }
+}
+
+
+def raw_columns(table, columns):
+    """
+    A kért (végleges nevű) oszlopok előállításához beolvasandó nyers oszlopok.
+
+    Args:
+        table (str): A tábla neve
+        columns (list): A kért oszlopok a tisztított táblában
+
+    Returns:
+        list: A nyers CSV oszlopnevei, sorrendtartóan és ismétlés nélkül
+    """
+    schema = TABLE_SCHEMAS[table]
+    raw_names = {new: old for old, new in schema.get('rename', {}).items()}
+    result = []
+    for col in columns:
+        if 'utm_split' in schema and col in ['utm_source', 'utm_medium']:
+            col = 'utm_source_and_medium'
+        col = raw_names.get(col, col)
+        if col not in result:
+            result.append(col)
+    return result
+
+
+def read_csv_kwargs(table, columns=None):
+    """
+    A séma alapján összeállítja a pd.read_csv paramétereit.
+
+    Args:
+        table (str): A tábla neve
+        columns (list): Ha meg van adva, csak ezek az oszlopok kerülnek beolvasásra
+
+    Returns:
+        dict: delimiter, dtype, parse_dates és usecols paraméterek a nyers oszlopnevekkel
+    """
+    schema = TABLE_SCHEMAS[table]
+    raw_names = {new: old for old, new in schema.get('rename', {}).items()}
+    usecols = raw_columns(table, columns) if columns is not None else None
+    parse_dates = [raw_names.get(col, col) for col in schema.get('dates', [])]
+    return {
+        'delimiter': schema['delimiter'],
+        'dtype': {raw_names.get(col, col): dtype for col, dtype in schema['dtypes'].items()},
+        'parse_dates': [col for col in parse_dates if usecols is None or col in usecols],
+        'usecols': usecols
+    }
+
+
+def _utm_part(index, strip):
+    """A kategóriák '/' előtti (0) vagy utáni (1) része; ha nincs ilyen rész, 'unknown'."""
+    def transform(values):
+        split_data = values.str.split('/', expand=True, n=1)
+        # Ha csak egy oszlop van, a második rész mindenhol hiányzik
+        part = split_data[index] if index in split_data.columns else pd.Series(None, index=values.index, dtype=object)
+        if strip:
+            part = part.str.strip()
+        return part.fillna('unknown')
+    return transform
+
+
+def split_utm_source_and_medium(df, strip):
+    """
+    Az utm_source_and_medium oszlop szétbontása utm_source és utm_medium oszlopokra.
+
+    A bontás a kategória szótáron fut le, nem soronként; az eredmény ugyanaz.
+    """
+    source_and_medium = df['utm_source_and_medium']
+    if not isinstance(source_and_medium.dtype, pd.CategoricalDtype):
+        source_and_medium = source_and_medium.astype('category')
+
+    split_data = pd.DataFrame({
+        col: category_transform(source_and_medium, _utm_part(index, strip)).rename(col)
+        for index, col in enumerate(['utm_source', 'utm_medium'])
+    })
+    return pd.concat([df, split_data], axis=1)
+
+
+def fill_missing_values(df):
+    """Hiányzó értékek cseréje 0-ra, a kategória oszlopokat is beleértve."""
+    for col in df.select_dtypes(include=['category']).columns:
+        if 0 not in df[col].cat.categories:
+            df[col] = df[col].cat.add_categories([0])
+    df.fillna(0, inplace=True)
+    return df
+
+
+def text_categories(df):
+    """
+    Minden kategória oszlop szöveges (object) kategóriákkal, a hiányzó értékek 0-ja mellett.
+
+    A darabonként írt táblákban egy darab kategóriái nem dönthetik el az oszlop
+    típusát: egy csupa üres vagy csupa szám darab másként nem fűzhető össze a többivel.
+    """
+    for col in df.select_dtypes(include=['category']).columns:
+        categories = df[col].cat.categories
+        if categories.dtype != object:
+            df[col] = df[col].cat.set_categories(pd.Index(list(categories), dtype=object))
+    return df
+
+
+def finalize_table(df, table, columns=None, numeric_categories=True):
+    """
+    A beolvasott táblán elvégzi a séma szerinti utófeldolgozást.
+
+    Args:
+        df (DataFrame): A séma típusaival beolvasott tábla
+        table (str): A tábla neve
+        columns (list): Ha meg van adva, csak ezek az oszlopok maradnak meg
+        numeric_categories (bool): A csak számokat tartalmazó kategóriák számmá alakítása;
+            a darabonként írt tábláknál False, ott minden kategória szöveges marad
+
+    Returns:
+        DataFrame: Tisztított tábla
+    """
+    schema = TABLE_SCHEMAS[table]
+    df = df.rename(columns=schema.get('rename', {}))
+
+    # A nem egységes formátumú dátumokat a CSV olvasó objektumként hagyja
+    for col in schema.get('dates', []):
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col])
+
+    # A CSV olvasó a kategóriákat mindig szövegként hozza létre; a csak
+    # számokat tartalmazó kategóriák számként maradnak, ahogy eddig
+    for col, dtype in schema['dtypes'].items():
+        if numeric_categories and dtype == 'category' and col in df.columns:
+            categories = pd.to_numeric(df[col].cat.categories, errors='coerce')
+            if len(categories) > 0 and not categories.isna().any() and categories.is_unique:
+                df[col] = df[col].cat.rename_categories(categories)
+
+    if 'utm_split' in schema and 'utm_source_and_medium' in df.columns:
+        df = split_utm_source_and_medium(df, schema['utm_split']['strip'])
+
+    if columns is not None:
+        df = df[list(columns)]
+
+    df = fill_missing_values(df)
+    if not numeric_categories:
+        df = text_categories(df)
+    for col in schema.get('money', []):
+        if col in df.columns:
+            df[col] = to_minor(df[col])
+    return df
@@ -0,0 +1,253 @@
+"""
+Több felbontású idősoros összesítések: nap, ISO hét, hónap és ISO év.
+
+A napi mérőszámok (keresések, konverziók, foglalások, bevételek, látogatók, PPC
+költés) a napi rollup táblákból állnak elő, a durvább szintek ugyanazzal a
+sémával (start, end, mérőszámok) ezekből. Egy tetszőleges időszak összege a
+legdurvább, teljesen beleférő időszakokból és a szélein maradó napokból adódik
+össze, így egy év lekérdezése néhány sor olvasása a teljes napló helyett.
+"""
+import numpy as np
+import pandas as pd
+
+from hotel_pipeline.money import to_major
+from hotel_pipeline.rollups import get_rollup
+
+GRAINS = ['day', 'week', 'month', 'year']
+
+# Egymásba ágyazódó szintek: az ISO év ISO hetekből, a hét és a hónap napokból áll
+CHAINS = [['year', 'week', 'day'], ['month', 'day']]
+
+_DAY = np.timedelta64(1, 'D')
+
+
+def period_starts(dates, grain):
+    """
+    A dátumokat tartalmazó időszakok első napja.
+
+    Args:
+        dates (DatetimeIndex): Napra kerekített dátumok
+        grain (str): 'day', 'week' (ISO hét, hétfőtől), 'month' vagy 'year' (ISO év)
+
+    Returns:
+        DatetimeIndex: Az időszakok kezdőnapjai
+    """
+    dates = pd.DatetimeIndex(dates)
+    if grain == 'day':
+        return dates
+    if grain == 'week':
+        return dates - pd.to_timedelta(dates.dayofweek, unit='D')
+    if grain == 'month':
+        return dates - pd.to_timedelta(dates.day - 1, unit='D')
+    if grain == 'year':
+        return _iso_year_starts(dates.isocalendar().year.to_numpy())
+    raise ValueError(f"Ismeretlen felbontás: {grain}")
+
+
+def _iso_year_starts(years):
+    """Az ISO évek első napja: a január 4-ét tartalmazó hét hétfője."""
+    january_4 = pd.to_datetime(pd.DataFrame({'year': years, 'month': 1, 'day': 4}))
+    return pd.DatetimeIndex(january_4 - pd.to_timedelta(january_4.dt.dayofweek, unit='D'))
+
+
+def period_ends(starts, grain):
+    """Az adott kezdőnapú időszakok utolsó napja."""
+    starts = pd.DatetimeIndex(starts)
+    if grain == 'day':
+        return starts
+    if grain == 'week':
+        return starts + pd.Timedelta(days=6)
+    if grain == 'month':
+        return starts + pd.offsets.MonthEnd(0)
+    if grain == 'year':
+        return _iso_year_starts(starts.isocalendar().year.to_numpy() + 1) - pd.Timedelta(days=1)
+    raise ValueError(f"Ismeretlen felbontás: {grain}")
+
+
+def _currency_columns(rollup, measures):
+    """Naponként és pénznemenként a mérték oszlopok (<mérték>_<pénznem>)."""
+    # A hiányzó és a tisztításkor 0-val kitöltött pénznem nem rendelhető bevételhez
+    rollup = rollup[rollup['currency'].map(lambda value: isinstance(value, str)).astype(bool)]
+    rollup = rollup.assign(currency=rollup['currency'].astype(str))
+    wide = rollup.pivot_table(index='date', columns='currency', values=measures, aggfunc='sum', fill_value=0)
+    wide.columns = [f'{measure}_{currency}' for measure, currency in wide.columns]
+    return wide
+
+
+def daily_metrics(dataframes):
+    """
+    Naponkénti mérőszámok a rollup táblákból, hézag nélküli napi indexszel.
+
+    A bevételek pénznemenként külön oszlopban szerepelnek (pl. revenue_HUF),
+    mert a pénznemek nem adhatók össze; a bevételek napi összege pontosan
+    (váltópénz egységben) adódik, és pénzegységben kerül a táblába. Azokon a
+    napokon, ahol egy forrásnak nincs adata, a mérőszám 0.
+
+    Returns:
+        DataFrame: date indexű tábla, összeadható mérőszám oszlopokkal
+    """
+    searches = get_rollup(dataframes, 'searches')
+    bookings = get_rollup(dataframes, 'bookings')
+    website = get_rollup(dataframes, 'website_traffic')
+    ppc_spend = get_rollup(dataframes, 'ppc_spend')
+
+    parts = [
+        searches.groupby('date')[['searches', 'conversions']].sum(),
+        to_major(_currency_columns(searches, ['revenue'])),
+        bookings.groupby('date')[['booking_records']].sum(),
+        to_major(_currency_columns(bookings, ['booking_revenue', 'upsell_revenue'])),
+        website.groupby('date')[['user_count', 'session_count']].sum().rename(
+            columns={'user_count': 'website_users', 'session_count': 'website_sessions'}
+        ),
+        ppc_spend.set_index('date')[['total_ppc_spend']].rename(columns={'total_ppc_spend': 'ppc_spend'})
+    ]
+    daily = pd.concat(parts, axis=1).sort_index()
+    daily = daily[daily.index.notna()]
+    if len(daily) > 0:
+        daily = daily.reindex(pd.date_range(daily.index.min(), daily.index.max(), freq='D'))
+    daily.index.name = 'date'
+    counts = [col for part in parts for col in part.columns if pd.api.types.is_integer_dtype(part[col])]
+    return daily.fillna(0).astype({col: 'int64' for col in counts})
+
+
+def _level(daily, grain):
+    """Egy felbontás táblája: start, end és a mérőszámok összegei, időrendben."""
+    starts = period_starts(daily.index, grain)
+    level = daily.groupby(starts).sum()
+    level.insert(0, 'end', period_ends(level.index, grain))
+    level.insert(0, 'start', level.index)
+    return level.reset_index(drop=True)
+
+
+class TimeRollups:
+    """
+    Napi, heti, havi és ISO éves összesítések és a lekérdezésük.
+
+    Minden szint ugyanazzal a sémával tárolódik (start, end és a mérőszámok), a
+    szintek időszakai hézag nélkül, időrendben követik egymást.
+
+    Args:
+        daily (DataFrame): A daily_metrics eredménye
+    """
+
+    def __init__(self, daily):
+        self.metrics = list(daily.columns)
+        self.levels = {grain: _level(daily, grain) for grain in GRAINS}
+        self._starts = {grain: level['start'].to_numpy() for grain, level in self.levels.items()}
+        self._ends = {grain: level['end'].to_numpy() for grain, level in self.levels.items()}
+
+    @classmethod
+    def from_tables(cls, dataframes):
+        """Összesítések a betöltött táblák napi rollupjaiból."""
+        return cls(daily_metrics(dataframes))
+
+    def _plan(self, start, end, chain):
+        """
+        Az időszak lefedése a lánc szintjeivel: a legdurvább teljesen beleférő
+        időszakok, a széleken a következő szint.
+
+        Returns:
+            list: (felbontás, első sor, utolsó utáni sor) darabok
+        """
+        if start > end:
+            return []
+        grain = chain[0]
+        starts, ends = self._starts[grain], self._ends[grain]
+        if len(chain) == 1:
+            first, stop = np.searchsorted(starts, start, 'left'), np.searchsorted(starts, end, 'right')
+            return [(grain, first, stop)] if first < stop else []
+
+        # A teljesen beleférő időszakok: start >= kezdet és end <= vég
+        first, stop = np.searchsorted(starts, start, 'left'), np.searchsorted(ends, end, 'right')
+        if first >= stop:
+            return self._plan(start, end, chain[1:])
+        return (
+            self._plan(start, starts[first] - _DAY, chain[1:])
+            + [(grain, first, stop)]
+            + self._plan(ends[stop - 1] + _DAY, end, chain[1:])
+        )
+
+    def total(self, metric, start, end):
+        """
+        Egy mérőszám összege a [start, end] napokra (mindkét vég benne van).
+
+        A szintláncok közül az kerül felhasználásra, amelyik a legkevesebb sor
+        olvasásával fedi le az időszakot.
+        """
+        start, end = np.datetime64(pd.Timestamp(start), 'ns'), np.datetime64(pd.Timestamp(end), 'ns')
+        plans = [self._plan(start, end, chain) for chain in CHAINS]
+        plan = min(plans, key=lambda pieces: sum(stop - first for _, first, stop in pieces))
+        return sum(self.levels[grain][metric].to_numpy()[first:stop].sum() for grain, first, stop in plan)
+
+    def series(self, metric, start, end, grain='day'):
+        """
+        Egy mérőszám az adott felbontás időszakaiként a [start, end] tartományban.
+
+        A teljesen a tartományba eső időszakok értéke közvetlenül az adott
+        szintről jön; a tartomány szélein csak részben benne lévő időszakok
+        értéke a beleeső napok összege.
+
+        Returns:
+            Series: Az időszakok kezdőnapja szerint indexelt értékek
+        """
+        start, end = np.datetime64(pd.Timestamp(start), 'ns'), np.datetime64(pd.Timestamp(end), 'ns')
+        starts, ends = self._starts[grain], self._ends[grain]
+        first, stop = np.searchsorted(ends, start, 'left'), np.searchsorted(starts, end, 'right')
+        values = self.levels[grain][metric].to_numpy()[first:stop].copy()
+        if len(values) > 0:
+            if starts[first] < start or ends[first] > end:
+                values[0] = self.total(metric, max(starts[first], start), min(ends[first], end))
+            if len(values) > 1 and ends[stop - 1] > end:
+                values[-1] = self.total(metric, starts[stop - 1], end)
+        return pd.Series(values, index=pd.DatetimeIndex(starts[first:stop], name='start'), name=metric)
+
+
+def year_over_year(time_rollups, metric, grain='month'):
+    """
+    Egy mérőszám éves összevetése: soronként az év egy időszaka, oszloponként az évek.
+
+    A hónap felbontás naptári években, a heti ISO években (hét sorszáma szerint) értendő.
+
+    Returns:
+        DataFrame: Időszak (hónap vagy ISO hét sorszáma) x év tábla
+    """
+    level = time_rollups.levels[grain]
+    starts = pd.DatetimeIndex(level['start'])
+    if grain == 'month':
+        keys = {'period': starts.month, 'year': starts.year}
+    elif grain == 'week':
+        calendar = starts.isocalendar()
+        keys = {'period': calendar.week.to_numpy(), 'year': calendar.year.to_numpy()}
+    else:
+        raise ValueError(f"Éves összevetés csak havi vagy heti felbontásban: {grain}")
+    frame = pd.DataFrame({**keys, metric: level[metric].to_numpy()})
+    return frame.pivot_table(index='period', columns='year', values=metric, aggfunc='sum')
+
+
+def compare_hotels(time_rollups_by_hotel, metric, grain='month'):
+    """
+    Több hotel éves összevetése egy táblában.
+
+    Args:
+        time_rollups_by_hotel (dict): hotel azonosító -> TimeRollups
+
+    Returns:
+        DataFrame: Időszak x (hotel, év) tábla
+    """
+    return pd.concat(
+        {hotel_id: year_over_year(time_rollups, metric, grain) for hotel_id, time_rollups in time_rollups_by_hotel.items()},
+        axis=1, names=['hotel_id', 'year']
+    )
+
+
+def get_time_rollups(dataframes):
+    """
+    A betöltött táblák több felbontású összesítései.
+
+    Ha a leképezés maga tudja előállítani (LazyTables), annak tárolt példánya
+    kerül vissza, egyébként helyben épül fel.
+    """
+    time_rollups = getattr(dataframes, 'time_rollups', None)
+    if time_rollups is not None:
+        return time_rollups()
+    return TimeRollups.from_tables(dataframes)
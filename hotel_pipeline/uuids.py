@@ -0,0 +1,92 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from hotel_pipeline.cache import cache_available, read_parquet, write_parquet
+
+try:
+    import fcntl
+except ImportError:  # fcntl nélkül (Windows) csak a folyamaton belüli zár védi a szótárt
+    fcntl = None
+
+DICTIONARY_FILE = 'uuid_dictionary.parquet'
+
+# A kulcsok int32 típusúak; a hiányzó uuid kulcsa -1
+MISSING_KEY = -1
+
+_lock = threading.Lock()
+
+
+def dictionary_path(dictionary_dir):
+    """A uuid szótár fájlja a megadott könyvtárban."""
+    return os.path.join(dictionary_dir, DICTIONARY_FILE)
+
+
+def read_uuid_dictionary(dictionary_dir):
+    """
+    A tárolt uuid szótár; a kulcs az uuid pozíciója.
+
+    Returns:
+        Index: A uuid-ok a kulcsuk sorrendjében (üres, ha még nincs szótár)
+    """
+    path = dictionary_path(dictionary_dir)
+    if not cache_available() or not os.path.exists(path):
+        return pd.Index([], dtype=object)
+    return pd.Index(read_parquet(path)['uuid'].to_numpy(dtype=object))
+
+
+def _keys(codes, uniques, dictionary):
+    """A factorize kódok átfordítása szótárbeli kulcsokra; hiányzó uuid: -1."""
+    positions = np.append(dictionary.get_indexer(uniques), MISSING_KEY).astype(np.int32)
+    return positions[codes]
+
+
+def encode_uuids(uuids, dictionary_dir=None):
+    """
+    A uuid-ok sűrű int32 kulcsa egy tartós, csak bővülő szótár alapján.
+
+    A már ismert uuid-ok kulcsa sosem változik, az újak a szótár végére kerülnek,
+    így a kulcsok a növekményes betöltések és a gyorsítótárazott táblák között is
+    összevethetők. Az oszlop szövegei egyszer hash-elődnek (factorize), a szótárban
+    csak a különböző uuid-ok keresődnek. Párhuzamos folyamatok a szótárfájl
+    zárolásával írnak.
+
+    Args:
+        uuids (Series): A uuid oszlop
+        dictionary_dir (str): A szótár könyvtára (None: nem tartós, a tábla saját
+            sorrendjében kiosztott kulcsok)
+
+    Returns:
+        ndarray: int32 kulcsok; hiányzó uuid esetén -1
+    """
+    codes, uniques = pd.factorize(uuids)
+    if dictionary_dir is None or not cache_available():
+        return codes.astype(np.int32)
+
+    uniques = pd.Index(np.asarray(uniques, dtype=object))
+    dictionary = read_uuid_dictionary(dictionary_dir)
+    if not (dictionary.get_indexer(uniques) < 0).any():
+        return _keys(codes, uniques, dictionary)
+
+    os.makedirs(dictionary_dir, exist_ok=True)
+    with _lock, open(os.path.join(dictionary_dir, f'{DICTIONARY_FILE}.lock'), 'w') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        # A zár megszerzése óta más folyamat is bővíthette a szótárt;
+        # az új uuid-ok első előfordulásuk sorrendjében kapnak kulcsot
+        dictionary = read_uuid_dictionary(dictionary_dir)
+        new = uniques[dictionary.get_indexer(uniques) < 0]
+        if len(new) > 0:
+            dictionary = dictionary.append(new)
+            if len(dictionary) > np.iinfo(np.int32).max:
+                raise OverflowError("A uuid szótár túllépte az int32 kulcstartományt")
+            write_parquet(pd.DataFrame({'uuid': dictionary.to_numpy()}), dictionary_path(dictionary_dir))
+    return _keys(codes, uniques, dictionary)
+
+
+def add_uuid_key(df, dictionary_dir=None):
+    """A uuid oszlop mellé a uuid_key int32 kulcs oszlop felvétele (helyben)."""
+    df['uuid_key'] = encode_uuids(df['uuid'], dictionary_dir)
+    return df
@@ -0,0 +1,24 @@
+import pandas as pd
+
+from hotel_pipeline.chunked import clean_table_chunked, read_partitioned
+
+HEADER = ('id;search_log_session_id;utc_datetime;lang_code;currency;arrival;departure;'
+          'days;nights;adults;children;conversion;total_price_final\n')
+
+
+def _row(row_id, lang_code):
+    return f'{row_id};1;2024-01-01 10:00:00;{lang_code};HUF;2024-02-01;2024-02-03;2;2;2;0;0;0\n'
+
+
+def test_chunks_without_text_categories_are_concatenated(tmp_path):
+    rows = [_row(1, 'hu'), _row(2, 'en'), _row(3, 'de'), _row(4, ''), _row(5, ''), _row(6, ''), _row(7, '1')]
+    (tmp_path / 'search_log_hotel_1.csv').write_text(HEADER + ''.join(rows), encoding='utf-8')
+
+    stats = clean_table_chunked(str(tmp_path), 1, 'search_log', str(tmp_path / 'out'), chunksize=3)
+    assert stats == {'parts': 3, 'rows': 7}
+
+    df = read_partitioned(str(tmp_path / 'out' / 'search_log'))
+    assert isinstance(df['lang_code'].dtype, pd.CategoricalDtype)
+    assert df['lang_code'].cat.categories.dtype == object
+    assert df['lang_code'].tolist() == ['hu', 'en', 'de', 0, 0, 0, '1']
+    assert df['id'].tolist() == list(range(1, 8))
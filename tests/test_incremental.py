@@ -0,0 +1,67 @@
+import pandas as pd
+
+from hotel_pipeline.chunked import read_partitioned
+from hotel_pipeline.incremental import refresh_table
+
+HEADER = 'date;utm_source_and_medium;utm_campaign;user_count;session_count\n'
+
+
+def _append(path, lines):
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(''.join(lines))
+
+
+def test_tails_without_text_campaign_keep_category_dtype(tmp_path):
+    path = tmp_path / 'website_daily_users_hotel_1.csv'
+    path.write_text(HEADER + '2024-01-01;google / cpc;summer;3;4\n2024-01-01;(direct) / (none);;1;1\n',
+                    encoding='utf-8')
+    store_dir = tmp_path / 'store'
+    assert refresh_table(str(tmp_path), 1, 'website_daily_users', str(store_dir))['mode'] == 'teljes'
+
+    # Csupa üres, majd csupa szám kampány a napi szállítmányokban
+    _append(path, ['2024-01-02;google / cpc;;2;2\n'])
+    assert refresh_table(str(tmp_path), 1, 'website_daily_users', str(store_dir))['new_rows'] == 1
+    _append(path, ['2024-01-03;google / cpc;999;5;6\n'])
+    assert refresh_table(str(tmp_path), 1, 'website_daily_users', str(store_dir))['new_rows'] == 1
+
+    df = read_partitioned(str(store_dir / 'website_daily_users'))
+    assert isinstance(df['utm_campaign'].dtype, pd.CategoricalDtype)
+    assert df['utm_campaign'].cat.categories.dtype == object
+    assert df['utm_campaign'].tolist() == ['summer', 0, 0, '999']
+    assert df['user_count'].tolist() == [3, 1, 2, 5]
+
+
+def test_late_rows_for_earlier_days_are_kept_and_counted(tmp_path):
+    path = tmp_path / 'website_daily_users_hotel_1.csv'
+    path.write_text(HEADER + '2024-01-01;google / cpc;summer;3;4\n2024-01-02;google / cpc;summer;1;1\n',
+                    encoding='utf-8')
+    store_dir = tmp_path / 'store'
+    refresh_table(str(tmp_path), 1, 'website_daily_users', str(store_dir))
+
+    # Az első napra késve érkezett sor és az utolsó nap újabb sora
+    _append(path, ['2024-01-01;(direct) / (none);;2;2\n', '2024-01-02;(direct) / (none);;5;6\n'])
+    result = refresh_table(str(tmp_path), 1, 'website_daily_users', str(store_dir))
+    assert result['new_rows'] == 2
+    assert result['late_rows'] == 1
+    assert result['watermark'] == '2024-01-02T00:00:00'
+
+    df = read_partitioned(str(store_dir / 'website_daily_users'))
+    assert df.groupby('date')['user_count'].sum().tolist() == [5, 6]
+
+
+def test_half_written_last_line_waits_for_next_refresh(tmp_path):
+    path = tmp_path / 'website_daily_users_hotel_1.csv'
+    path.write_text(HEADER + '2024-01-01;google / cpc;summer;3;4\n2024-01-02;google / cpc;sum', encoding='utf-8')
+    store_dir = tmp_path / 'store'
+    assert refresh_table(str(tmp_path), 1, 'website_daily_users', str(store_dir))['rows'] == 1
+
+    # A sor vége még mindig nincs lezárva
+    _append(path, ['mer;1'])
+    assert refresh_table(str(tmp_path), 1, 'website_daily_users', str(store_dir))['new_rows'] == 0
+
+    _append(path, [';1\n2024-01-03;google / cpc;winter;2;2\n2024-01-04;goo'])
+    assert refresh_table(str(tmp_path), 1, 'website_daily_users', str(store_dir))['new_rows'] == 2
+
+    df = read_partitioned(str(store_dir / 'website_daily_users'))
+    assert df['utm_campaign'].tolist() == ['summer', 'summer', 'winter']
+    assert df['session_count'].tolist() == [4, 1, 2]
@@ -0,0 +1,35 @@
+import pandas as pd
+
+from hotel_pipeline.chunked import clean_table_chunked, read_partitioned
+from hotel_pipeline.journeys import build_journeys, iter_bucketed_chunks, iter_sorted_chunks, session_searches, \
+    sort_by_user_time
+
+HEADER = ('id;search_log_session_id;utc_datetime;lang_code;currency;arrival;departure;'
+          'days;nights;adults;children;conversion;total_price_final\n')
+
+
+def _row(row_id, session_id, hour, conversion):
+    return (f'{row_id};{session_id};2024-01-01 {hour:02d}:00:00;hu;HUF;2024-02-01;2024-02-03;'
+            f'2;2;2;0;{conversion};{100 * conversion}\n')
+
+
+def test_bucketed_chunks_match_in_memory_journeys(tmp_path):
+    # A felhasználók sorai több darabban szétszórva
+    rows = [_row(i, i % 5 + 1, 23 - i, int(i % 4 == 0)) for i in range(1, 21)]
+    (tmp_path / 'search_log_hotel_1.csv').write_text(HEADER + ''.join(rows), encoding='utf-8')
+    clean_table_chunked(str(tmp_path), 1, 'search_log', str(tmp_path / 'store'), chunksize=6)
+    search_log = read_partitioned(str(tmp_path / 'store' / 'search_log'))
+
+    sessions = pd.DataFrame({
+        'id': [1, 2, 3, 4, 5],
+        'uuid': ['a', 'b', 'a', 'c', 'd'],
+        'uuid_key': [0, 1, 0, 2, 3]
+    })
+    chunks = list(iter_bucketed_chunks(str(tmp_path / 'store' / 'search_log'), sessions, buckets=3,
+                                       spill_dir=str(tmp_path)))
+    assert [len(chunk) for chunk in chunks] == [12, 4, 4]
+    assert not list(tmp_path.glob('journeys-*'))
+
+    expected = build_journeys(iter_sorted_chunks(sort_by_user_time(session_searches(search_log, sessions))))
+    actual = build_journeys(chunks).sort_values('uuid_key', ignore_index=True)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False, check_categorical=False)